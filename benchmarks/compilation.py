@@ -0,0 +1,244 @@
+"""
+Benchmark the compilation pipeline against a synthetic project.
+
+    $ python -m benchmarks.compilation --contracts 200 --output results.json
+
+Results are written as JSON so they can be compared release to release.
+"""
+import os
+import json
+import shutil
+import platform
+import tempfile
+import contextlib
+import timeit
+
+import click
+import pkg_resources
+
+from populus.compilation import (
+    find_project_contracts,
+    build_project_contracts,
+    write_compiled_sources,
+    load_compiled_artifacts,
+    ARTIFACT_FORMATS,
+    ARTIFACT_FORMAT_JSON,
+)
+from populus.project import Project
+from populus.utils.compiler import (
+    get_solc_toolchain,
+)
+from populus.utils.filesystem import (
+    get_build_dir,
+    get_compile_cache_dir,
+    remove_dir_if_exists,
+    DEFAULT_CONTRACTS_DIR,
+)
+
+from .corpus import (
+    generate_corpus,
+    touch_contract,
+)
+
+
+def summarize(timings):
+    return {
+        'runs': timings,
+        'min': min(timings),
+        'max': max(timings),
+        'mean': sum(timings) / len(timings),
+    }
+
+
+def time_call(fn, setup=None, repeat=3, number=1):
+    """
+    Returns the per call duration in seconds of `fn` for each of `repeat`
+    runs.  `setup` is called before each run and is not timed.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = timeit.default_timer()
+        for _ in range(number):
+            fn()
+        timings.append((timeit.default_timer() - start) / number)
+    return timings
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    original_path = os.getcwd()
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(original_path)
+
+
+def clear_build(project_dir, keep_cache=False):
+    build_dir = get_build_dir(project_dir)
+    if keep_cache:
+        cache_dir = get_compile_cache_dir(project_dir)
+        for name in os.listdir(build_dir):
+            path = os.path.join(build_dir, name)
+            if os.path.abspath(path) == os.path.abspath(cache_dir):
+                continue
+            elif os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+    else:
+        remove_dir_if_exists(build_dir)
+        os.makedirs(build_dir)
+
+
+def run_benchmarks(project_dir, artifact_format, repeat, staleness_checks, jobs):
+    def build(use_cache=True):
+        return build_project_contracts(
+            project_dir,
+            DEFAULT_CONTRACTS_DIR,
+            use_cache=use_cache,
+            jobs=jobs,
+            artifact_format=artifact_format,
+            optimize=True,
+        )
+
+    results = {}
+
+    results['find_project_contracts'] = time_call(
+        lambda: find_project_contracts(project_dir, DEFAULT_CONTRACTS_DIR),
+        repeat=repeat,
+    )
+    results['cold_compile'] = time_call(
+        build,
+        setup=lambda: clear_build(project_dir),
+        repeat=repeat,
+    )
+    results['warm_cache_compile'] = time_call(
+        build,
+        setup=lambda: clear_build(project_dir, keep_cache=True),
+        repeat=repeat,
+    )
+    results['noop_compile'] = time_call(build, repeat=repeat)
+
+    touched_index = [0]
+
+    def touch():
+        touch_contract(project_dir, touched_index[0])
+        touched_index[0] += 1
+
+    results['incremental_compile'] = time_call(build, setup=touch, repeat=repeat)
+
+    compiled_sources = dict(build().compiled_sources)
+    results['write_compiled_sources_unchanged'] = time_call(
+        lambda: write_compiled_sources(project_dir, compiled_sources),
+        repeat=repeat,
+    )
+
+    results['load_artifacts'] = time_call(
+        lambda: dict(load_compiled_artifacts(project_dir, artifact_format)),
+        repeat=repeat,
+    )
+
+    # The project reads its artifact format and number of jobs from its
+    # config, so write the ones used by the builds above.
+    with open(os.path.join(project_dir, 'populus.ini'), 'w') as config_file:
+        config_file.write(
+            "[populus]\n"
+            "artifact_format = {0}\n"
+            "compile_jobs = {1}\n".format(artifact_format, jobs)
+        )
+
+    project = Project()
+    project.compiled_contracts
+    results['staleness_check'] = time_call(
+        project.compiled_contracts_stale,
+        repeat=repeat,
+        number=staleness_checks,
+    )
+    results['compiled_contracts_property'] = time_call(
+        lambda: project.compiled_contracts,
+        repeat=repeat,
+        number=staleness_checks,
+    )
+
+    return {name: summarize(timings) for name, timings in results.items()}
+
+
+@click.command()
+@click.option('--contracts', 'num_contracts', type=int, default=50,
+              help="Number of contracts in the generated project")
+@click.option('--depth', 'import_depth', type=int, default=4,
+              help="Length of each chain of contracts that import one another")
+@click.option('--libraries', 'num_libraries', type=int, default=5,
+              help="Number of libraries in the generated project")
+@click.option('--library-ratio', type=float, default=0.5,
+              help="Fraction of contracts which use a library")
+@click.option('--seed', type=int, default=0)
+@click.option('--artifact-format', type=click.Choice(ARTIFACT_FORMATS),
+              default=ARTIFACT_FORMAT_JSON)
+@click.option('--repeat', type=int, default=3,
+              help="Number of times to run each benchmark")
+@click.option('--staleness-checks', type=int, default=100,
+              help="Number of staleness checks per run")
+@click.option('--jobs', '-j', type=int, default=1)
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default=None,
+              help="Write the results to this file instead of stdout")
+def main(num_contracts, import_depth, num_libraries, library_ratio, seed,
+         artifact_format, repeat, staleness_checks, jobs, output):
+    parameters = {
+        'contracts': num_contracts,
+        'depth': import_depth,
+        'libraries': num_libraries,
+        'library_ratio': library_ratio,
+        'seed': seed,
+        'artifact_format': artifact_format,
+        'repeat': repeat,
+        'staleness_checks': staleness_checks,
+        'jobs': jobs,
+    }
+
+    project_dir = tempfile.mkdtemp()
+    try:
+        with working_directory(project_dir):
+            os.makedirs(get_build_dir(project_dir))
+            generate_corpus(
+                project_dir,
+                num_contracts=num_contracts,
+                import_depth=import_depth,
+                num_libraries=num_libraries,
+                library_ratio=library_ratio,
+                seed=seed,
+            )
+            results = run_benchmarks(
+                project_dir,
+                artifact_format,
+                repeat,
+                staleness_checks,
+                jobs,
+            )
+    finally:
+        shutil.rmtree(project_dir)
+
+    report = {
+        'environment': {
+            'populus': pkg_resources.get_distribution('populus').version,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'solc': get_solc_toolchain().version,
+        },
+        'parameters': parameters,
+        'results': results,
+    }
+    serialized_report = json.dumps(report, sort_keys=True, indent=2)
+
+    if output is None:
+        click.echo(serialized_report)
+    else:
+        with open(output, 'w') as output_file:
+            output_file.write(serialized_report)
+
+
+if __name__ == '__main__':
+    main()
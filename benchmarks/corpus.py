@@ -0,0 +1,128 @@
+"""
+Generate synthetic Solidity source trees for benchmarking the compilation
+pipeline.
+"""
+import os
+import random
+
+from populus.utils.filesystem import (
+    ensure_path_exists,
+    get_contracts_dir,
+)
+
+
+LIBRARY_TEMPLATE = """library {name} {{
+    function add(uint a, uint b) returns (uint) {{
+        return a + b + {index};
+    }}
+}}
+"""
+
+CONTRACT_TEMPLATE = """{imports}
+contract {name}{bases} {{
+    uint public value{index};
+
+    function set{index}(uint v) {{
+        value{index} = {body};
+    }}
+}}
+"""
+
+
+def get_library_name(index):
+    return 'Library{0}'.format(index)
+
+
+def get_contract_name(index):
+    return 'Contract{0}'.format(index)
+
+
+def get_corpus_layout(num_contracts, import_depth, num_libraries, library_ratio, seed):
+    """
+    Returns a mapping of contract name to a tuple of `(base_contract_name,
+    library_names)`.  Contracts are arranged in inheritance chains of up to
+    `import_depth` contracts.  Each contract uses one randomly chosen library
+    with probability `library_ratio`.
+    """
+    rng = random.Random(seed)
+
+    layout = {}
+    for index in range(num_contracts):
+        if import_depth > 1 and index % import_depth != 0:
+            base_contract_name = get_contract_name(index - 1)
+        else:
+            base_contract_name = None
+
+        if num_libraries and rng.random() < library_ratio:
+            library_names = (get_library_name(rng.randrange(num_libraries)),)
+        else:
+            library_names = tuple()
+
+        layout[get_contract_name(index)] = (base_contract_name, library_names)
+    return layout
+
+
+def render_contract(index, base_contract_name, library_names):
+    import_names = ([base_contract_name] if base_contract_name else []) + list(library_names)
+    if library_names:
+        body = '{0}.add(v, {1})'.format(library_names[0], index)
+    else:
+        body = 'v + {0}'.format(index)
+
+    return CONTRACT_TEMPLATE.format(
+        imports='\n'.join('import "./{0}.sol";'.format(name) for name in import_names),
+        name=get_contract_name(index),
+        bases=' is {0}'.format(base_contract_name) if base_contract_name else '',
+        index=index,
+        body=body,
+    )
+
+
+def generate_corpus(project_dir,
+                    num_contracts=50,
+                    import_depth=4,
+                    num_libraries=5,
+                    library_ratio=0.5,
+                    seed=0):
+    """
+    Write a synthetic project of `num_contracts` contracts and
+    `num_libraries` libraries to the contracts directory of `project_dir`.
+    Returns the paths of the written source files.
+    """
+    contracts_dir = get_contracts_dir(project_dir)
+    ensure_path_exists(contracts_dir)
+
+    sources = {}
+    for index in range(num_libraries):
+        name = get_library_name(index)
+        sources[name] = LIBRARY_TEMPLATE.format(name=name, index=index)
+
+    layout = get_corpus_layout(num_contracts, import_depth, num_libraries, library_ratio, seed)
+    for index in range(num_contracts):
+        base_contract_name, library_names = layout[get_contract_name(index)]
+        sources[get_contract_name(index)] = render_contract(
+            index,
+            base_contract_name,
+            library_names,
+        )
+
+    source_paths = []
+    for name, source in sorted(sources.items()):
+        source_path = os.path.join(contracts_dir, '{0}.sol'.format(name))
+        with open(source_path, 'w') as source_file:
+            source_file.write(source)
+        source_paths.append(source_path)
+    return source_paths
+
+
+def touch_contract(project_dir, index):
+    """
+    Modify the source of a single contract so that it must be recompiled.
+    """
+    source_path = os.path.join(
+        get_contracts_dir(project_dir),
+        '{0}.sol'.format(get_contract_name(index)),
+    )
+    with open(source_path, 'a') as source_file:
+        source_file.write('\n// touched\n')
+    return source_path
@@ -1,4 +1,5 @@
 import os
+import json
 
 import pytest
 
@@ -39,3 +40,99 @@ def write_project_file(project_dir):
         with open(full_path, 'w') as f:
             f.write(content)
     return _write_project_file
+
+
+MULTIPLY13_LIBRARY_SOURCE = ("""
+library Library13 {
+    function multiply13(uint v) constant returns (uint) {
+        return v * 13;
+    }
+}
+""").strip()
+
+MULTIPLY13_LIBRARY_CODE = "0x6060604052607c8060106000396000f36503059da08ac35060606040526000357c010000000000000000000000000000000000000000000000000000000090048063cdbf9c4214604157603d565b6007565b60556004808035906020019091905050606b565b6040518082815260200191505060405180910390f35b6000600d820290506077565b91905056"
+
+MULTIPLY13_LIBRARY_RUNTIME = "0x6503059da08ac35060606040526000357c010000000000000000000000000000000000000000000000000000000090048063cdbf9c4214604157603d565b6007565b60556004808035906020019091905050606b565b6040518082815260200191505060405180910390f35b6000600d820290506077565b91905056"
+
+MULTIPLY13_LIBRARY_ABI = json.loads('[{"constant":true,"inputs":[{"name":"value","type":"uint256"}],"name":"multiply13","outputs":[{"name":"","type":"uint256"}],"type":"function"}]')
+
+
+@pytest.fixture()
+def LIBRARY_13_SOURCE():
+    return MULTIPLY13_LIBRARY_SOURCE
+
+
+@pytest.fixture()
+def LIBRARY_13_CODE():
+    return MULTIPLY13_LIBRARY_CODE
+
+
+@pytest.fixture()
+def LIBRARY_13_RUNTIME():
+    return MULTIPLY13_LIBRARY_RUNTIME
+
+
+@pytest.fixture()
+def LIBRARY_13_ABI():
+    return MULTIPLY13_LIBRARY_ABI
+
+
+@pytest.fixture()
+def LIBRARY_13(LIBRARY_13_CODE,
+               LIBRARY_13_SOURCE,
+               LIBRARY_13_RUNTIME,
+               LIBRARY_13_ABI):
+    return {
+        'code': LIBRARY_13_CODE,
+        'code_runtime': LIBRARY_13_RUNTIME,
+        'abi': LIBRARY_13_ABI,
+        'source': LIBRARY_13_SOURCE,
+    }
+
+
+MULTIPLY13_CONTRACT_SOURCE = ("""
+contract Multiply13 {
+    function multiply13(uint v) constant returns (uint) {
+        return Library13.multiply13(v);
+    }
+}
+""").strip()
+
+MULTIPLY13_CONTRACT_CODE = "0x606060405260db8060106000396000f360606040526000357c010000000000000000000000000000000000000000000000000000000090048063cdbf9c42146037576035565b005b604b60048080359060200190919050506061565b6040518082815260200191505060405180910390f35b600073__Library13_____________________________63cdbf9c4283604051827c0100000000000000000000000000000000000000000000000000000000028152600401808281526020019150506020604051808303818660325a03f41560025750505060405180519060200150905060d6565b91905056"
+
+MULTIPLY13_CONTRACT_RUNTIME = "0x60606040526000357c010000000000000000000000000000000000000000000000000000000090048063cdbf9c42146037576035565b005b604b60048080359060200190919050506061565b6040518082815260200191505060405180910390f35b600073__Library13_____________________________63cdbf9c4283604051827c0100000000000000000000000000000000000000000000000000000000028152600401808281526020019150506020604051808303818660325a03f41560025750505060405180519060200150905060d6565b91905056"
+
+MULTIPLY13_CONTRACT_ABI = json.loads('[{"constant":true,"inputs":[{"name":"v","type":"uint256"}],"name":"multiply13","outputs":[{"name":"","type":"uint256"}],"type":"function"}]')
+
+
+@pytest.fixture()
+def MULTIPLY_13_SOURCE():
+    return MULTIPLY13_CONTRACT_SOURCE
+
+
+@pytest.fixture()
+def MULTIPLY_13_CODE():
+    return MULTIPLY13_CONTRACT_CODE
+
+
+@pytest.fixture()
+def MULTIPLY_13_RUNTIME():
+    return MULTIPLY13_CONTRACT_RUNTIME
+
+
+@pytest.fixture()
+def MULTIPLY_13_ABI():
+    return MULTIPLY13_CONTRACT_ABI
+
+
+@pytest.fixture()
+def MULTIPLY_13(MULTIPLY_13_CODE,
+                MULTIPLY_13_RUNTIME,
+                MULTIPLY_13_ABI,
+                MULTIPLY_13_SOURCE):
+    return {
+        'code': MULTIPLY_13_CODE,
+        'code_runtime': MULTIPLY_13_RUNTIME,
+        'abi': MULTIPLY_13_ABI,
+        'source': MULTIPLY_13_SOURCE,
+    }
@@ -1,11 +1,13 @@
 import itertools
+import json
+import time
 
 try:
     from contextlib import ExitStack
 except ImportError:
     from contextlib2 import ExitStack
 
-from pylru import lrucache
+from gevent.pool import Pool
 
 from web3.utils.types import is_string
 
@@ -25,10 +27,20 @@ from geth import (
 from populus.utils.functional import (
     cached_property,
 )
+from populus.utils.caching import (
+    InstrumentedLRUCache,
+)
+from populus.utils.verification import (
+    BytecodeVerifier,
+    get_code_hash,
+)
 from populus.utils.networking import (
     get_open_port,
     wait_for_connection,
 )
+from populus.utils.rpc import (
+    InProcessTestRPCProvider,
+)
 from populus.utils.module_loading import (
     import_string,
 )
@@ -43,9 +55,10 @@ from populus.utils.filesystem import (
 )
 from populus.utils.contracts import (
     construct_contract_factories,
-    package_contracts,
+    DependencyGraph,
     get_contract_library_dependencies,
-    link_bytecode,
+    get_library_link_offsets,
+    get_linked_bytecode,
 )
 from populus.utils.chains import (
     get_chaindata_dir,
@@ -59,6 +72,7 @@ from populus.migrations.migration import (
     get_compiled_contracts_from_migrations,
 )
 from populus.migrations.registrar import (
+    RegistrarClient,
     get_registrar,
 )
 
@@ -155,6 +169,160 @@ class UnknownContract(ContractError):
     pass
 
 
+DEFAULT_FACTORY_CACHE_SIZE = 128
+
+DEFAULT_RESOLVER_POOL_SIZE = 8
+
+
+class DeployedContracts(object):
+    """
+    Same interface as the object returned by `package_contracts` for the
+    contracts which are registered on the chain with matching bytecode.
+
+    Each contract is only resolved the first time it is accessed, after its
+    library dependencies have been resolved.  Resolution runs on a pool of
+    at most `pool_size` greenlets and each contract is only ever resolved
+    once, so libraries shared between contracts are looked up a single time.
+    Iterating over the mapping or taking its length resolves every contract.
+
+    The seconds spent resolving each contract are recorded in `latencies`.
+    """
+    def __init__(self, chain, pool_size=DEFAULT_RESOLVER_POOL_SIZE):
+        self._chain = chain
+        self._contract_names = set(chain.contract_factories.keys())
+        self._pool = Pool(pool_size)
+        self._resolutions = {}
+        self._spawning = set()
+        self._contracts = {}
+        self._is_fully_resolved = False
+        self.latencies = {}
+
+    def _resolve(self, contract_name, dependency_resolutions):
+        # Waiting on the dependencies happens before the clock starts so that
+        # `latencies` only covers the work for the contract itself.
+        for resolution in dependency_resolutions:
+            resolution.join()
+
+        start_time = time.time()
+        try:
+            # The base implementation only looks contracts up, whereas
+            # `TestRPCChain.get_contract` would deploy any which are missing.
+            return Chain.get_contract(self._chain, contract_name)
+        except (NoKnownAddress, BytecodeMismatchError):
+            return None
+        finally:
+            self.latencies[contract_name] = time.time() - start_time
+
+    def _spawn(self, contract_name):
+        if contract_name not in self._contract_names:
+            return None
+        if contract_name in self._spawning:
+            return None
+        if contract_name not in self._resolutions:
+            # Dependencies are always spawned before their dependents and
+            # never from within the pool so that a full pool cannot deadlock.
+            self._spawning.add(contract_name)
+            try:
+                dependency_resolutions = [
+                    resolution
+                    for resolution in (
+                        self._spawn(dependency_name)
+                        for dependency_name in sorted(
+                            self._chain.dependency_graph.get_dependencies(
+                                contract_name,
+                                recursive=False,
+                            )
+                        )
+                    )
+                    if resolution is not None
+                ]
+            finally:
+                self._spawning.discard(contract_name)
+            self._resolutions[contract_name] = self._pool.spawn(
+                self._resolve,
+                contract_name,
+                dependency_resolutions,
+            )
+        return self._resolutions[contract_name]
+
+    def _at_block(self):
+        # Every lookup made while resolving is served from a single block so
+        # the block number is only fetched once per resolution pass.
+        stack = ExitStack()
+        if self._chain.has_registrar:
+            stack.enter_context(self._chain.registrar_client.at_block())
+        return stack
+
+    def _get(self, contract_name):
+        if contract_name in self._contracts:
+            return self._contracts[contract_name]
+        resolution = self._spawn(contract_name)
+        if resolution is None:
+            return None
+        with self._at_block():
+            return resolution.get()
+
+    def _resolve_all(self):
+        if self._is_fully_resolved:
+            return
+        with self._at_block():
+            if self._chain.has_registrar:
+                # Resolve every registrar key and the bytecode behind it up
+                # front in batched requests so the checks are served from cache.
+                block_number, block_hash = self._chain.registrar_client.prefetch(
+                    'contract/{name}'.format(name=contract_name)
+                    for contract_name in self._contract_names
+                )
+                self._chain.bytecode_verifier.set_checkpoint(block_number, block_hash)
+            resolutions = [
+                self._spawn(contract_name)
+                for contract_name in sorted(self._contract_names)
+            ]
+            for resolution in resolutions:
+                resolution.get()
+        self._is_fully_resolved = True
+
+    def __getitem__(self, contract_name):
+        contract = self._get(contract_name)
+        if contract is None:
+            raise KeyError(contract_name)
+        return contract
+
+    def __setitem__(self, contract_name, contract):
+        self._contracts[contract_name] = contract
+
+    def __getattr__(self, contract_name):
+        if contract_name.startswith('_'):
+            raise AttributeError(contract_name)
+        try:
+            return self[contract_name]
+        except KeyError:
+            raise AttributeError(contract_name)
+
+    def __contains__(self, contract_name):
+        return self._get(contract_name) is not None
+
+    def keys(self):
+        self._resolve_all()
+        return set(
+            contract_name
+            for contract_name in self._contract_names
+            if self._get(contract_name) is not None
+        ).union(self._contracts.keys())
+
+    def values(self):
+        return [self[contract_name] for contract_name in self.keys()]
+
+    def items(self):
+        return [(contract_name, self[contract_name]) for contract_name in self.keys()]
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __len__(self):
+        return len(self.keys())
+
+
 class Chain(object):
     """
     Base class for how populus interacts with the blockchain.
@@ -163,12 +331,13 @@ class Chain(object):
     """
     project = None
     chain_name = None
-    _factory_cache = None
+
+    #: Whether transactions sent to this chain may set their own `nonce`.
+    accepts_explicit_nonces = True
 
     def __init__(self, project, chain_name):
         self.project = project
         self.chain_name = chain_name
-        self._factory_cache = lrucache(128)
 
     #
     # Required Public API
@@ -186,23 +355,51 @@ class Chain(object):
         raise NotImplementedError("Must be implemented by subclasses")
 
     @cached_property
-    def contract_factories(self):
+    def compiled_contracts(self):
         if self.project.migrations:
-            compiled_contracts = get_compiled_contracts_from_migrations(
+            return get_compiled_contracts_from_migrations(
                 self.project.migrations,
                 self,
             )
         else:
-            compiled_contracts = self.project.compiled_contracts
+            return self.project.compiled_contracts
 
+    @cached_property
+    def dependency_graph(self):
+        if self.compiled_contracts is self.project.compiled_contracts:
+            return self.project.dependency_graph
+        return DependencyGraph(self.compiled_contracts)
+
+    @cached_property
+    def contract_factories(self):
         return construct_contract_factories(
             self.web3,
-            compiled_contracts,
+            self.compiled_contracts,
         )
 
+    @property
+    def factory_cache_size(self):
+        """
+        The number of linked contract factories to keep in the
+        `factory_cache`.  Set with the `factory_cache_size` option of the
+        chain's configuration section.
+        """
+        try:
+            return int(self.chain_config['factory_cache_size'])
+        except (KeyError, NotImplementedError):
+            return DEFAULT_FACTORY_CACHE_SIZE
+
+    @cached_property
+    def factory_cache(self):
+        """
+        Contract factories linked against specific library addresses.  The
+        cache's `stats` report its hits, misses and evictions.
+        """
+        return InstrumentedLRUCache(self.factory_cache_size)
+
     @property
     def RegistrarFactory(self):
-        return get_registrar(self.web3)
+        return get_registrar(self.web3, project_dir=self.project.project_dir)
 
     @property
     def has_registrar(self):
@@ -212,6 +409,21 @@ class Chain(object):
     def registrar(self):
         raise NotImplementedError("Must be implemented by subclasses")
 
+    @cached_property
+    def registrar_client(self):
+        """
+        Cached, block aware lookups of registrar keys and contract bytecode.
+        """
+        return RegistrarClient(self.web3, self.registrar)
+
+    @cached_property
+    def bytecode_verifier(self):
+        """
+        Addresses whose code has been verified against an expected runtime
+        bytecode, kept until a reorg is detected.
+        """
+        return BytecodeVerifier(self.web3)
+
     def __enter__(self):
         raise NotImplementedError("Must be implemented by subclasses")
 
@@ -221,7 +433,21 @@ class Chain(object):
     #
     # Utility
     #
-    def _extract_library_dependencies(self, bytecode, link_dependencies=None):
+    def _get_library_link_offsets(self, contract_name, key):
+        """
+        The link offsets stored in the compiled data for `contract_name` or
+        `None` if they are not available.
+        """
+        try:
+            contract_data = self.compiled_contracts[contract_name]
+        except KeyError:
+            return None
+        return get_library_link_offsets(contract_data, key)
+
+    def _extract_library_dependencies(self,
+                                      bytecode,
+                                      link_dependencies=None,
+                                      library_link_offsets=None):
         if link_dependencies is None:
             link_dependencies = {}
 
@@ -232,19 +458,31 @@ class Chain(object):
         library_dependencies = get_contract_library_dependencies(
             bytecode,
             all_known_contract_names,
+            library_link_offsets,
         )
         return library_dependencies
 
     def _link_code(self, bytecodes,
                    link_dependencies=None,
                    validate_bytecode=True,
-                   raise_on_error=False):
+                   raise_on_error=False,
+                   library_link_offsets=None):
         if link_dependencies is None:
             link_dependencies = {}
-
+        if library_link_offsets is None:
+            library_link_offsets = [None] * len(bytecodes)
+
+        bytecode_library_dependencies = [
+            self._extract_library_dependencies(
+                bytecode,
+                link_dependencies,
+                bytecode_link_offsets,
+            )
+            for bytecode, bytecode_link_offsets
+            in zip(bytecodes, library_link_offsets)
+        ]
         library_dependencies = set(itertools.chain.from_iterable(
-            self._extract_library_dependencies(bytecode, link_dependencies)
-            for bytecode in bytecodes
+            bytecode_library_dependencies
         ))
 
         # Determine which dependencies would need to be present in the
@@ -289,9 +527,21 @@ class Chain(object):
             )
         }
 
+        # Only the addresses of the libraries that each bytecode references
+        # are passed along so that linked bytecode can be shared with other
+        # chains and link dependency combinations.
         linked_bytecodes = [
-            link_bytecode(bytecode, **all_link_dependencies)
-            for bytecode in bytecodes
+            get_linked_bytecode(
+                bytecode,
+                bytecode_link_offsets,
+                {
+                    library_name: all_link_dependencies[library_name]
+                    for library_name in dependencies
+                    if library_name in all_link_dependencies
+                },
+            )
+            for bytecode, bytecode_link_offsets, dependencies
+            in zip(bytecodes, library_link_offsets, bytecode_library_dependencies)
         ]
         return linked_bytecodes
 
@@ -310,44 +560,48 @@ class Chain(object):
             )
         contract_key = 'contract/{name}'.format(name=contract_name)
 
-        if not self.registrar.call().exists(contract_key):
-            if raise_on_error:
-                raise NoKnownAddress(
-                    "Address for contract '{name}' not found in registrar".format(
-                        name=contract_name,
+        with self.registrar_client.at_block():
+            if not self.registrar_client.exists(contract_key):
+                if raise_on_error:
+                    raise NoKnownAddress(
+                        "Address for contract '{name}' not found in registrar".format(
+                            name=contract_name,
+                        )
                     )
-                )
-            return False
-
-        if not validate_bytecode:
-            return True
+                return False
 
-        try:
-            contract_factory = self.get_contract_factory(
-                contract_name,
-                link_dependencies=link_dependencies,
-            )
-        except (NoKnownAddress, BytecodeMismatchError):
-            if raise_on_error:
-                raise
-            return False
+            if not validate_bytecode:
+                return True
 
-        contract_address = self.registrar.call().getAddress(contract_key)
+            try:
+                contract_factory = self.get_contract_factory(
+                    contract_name,
+                    link_dependencies=link_dependencies,
+                )
+            except (NoKnownAddress, BytecodeMismatchError):
+                if raise_on_error:
+                    raise
+                return False
 
-        chain_bytecode = self.web3.eth.getCode(contract_address)
+            contract_address = self.registrar_client.get_address(contract_key)
 
-        is_bytecode_match = chain_bytecode == contract_factory.code_runtime
-        if not is_bytecode_match and raise_on_error:
-            raise BytecodeMismatchError(
-                "Bytecode @ {0} does not match expected contract bytecode.\n\n"
-                "expected : '{1}'\n"
-                "actual   : '{2}'\n".format(
-                    contract_address,
-                    contract_factory.code_runtime,
-                    chain_bytecode,
-                ),
+            is_bytecode_match = self.bytecode_verifier.verify(
+                contract_address,
+                contract_factory.code_runtime,
+                get_code=self.registrar_client.get_code,
             )
-        return is_bytecode_match
+            if not is_bytecode_match and raise_on_error:
+                chain_bytecode = self.registrar_client.get_code(contract_address)
+                raise BytecodeMismatchError(
+                    "Bytecode @ {0} does not match expected contract bytecode.\n\n"
+                    "expected : '{1}'\n"
+                    "actual   : '{2}'\n".format(
+                        contract_address,
+                        contract_factory.code_runtime,
+                        chain_bytecode,
+                    ),
+                )
+            return is_bytecode_match
 
     def get_contract(self,
                      contract_name,
@@ -361,28 +615,34 @@ class Chain(object):
                     ', '.join((name for name in self.contract_factories.keys())),
                 )
             )
-        self.is_contract_available(
-            contract_name,
-            link_dependencies=link_dependencies,
-            validate_bytecode=validate_bytecode,
-            raise_on_error=True,
-        )
+        with self.registrar_client.at_block():
+            self.is_contract_available(
+                contract_name,
+                link_dependencies=link_dependencies,
+                validate_bytecode=validate_bytecode,
+                raise_on_error=True,
+            )
 
-        contract_factory = self.get_contract_factory(
-            contract_name,
-            link_dependencies=link_dependencies,
-        )
-        contract_key = 'contract/{name}'.format(name=contract_name)
-        contract_address = self.registrar.call().getAddress(contract_key)
-        contract = contract_factory(address=contract_address)
-        return contract
+            contract_factory = self.get_contract_factory(
+                contract_name,
+                link_dependencies=link_dependencies,
+            )
+            contract_key = 'contract/{name}'.format(name=contract_name)
+            contract_address = self.registrar_client.get_address(contract_key)
+            contract = contract_factory(address=contract_address)
+            return contract
 
     def get_contract_factory(self,
                              contract_name,
                              link_dependencies=None):
-        cache_key = (contract_name,) + tuple(sorted((link_dependencies or {}).items()))
-        if cache_key in self._factory_cache:
-            return self._factory_cache[cache_key]
+        if link_dependencies is False:
+            cache_key = (contract_name, False)
+        else:
+            cache_key = (contract_name,) + tuple(sorted((link_dependencies or {}).items()))
+        try:
+            return self.factory_cache[cache_key]
+        except KeyError:
+            pass
         if contract_name not in self.contract_factories:
             raise UnknownContract(
                 "No contract found with the name '{0}'.\n\n"
@@ -401,6 +661,10 @@ class Chain(object):
                     base_contract_factory.code_runtime,
                 ],
                 link_dependencies=link_dependencies,
+                library_link_offsets=[
+                    self._get_library_link_offsets(contract_name, 'code'),
+                    self._get_library_link_offsets(contract_name, 'code_runtime'),
+                ],
             )
         else:
             code, code_runtime = (
@@ -414,17 +678,16 @@ class Chain(object):
             abi=base_contract_factory.abi,
             source=base_contract_factory.source,
         )
-        self._factory_cache[cache_key] = contract_factory
+        self.factory_cache[cache_key] = contract_factory
         return contract_factory
 
     @property
     def deployed_contracts(self):
-        contract_classes = {
-            contract_name: self.get_contract(contract_name)
-            for contract_name in self.contract_factories.keys()
-            if self.is_contract_available(contract_name)
-        }
-        return package_contracts(contract_classes)
+        """
+        Lazily resolved mapping of the contracts that are registered on this
+        chain with bytecode matching the compiled contracts.
+        """
+        return DeployedContracts(self)
 
 
 class ExternalChain(Chain):
@@ -486,9 +749,23 @@ class ExternalChain(Chain):
         return get_registrar(
             self.web3,
             address=self.chain_config['registrar'],
+            project_dir=self.project.project_dir,
         )
 
 
+def get_deploy_cache_key(contract_name,
+                         code,
+                         deploy_transaction=None,
+                         deploy_args=None,
+                         deploy_kwargs=None):
+    deploy_arguments = json.dumps(
+        [deploy_transaction, deploy_args, deploy_kwargs],
+        sort_keys=True,
+        default=repr,
+    )
+    return (contract_name, get_code_hash(code), deploy_arguments)
+
+
 def testrpc_fn_proxy(fn_name):
     @staticmethod
     def inner(*args, **kwargs):
@@ -528,6 +805,10 @@ class TestRPCChain(Chain):
 
     has_registrar = True
 
+    # The testrpc backend rejects transactions with a `nonce`.  It mines each
+    # transaction as soon as it is sent so they never need one.
+    accepts_explicit_nonces = False
+
     @cached_property
     def registrar(self):
         # deploy the registrar
@@ -537,16 +818,34 @@ class TestRPCChain(Chain):
         return self.RegistrarFactory(address=registrar_address)
 
     full_reset = testrpc_fn_proxy('full_reset')
-    reset = testrpc_fn_proxy('evm_reset')
+
+    def reset(self, *args, **kwargs):
+        from testrpc import testrpc
+        result = testrpc.evm_reset(*args, **kwargs)
+        self._invalidate_chain_caches()
+        return result
 
     @staticmethod
     def snapshot(*args, **kwargs):
         from testrpc import testrpc
         return int(testrpc.evm_snapshot(*args, **kwargs), 16)
 
-    revert = testrpc_fn_proxy('evm_revert')
+    def revert(self, *args, **kwargs):
+        from testrpc import testrpc
+        result = testrpc.evm_revert(*args, **kwargs)
+        self._invalidate_chain_caches()
+        return result
+
     mine = testrpc_fn_proxy('evm_mine')
 
+    def _invalidate_chain_caches(self):
+        # Reverting can leave the chain at a block number (or block hash) the
+        # caches have already seen, so drop them explicitly.
+        if 'registrar_client' in self.__dict__:
+            self.registrar_client.invalidate()
+        if 'bytecode_verifier' in self.__dict__:
+            self.bytecode_verifier.invalidate()
+
     _running = False
 
     def __enter__(self):
@@ -554,10 +853,19 @@ class TestRPCChain(Chain):
         if self._running:
             raise ValueError("The TesterChain is already running")
 
-        if self.port is None:
-            self.port = get_open_port()
+        provider_class = self.provider_class
 
-        self.provider = TestRPCProvider(port=self.port)
+        if provider_class == TestRPCProvider:
+            if self.port is None:
+                self.port = get_open_port()
+            self.provider = provider_class(port=self.port)
+        elif provider_class == InProcessTestRPCProvider:
+            self.provider = provider_class()
+        else:
+            raise NotImplementedError(
+                "Only the TestRPCProvider and InProcessTestRPCProvider provider "
+                "classes are currently supported for testrpc chains."
+            )
 
         testrpc.full_reset()
         testrpc.rpc_configure('eth_mining', False)
@@ -565,7 +873,8 @@ class TestRPCChain(Chain):
         testrpc.rpc_configure('net_version', 1)
         testrpc.evm_mine()
 
-        wait_for_connection('127.0.0.1', self.port)
+        if provider_class == TestRPCProvider:
+            wait_for_connection('127.0.0.1', self.port)
         self._running = True
         return self
 
@@ -573,12 +882,34 @@ class TestRPCChain(Chain):
         if not self._running:
             raise ValueError("The TesterChain is not running")
         try:
-            self.provider.server.stop()
-            self.provider.server.close()
-            self.provider.thread.kill()
+            if isinstance(self.provider, TestRPCProvider):
+                self.provider.server.stop()
+                self.provider.server.close()
+                self.provider.thread.kill()
         finally:
             self._running = False
 
+    @property
+    def provider_class(self):
+        """
+        The provider class set with the `provider` option of the chain's
+        configuration section.  Defaults to the `TestRPCProvider` which serves
+        the chain over HTTP.
+        """
+        provider_import_path = self.chain_config.get(
+            'provider',
+            'web3.providers.rpc.TestRPCProvider',
+        )
+        return import_string(provider_import_path)
+
+    @cached_property
+    def deploy_cache(self):
+        """
+        Addresses of the contracts deployed by `get_contract`, keyed by
+        `get_deploy_cache_key`.
+        """
+        return {}
+
     def get_contract(self,
                      contract_name,
                      link_dependencies=None,
@@ -598,12 +929,12 @@ class TestRPCChain(Chain):
 
         registrar = self.registrar
         contract_key = "contract/{name}".format(name=contract_name)
-        if not registrar.call().exists(contract_key):
+        if not self.registrar_client.exists(contract_key):
             # First dig down into the dependency tree to make the library
             # dependencies available.
-            contract_bytecode = self.contract_factories[contract_name].code
-            contract_dependencies = self._extract_library_dependencies(
-                contract_bytecode, link_dependencies,
+            contract_dependencies = self.dependency_graph.get_dependencies(
+                contract_name,
+                recursive=False,
             )
             for dependency in contract_dependencies:
                 self.get_contract(
@@ -613,17 +944,35 @@ class TestRPCChain(Chain):
                     **kwargs
                 )
 
-            # Then get the factory and deploy it.
+            # Then get the factory and deploy it, unless an identical
+            # deployment from earlier in the session is still on chain.
             contract_factory = self.get_contract_factory(
                 contract_name,
                 link_dependencies=kwargs.get('link_dependencies'),
             )
-            deploy_txn_hash = contract_factory.deploy(
-                transaction=deploy_transaction,
-                args=deploy_args,
-                kwargs=deploy_kwargs,
+            deploy_cache_key = get_deploy_cache_key(
+                contract_name,
+                contract_factory.code,
+                deploy_transaction,
+                deploy_args,
+                deploy_kwargs,
             )
-            contract_address = self.wait.for_contract_address(deploy_txn_hash)
+            contract_address = self.deploy_cache.get(deploy_cache_key)
+            is_cached_deployment = (
+                contract_address is not None and
+                self.bytecode_verifier.verify(
+                    contract_address,
+                    contract_factory.code_runtime,
+                )
+            )
+            if not is_cached_deployment:
+                deploy_txn_hash = contract_factory.deploy(
+                    transaction=deploy_transaction,
+                    args=deploy_args,
+                    kwargs=deploy_kwargs,
+                )
+                contract_address = self.wait.for_contract_address(deploy_txn_hash)
+                self.deploy_cache[deploy_cache_key] = contract_address
 
             # Then register the address with the registrar so that the super
             # method will be able to get and return it.
@@ -632,6 +981,7 @@ class TestRPCChain(Chain):
                 contract_address,
             )
             self.wait.for_receipt(register_txn_hash)
+            self.registrar_client.invalidate(contract_key)
         return super(TestRPCChain, self).get_contract(
             contract_name,
             link_dependencies=link_dependencies,
@@ -746,6 +1096,7 @@ class BaseGethChain(Chain):
         return get_registrar(
             self.web3,
             address=self.chain_config['registrar'],
+            project_dir=self.project.project_dir,
         )
 
     def get_geth_process_instance(self):
@@ -793,7 +1144,7 @@ class TemporaryGethChain(BaseGethChain):
 
     @cached_property
     def registrar(self):
-        RegistrarFactory = get_registrar(self.web3)
+        RegistrarFactory = get_registrar(self.web3, project_dir=self.project.project_dir)
         deploy_txn_hash = RegistrarFactory.deploy()
         registrar_address = self.wait.for_contract_address(deploy_txn_hash)
         registrar = RegistrarFactory(address=registrar_address)
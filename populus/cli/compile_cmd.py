@@ -2,6 +2,9 @@ import gevent
 
 import click
 
+from populus.observers import (
+    DEFAULT_DEBOUNCE,
+)
 from populus.utils.cli import (
     compile_project_contracts,
     watch_project_contracts,
@@ -24,8 +27,35 @@ from .main import main
     is_flag=True,
     help="Enable compile time optimization",
 )
+@click.option(
+    '--no-cache',
+    'no_cache',
+    is_flag=True,
+    help="Ignore previously cached compiler output and always invoke solc",
+)
+@click.option(
+    '--jobs',
+    '-j',
+    type=int,
+    default=None,
+    help=(
+        "Number of processes used to compile independent groups of source "
+        "files.  Defaults to the `compile_jobs` project configuration value.  "
+        "Recompiles in watch mode always use a single process."
+    ),
+)
+@click.option(
+    '--debounce',
+    type=float,
+    default=DEFAULT_DEBOUNCE,
+    help=(
+        "When watching, the number of seconds to wait for further changes "
+        "before recompiling."
+    ),
+)
+@click.argument('contracts', nargs=-1)
 @click.pass_context
-def compile_contracts(ctx, watch, optimize):
+def compile_contracts(ctx, watch, optimize, no_cache, jobs, debounce, contracts):
     """
     Compile project contracts, storing their output in `./build/contracts.json`
 
@@ -37,12 +67,24 @@ def compile_contracts(ctx, watch, optimize):
     """
     project = ctx.obj['PROJECT']
 
-    compile_project_contracts(project, optimize=True)
+    if jobs is None:
+        jobs = project.compile_jobs
+
+    compile_project_contracts(
+        project,
+        optimize=True,
+        use_cache=not no_cache,
+        jobs=jobs,
+        selectors=contracts,
+    )
 
     if watch:
         thread = gevent.spawn(
             watch_project_contracts,
             project=project,
+            debounce=debounce,
             optimize=True,
+            use_cache=not no_cache,
+            selectors=contracts,
         )
         thread.join()
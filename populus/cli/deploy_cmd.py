@@ -7,6 +7,8 @@ from populus.utils.cli import (
     show_chain_sync_progress,
     get_unlocked_deploy_from_address,
     deploy_contract_and_verify,
+    deploy_contracts_and_verify,
+    register_contract_addresses,
     select_project_contract,
 )
 from populus.utils.deploy import (
@@ -41,6 +43,144 @@ def echo_post_deploy_message(web3, deployed_contracts):
         ))
 
 
+def prompt_for_existing_contract(chain, contract_name, link_dependencies):
+    """
+    Check if we already have an existing deployed version of the contract (via
+    the registry) and if so prompt the user if they would like to use it.
+    """
+    existing_contract = get_contract_from_registrar(
+        chain=chain,
+        contract_name=contract_name,
+        contract_factory=chain.contract_factories[contract_name],
+        link_dependencies=link_dependencies,
+    )
+    if existing_contract:
+        found_existing_contract_prompt = (
+            "Found existing version of {name} in registrar. "
+            "Would you like to use the previously deployed "
+            "contract @ {address}?".format(
+                name=contract_name,
+                address=existing_contract.address,
+            )
+        )
+        if click.prompt(found_existing_contract_prompt):
+            return existing_contract
+    return None
+
+
+def deploy_contracts_in_order(chain,
+                              deploy_order,
+                              contracts_to_deploy,
+                              deployed_contracts):
+    for contract_name in deploy_order:
+        link_dependencies = {
+            contract_name: contract.address
+            for contract_name, contract
+            in deployed_contracts.items()
+        }
+
+        if contract_name not in contracts_to_deploy and chain.has_registrar:
+            existing_contract = prompt_for_existing_contract(
+                chain,
+                contract_name,
+                link_dependencies,
+            )
+            if existing_contract:
+                deployed_contracts[contract_name] = existing_contract
+                continue
+
+        # We don't have an existing version of this contract available so
+        # deploy it.
+        contract = deploy_contract_and_verify(
+            chain,
+            contract_name=contract_name,
+            link_dependencies=link_dependencies,
+        )
+
+        if chain.has_registrar:
+            # TODO: this block should be a standalone cli util.
+            contract_key = 'contract/{name}'.format(name=contract_name)
+            register_txn_hash = chain.registrar.transact().setAddress(
+                contract_key, contract.address
+            )
+            register_msg = (
+                "Registering contract '{name}' @ {address} "
+                "in registrar in txn: {txn_hash} ...".format(
+                    name=contract_name,
+                    address=contract.address,
+                    txn_hash=register_txn_hash,
+                )
+            )
+            click.echo(register_msg, nl=False)
+            chain.wait.for_receipt(register_txn_hash, timeout=180)
+            chain.registrar_client.invalidate(contract_key)
+            click.echo(' DONE')
+        deployed_contracts[contract_name] = contract
+
+
+def deploy_contract_levels(chain,
+                           deploy_levels,
+                           contracts_to_deploy,
+                           deployed_contracts):
+    """
+    Deploy each level of contracts which do not depend on each other at once.
+    Registrar transactions are sent alongside the deploys of the following
+    levels and are all waited for at the end.
+    """
+    nonce = None
+    register_txn_hashes = []
+
+    for level in deploy_levels:
+        link_dependencies = {
+            contract_name: contract.address
+            for contract_name, contract
+            in deployed_contracts.items()
+        }
+
+        contract_names_to_deploy = []
+        for contract_name in level:
+            if contract_name not in contracts_to_deploy and chain.has_registrar:
+                existing_contract = prompt_for_existing_contract(
+                    chain,
+                    contract_name,
+                    link_dependencies,
+                )
+                if existing_contract:
+                    deployed_contracts[contract_name] = existing_contract
+                    continue
+            contract_names_to_deploy.append(contract_name)
+
+        if not contract_names_to_deploy:
+            continue
+
+        level_contracts, nonce = deploy_contracts_and_verify(
+            chain,
+            contract_names=contract_names_to_deploy,
+            link_dependencies=link_dependencies,
+            nonce=nonce,
+        )
+        if chain.has_registrar:
+            level_register_txn_hashes, nonce = register_contract_addresses(
+                chain,
+                level_contracts,
+                nonce=nonce,
+            )
+            register_txn_hashes.extend(level_register_txn_hashes)
+        deployed_contracts.update(level_contracts)
+
+    if register_txn_hashes:
+        click.echo(
+            "Waiting for {0} registrar transactions ...".format(len(register_txn_hashes)),
+            nl=False,
+        )
+        chain.wait.for_receipts(register_txn_hashes, timeout=180)
+        for contract_name in deployed_contracts:
+            chain.registrar_client.invalidate(
+                'contract/{name}'.format(name=contract_name),
+            )
+        click.echo(' DONE')
+
+
 @main.command('deploy')
 @click.option(
     'deploy_from',
@@ -62,9 +202,18 @@ def echo_post_deploy_message(web3, deployed_contracts):
         "networks.  Other values should be predefined in your populus.ini"
     ),
 )
+@click.option(
+    '--parallel',
+    is_flag=True,
+    help=(
+        "Deploy contracts which do not depend on each other at the same time "
+        "rather than waiting for each deploy to be mined before sending the "
+        "next."
+    ),
+)
 @click.argument('contracts_to_deploy', nargs=-1)
 @click.pass_context
-def deploy(ctx, chain_name, deploy_from, contracts_to_deploy):
+def deploy(ctx, chain_name, deploy_from, parallel, contracts_to_deploy):
     """
     Deploys the specified contracts to a chain.
     """
@@ -74,7 +223,8 @@ def deploy(ctx, chain_name, deploy_from, contracts_to_deploy):
     if not chain_name:
         chain_name = select_chain(project)
 
-    compiled_contracts = project.compiled_contracts
+    dependency_graph = project.dependency_graph
+    compiled_contracts = dependency_graph.compiled_contracts
 
     if contracts_to_deploy:
         # validate that we *know* about all of the contracts
@@ -121,6 +271,7 @@ def deploy(ctx, chain_name, deploy_from, contracts_to_deploy):
         deploy_order = get_deploy_order(
             contracts_to_deploy,
             compiled_contracts,
+            dependency_graph=dependency_graph,
         )
 
         # Display Start Message Info.
@@ -136,64 +287,20 @@ def deploy(ctx, chain_name, deploy_from, contracts_to_deploy):
         )
         click.echo(starting_msg)
 
-        for contract_name, _ in deploy_order.items():
-            link_dependencies = {
-                contract_name: contract.address
-                for contract_name, contract
-                in deployed_contracts.items()
-            }
-            contract_factory = chain.contract_factories[contract_name]
-
-            # Check if we already have an existing deployed version of that
-            # contract (via the registry).  For each of these, prompt the user
-            # if they would like to use the existing version.
-            if contract_name not in contracts_to_deploy and chain.has_registrar:
-                # TODO: this block should be a standalone cli util.
-                existing_contract = get_contract_from_registrar(
-                    chain=chain,
-                    contract_name=contract_name,
-                    contract_factory=contract_factory,
-                    link_dependencies=link_dependencies,
-                )
-                if existing_contract:
-                    found_existing_contract_prompt = (
-                        "Found existing version of {name} in registrar. "
-                        "Would you like to use the previously deployed "
-                        "contract @ {address}?".format(
-                            name=contract_name,
-                            address=existing_contract.address,
-                        )
-                    )
-                    if click.prompt(found_existing_contract_prompt):
-                        deployed_contracts[contract_name] = existing_contract
-                        continue
-
-            # We don't have an existing version of this contract available so
-            # deploy it.
-            contract = deploy_contract_and_verify(
+        if parallel:
+            deploy_contract_levels(
                 chain,
-                contract_name=contract_name,
-                link_dependencies=link_dependencies,
+                dependency_graph.get_deploy_levels(contracts_to_deploy),
+                contracts_to_deploy,
+                deployed_contracts,
+            )
+        else:
+            deploy_contracts_in_order(
+                chain,
+                deploy_order.keys(),
+                contracts_to_deploy,
+                deployed_contracts,
             )
-
-            if chain.has_registrar:
-                # TODO: this block should be a standalone cli util.
-                contract_key = 'contract/{name}'.format(name=contract_name)
-                register_txn_hash = chain.registrar.transact().setAddress(
-                    contract_key, contract.address
-                )
-                register_msg = (
-                    "Registering contract '{name}' @ {address} "
-                    "in registrar in txn: {txn_hash} ...".format(
-                        name=contract_name,
-                        address=contract.address,
-                        txn_hash=register_txn_hash,
-                    )
-                )
-                click.echo(register_msg, nl=False)
-                chain.wait.for_receipt(register_txn_hash, timeout=180)
-                click.echo(' DONE')
-            deployed_contracts[contract_name] = contract
 
         # TODO: fix this message.
         success_msg = (
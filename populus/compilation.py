@@ -1,11 +1,47 @@
 import os
 import json
+import hashlib
+import itertools
+import collections
+import multiprocessing
 
 from populus.utils.filesystem import (
     get_compiled_contracts_file_path,
+    get_compact_artifacts_file_path,
+    get_contract_artifacts_dir,
+    get_source_manifest_file_path,
+    get_compile_cache_dir,
     recursive_find_files,
+    write_file_if_changed,
     DEFAULT_CONTRACTS_DIR
 )
+from populus.utils.compile_cache import (
+    CompilationCache,
+)
+from populus.utils.compiler import (
+    get_solc_toolchain,
+)
+from populus.utils.contracts import (
+    add_link_references,
+    load_compiled_contract_json,
+)
+from populus.utils.artifacts import (
+    get_artifact_index_path,
+    write_contract_artifacts,
+    write_compact_artifacts,
+    LazyContractArtifacts,
+    CompactContractArtifacts,
+)
+from populus.utils.sources import (
+    find_solidity_imports,
+    find_solidity_declarations,
+    resolve_import_path,
+    get_transitive_imports,
+    get_transitive_importers,
+    find_transitive_source_imports,
+    get_declared_contract_names,
+    get_connected_components,
+)
 from solc import (
     compile_files,
 )
@@ -23,35 +59,842 @@ def find_project_contracts(project_dir, contracts_rel_dir=DEFAULT_CONTRACTS_DIR)
 
 
 def write_compiled_sources(project_dir, compiled_sources):
+    """
+    Atomically write the compiled contracts to `contracts.json`.  The file is
+    left untouched if its content would not change.
+    """
     compiled_contract_path = get_compiled_contracts_file_path(project_dir)
 
-    with open(compiled_contract_path, 'w') as outfile:
-        outfile.write(
-            json.dumps(compiled_sources,
-                       sort_keys=True,
-                       indent=4,
-                       separators=(',', ': '))
-        )
+    write_file_if_changed(
+        compiled_contract_path,
+        json.dumps(compiled_sources,
+                   sort_keys=True,
+                   indent=4,
+                   separators=(',', ': ')).encode('utf8'),
+    )
     return compiled_contract_path
 
 
-def compile_project_contracts(project_dir, contracts_dir, **compiler_kwargs):
-    compiler_kwargs.setdefault('output_values', ['bin', 'bin-runtime', 'abi'])
-    contract_source_paths = find_project_contracts(project_dir, contracts_dir)
+ARTIFACT_FORMAT_JSON = 'json'
+ARTIFACT_FORMAT_SPLIT = 'split'
+ARTIFACT_FORMAT_COMPACT = 'compact'
+
+ARTIFACT_FORMATS = (
+    ARTIFACT_FORMAT_JSON,
+    ARTIFACT_FORMAT_SPLIT,
+    ARTIFACT_FORMAT_COMPACT,
+)
+
+
+def validate_artifact_format(artifact_format):
+    if artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(
+            "Unknown artifact format {0!r}.  Must be one of {1}".format(
+                artifact_format,
+                ', '.join(ARTIFACT_FORMATS),
+            )
+        )
+
+
+def write_compiled_artifacts(project_dir,
+                             compiled_sources,
+                             artifact_format=ARTIFACT_FORMAT_JSON,
+                             contract_names=None):
+    """
+    Write the compiled contracts to the build directory using the given
+    artifact format, returning the path that was written.  `contract_names`
+    optionally limits which existing per-contract files of the `split` format
+    are rewritten.
+    """
+    validate_artifact_format(artifact_format)
+
+    if artifact_format == ARTIFACT_FORMAT_SPLIT:
+        return write_contract_artifacts(
+            get_contract_artifacts_dir(project_dir),
+            compiled_sources,
+            contract_names=contract_names,
+        )
+    elif artifact_format == ARTIFACT_FORMAT_COMPACT:
+        # `contracts.json` is still written for compatibility with external
+        # tooling.
+        write_compiled_sources(project_dir, compiled_sources)
+        return write_compact_artifacts(
+            get_compact_artifacts_file_path(project_dir),
+            compiled_sources,
+        )
+    return write_compiled_sources(project_dir, compiled_sources)
+
+
+def get_compiled_artifacts_path(project_dir, artifact_format=ARTIFACT_FORMAT_JSON):
+    """
+    Returns the path that `write_compiled_artifacts` writes for the given
+    artifact format.
+    """
+    validate_artifact_format(artifact_format)
+
+    if artifact_format == ARTIFACT_FORMAT_SPLIT:
+        return get_artifact_index_path(get_contract_artifacts_dir(project_dir))
+    elif artifact_format == ARTIFACT_FORMAT_COMPACT:
+        return get_compact_artifacts_file_path(project_dir)
+    return get_compiled_contracts_file_path(project_dir)
+
+
+ContractDelta = collections.namedtuple('ContractDelta', [
+    'status',
+    'abi_changed',
+    'bytecode_changed',
+])
+
+CONTRACT_ADDED = 'added'
+CONTRACT_REMOVED = 'removed'
+CONTRACT_CHANGED = 'changed'
+
+BYTECODE_KEYS = ('code', 'code_runtime')
+
+
+def get_contract_delta(previous_contract_data, contract_data):
+    """
+    Returns a `ContractDelta` describing how a contract changed between two
+    compilations or `None` if it did not change.  Either argument may be
+    `None` for a contract which was added or removed.
+    """
+    if previous_contract_data is None:
+        return ContractDelta(CONTRACT_ADDED, True, True)
+    elif contract_data is None:
+        return ContractDelta(CONTRACT_REMOVED, True, True)
+    elif contract_data is previous_contract_data or contract_data == previous_contract_data:
+        return None
+
+    return ContractDelta(
+        CONTRACT_CHANGED,
+        contract_data.get('abi') != previous_contract_data.get('abi'),
+        any(
+            contract_data.get(key) != previous_contract_data.get(key)
+            for key in BYTECODE_KEYS
+        ),
+    )
+
+
+def get_contract_deltas(previous_compiled_sources,
+                        compiled_sources,
+                        contract_names=None):
+    """
+    Returns a mapping of contract name to `ContractDelta` for each contract
+    which was added, removed, or whose compiled output differs between the
+    two compilations.  If given, only `contract_names` along with any
+    contracts that were added or removed are compared.
+    """
+    if previous_compiled_sources is None:
+        previous_compiled_sources = {}
+
+    contract_names_to_compare = set(previous_compiled_sources.keys()).symmetric_difference(
+        compiled_sources.keys(),
+    )
+    if contract_names is None:
+        contract_names_to_compare.update(compiled_sources.keys())
+    else:
+        contract_names_to_compare.update(contract_names)
+
+    contract_deltas = {}
+    for contract_name in contract_names_to_compare:
+        contract_delta = get_contract_delta(
+            previous_compiled_sources.get(contract_name),
+            compiled_sources.get(contract_name),
+        )
+        if contract_delta is not None:
+            contract_deltas[contract_name] = contract_delta
+    return contract_deltas
+
+
+def get_changed_contract_names(previous_compiled_sources, compiled_sources):
+    """
+    Returns the set of contract names which were added, removed, or whose
+    compiled output differs between the two compilations.
+    """
+    return set(get_contract_deltas(previous_compiled_sources, compiled_sources))
+
+
+def load_compiled_artifacts(project_dir, artifact_format=ARTIFACT_FORMAT_JSON):
+    """
+    Load the compiled contracts from the build directory.  The `split`
+    and `compact` formats are loaded lazily.  Raises `ValueError` if no
+    compiled contracts are found.
+    """
+    validate_artifact_format(artifact_format)
+
+    if artifact_format == ARTIFACT_FORMAT_SPLIT:
+        return LazyContractArtifacts(get_contract_artifacts_dir(project_dir))
+    elif artifact_format == ARTIFACT_FORMAT_COMPACT:
+        return CompactContractArtifacts(get_compact_artifacts_file_path(project_dir))
+    return load_compiled_contract_json(project_dir)
+
+
+def build_source_manifest(source_paths, solc_version, compiler_kwargs):
+    """
+    Returns a description of the given source files which records the digest,
+    declared contract names and imports of each file along with the compiler
+    configuration.  Comparing two manifests tells us which sources need to be
+    recompiled.
+    """
+    return {
+        'solc_version': solc_version,
+        # round trip through JSON so that this compares equal to a manifest
+        # that has been loaded from disk.
+        'compiler_kwargs': json.loads(
+            json.dumps(compiler_kwargs, sort_keys=True, default=str)
+        ),
+        'sources': {
+            os.path.relpath(source_path): build_source_manifest_entry(source_path)
+            for source_path in source_paths
+        },
+    }
+
+
+def build_source_manifest_entry(source_path):
+    with open(source_path, 'rb') as source_file:
+        source_bytes = source_file.read()
+    source = source_bytes.decode('utf8')
+
+    return {
+        'digest': hashlib.sha256(source_bytes).hexdigest(),
+        'contracts': sorted(find_solidity_declarations(source)),
+        'imports': sorted({
+            resolve_import_path(import_path, source_path)
+            for import_path in find_solidity_imports(source)
+        }),
+    }
+
+
+def update_source_manifest(source_manifest,
+                           source_paths,
+                           changed_source_paths,
+                           solc_version,
+                           compiler_kwargs):
+    """
+    Same as `build_source_manifest` but only the sources in
+    `changed_source_paths` along with any sources missing from
+    `source_manifest` are read.  The entries for all other sources are reused
+    from `source_manifest`.
+    """
+    previous_sources = source_manifest['sources']
+    source_paths = {os.path.relpath(source_path) for source_path in source_paths}
+    changed_source_paths = {
+        os.path.relpath(source_path) for source_path in changed_source_paths
+    }
+
+    source_paths_to_read = {
+        source_path
+        for source_path in source_paths
+        if source_path in changed_source_paths or source_path not in previous_sources
+    }
+    next_source_manifest = build_source_manifest(
+        source_paths_to_read,
+        solc_version,
+        compiler_kwargs,
+    )
+    next_source_manifest['sources'].update({
+        source_path: previous_sources[source_path]
+        for source_path in source_paths.difference(source_paths_to_read)
+    })
+    return next_source_manifest
+
+
+def get_source_paths_to_recompile(previous_source_manifest, source_manifest):
+    """
+    Returns a tuple of the set of source paths that need to be recompiled and
+    the set of source paths that have been removed since
+    `previous_source_manifest` was built.
+
+    A source path needs to be recompiled if it is new, if its contents have
+    changed, or if it imports (directly or indirectly) a source that has
+    changed or been removed.
+    """
+    current_sources = source_manifest['sources']
+
+    is_full_rebuild = (
+        previous_source_manifest is None or
+        previous_source_manifest['solc_version'] != source_manifest['solc_version'] or
+        previous_source_manifest['compiler_kwargs'] != source_manifest['compiler_kwargs']
+    )
+    if is_full_rebuild:
+        return set(current_sources.keys()), set()
+
+    previous_sources = previous_source_manifest['sources']
+
+    removed_source_paths = set(previous_sources.keys()).difference(current_sources.keys())
+    changed_source_paths = {
+        source_path
+        for source_path, source_data in current_sources.items()
+        if (
+            source_path not in previous_sources or
+            previous_sources[source_path]['digest'] != source_data['digest']
+        )
+    }
+
+    import_graph = {
+        source_path: set(source_data['imports'])
+        for source_path, source_data in current_sources.items()
+    }
+    affected_source_paths = get_transitive_importers(
+        import_graph,
+        changed_source_paths.union(removed_source_paths),
+    ).intersection(current_sources.keys())
+
+    return affected_source_paths, removed_source_paths
+
+
+def get_manifest_import_graph(source_manifest):
+    return {
+        source_path: set(source_data['imports'])
+        for source_path, source_data in source_manifest['sources'].items()
+    }
+
+
+def is_same_compiler_configuration(source_manifest_a, source_manifest_b):
+    return (
+        source_manifest_a['solc_version'] == source_manifest_b['solc_version'] and
+        source_manifest_a['compiler_kwargs'] == source_manifest_b['compiler_kwargs']
+    )
+
+
+def parse_contract_selector(selector):
+    """
+    Parse a contract selector into a tuple of `(source_path, contract_name)`
+    where either may be `None`.  Selectors take one of the forms
+    `ContractName`, `path/to/source.sol` or `path/to/source.sol:ContractName`.
+    """
+    source_path, colon, contract_name = selector.rpartition(':')
+    if colon and contract_name and not contract_name.endswith('.sol') and \
+            os.path.sep not in contract_name and '/' not in contract_name:
+        return os.path.relpath(source_path), contract_name
+    elif selector.endswith('.sol') or os.path.sep in selector or '/' in selector:
+        return os.path.relpath(selector), None
+    return None, selector
+
+
+def resolve_contract_selectors(source_manifest, selectors):
+    """
+    Returns the set of source paths which declare the contracts chosen by
+    `selectors`.  Raises `ValueError` for any selector which does not match.
+    """
+    sources = source_manifest['sources']
+
+    selected_source_paths = set()
+    for selector in selectors:
+        source_path, contract_name = parse_contract_selector(selector)
+
+        if source_path is not None:
+            if source_path not in sources:
+                raise ValueError(
+                    "No contract source file found at {0!r}".format(source_path)
+                )
+            if contract_name is not None and \
+                    contract_name not in sources[source_path]['contracts']:
+                raise ValueError(
+                    "The source file {0!r} does not declare a contract named "
+                    "{1!r}".format(source_path, contract_name)
+                )
+            selected_source_paths.add(source_path)
+        else:
+            matching_source_paths = {
+                path
+                for path, source_data in sources.items()
+                if contract_name in source_data['contracts']
+            }
+            if not matching_source_paths:
+                raise ValueError(
+                    "No contract named {0!r} found in the project sources".format(
+                        contract_name,
+                    )
+                )
+            selected_source_paths.update(matching_source_paths)
+
+    return selected_source_paths
+
+
+def get_compilation_cache(project_dir):
+    return CompilationCache(get_compile_cache_dir(project_dir))
+
+
+def compile_sources(source_paths, compilation_cache=None, **compiler_kwargs):
+    """
+    Compile the given source files, returning the stored compiler output from
+    `compilation_cache` when these exact sources, along with everything they
+    import, have already been compiled with the same version of solc and the
+    same compiler arguments.
+
+    Each contract is annotated with the `link_references` of its bytecode
+    (see `build_contract_link_references`).
+    """
+    solc_toolchain = get_solc_toolchain()
+
+    if compilation_cache is not None:
+        cache_key = compilation_cache.get_cache_key(
+            find_transitive_source_imports(source_paths),
+            solc_toolchain.version,
+            compiler_kwargs,
+        )
+        compiled_sources = compilation_cache.get(cache_key)
+        if compiled_sources is not None:
+            # Entries cached before link references were recorded are
+            # annotated on the way out.
+            return add_link_references(compiled_sources)
+
+    if solc_toolchain.binary_path is not None:
+        # Compile with the same binary the toolchain describes rather than the
+        # one py-solc resolved when it was imported.
+        compiler_kwargs = dict(compiler_kwargs, solc_binary=solc_toolchain.binary_path)
+
     try:
-        compiled_sources = compile_files(contract_source_paths, **compiler_kwargs)
+        compiled_sources = add_link_references(
+            compile_files(source_paths, **compiler_kwargs)
+        )
     except ContractsNotFound:
-        return contract_source_paths, {}
+        return {}
+
+    if compilation_cache is not None:
+        compilation_cache.set(cache_key, compiled_sources)
+
+    return compiled_sources
 
-    return contract_source_paths, compiled_sources
 
+def _compile_source_unit(args):
+    source_paths, compilation_cache, compiler_kwargs = args
+    return compile_sources(
+        source_paths,
+        compilation_cache=compilation_cache,
+        **compiler_kwargs
+    )
+
+
+def compile_source_units(source_units,
+                         jobs=1,
+                         compilation_cache=None,
+                         **compiler_kwargs):
+    """
+    Compile each group of source paths in `source_units` using a pool of up to
+    `jobs` worker processes.  The groups must not share any imports.  The
+    output is merged in the order of `source_units` so that the result does
+    not depend on which worker finishes first.
+    """
+    if jobs <= 1 or len(source_units) <= 1:
+        source_paths = sorted(set(itertools.chain.from_iterable(source_units)))
+        return compile_sources(
+            source_paths,
+            compilation_cache=compilation_cache,
+            **compiler_kwargs
+        )
+
+    pool = multiprocessing.Pool(processes=min(jobs, len(source_units)))
+    try:
+        unit_outputs = pool.map(_compile_source_unit, [
+            (list(source_paths), compilation_cache, compiler_kwargs)
+            for source_paths in source_units
+        ])
+    finally:
+        pool.close()
+        pool.join()
+
+    compiled_sources = {}
+    for unit_output in unit_outputs:
+        compiled_sources.update(unit_output)
+    return compiled_sources
+
+
+def recompile_project_contracts(project_dir,
+                                contracts_dir,
+                                compiled_sources=None,
+                                source_manifest=None,
+                                use_cache=True,
+                                jobs=1,
+                                source_paths=None,
+                                changed_source_paths=None,
+                                **compiler_kwargs):
+    """
+    Incrementally compile the project contracts.  `compiled_sources` and
+    `source_manifest` are the output of a previous compilation.  Only the
+    sources which have changed along with the sources which import them are
+    recompiled and the result is merged into `compiled_sources`.
+
+    Callers which already know the project's `source_paths` and which of
+    them have changed since `source_manifest` was built (such as watch mode)
+    may pass them to avoid walking the contracts directory and reading every
+    source file.
+
+    Returns a tuple of `(contract_source_paths, compiled_sources,
+    source_manifest, recompiled_source_paths)`.
+    """
+    compiler_kwargs.setdefault('output_values', ['bin', 'bin-runtime', 'abi'])
+    if source_paths is None:
+        contract_source_paths = find_project_contracts(project_dir, contracts_dir)
+    else:
+        contract_source_paths = tuple(sorted(source_paths))
+
+    if compiled_sources is None:
+        source_manifest = None
+
+    if source_manifest is not None and changed_source_paths is not None:
+        next_source_manifest = update_source_manifest(
+            source_manifest,
+            contract_source_paths,
+            changed_source_paths,
+            get_solc_toolchain().version,
+            compiler_kwargs,
+        )
+    else:
+        next_source_manifest = build_source_manifest(
+            contract_source_paths,
+            get_solc_toolchain().version,
+            compiler_kwargs,
+        )
+    source_paths_to_compile, removed_source_paths = get_source_paths_to_recompile(
+        source_manifest,
+        next_source_manifest,
+    )
+
+    if source_manifest is None:
+        next_compiled_sources = {}
+    elif not source_paths_to_compile and not removed_source_paths:
+        # Nothing has changed.  Return the previous compiled sources as-is so
+        # that lazily loaded artifacts stay lazy.
+        return (
+            contract_source_paths,
+            compiled_sources,
+            next_source_manifest,
+            tuple(),
+        )
+    else:
+        stale_contract_names = get_declared_contract_names(
+            source_manifest,
+            source_paths_to_compile.union(removed_source_paths),
+        )
+        next_compiled_sources = {
+            contract_name: contract_data
+            for contract_name, contract_data in compiled_sources.items()
+            if contract_name not in stale_contract_names
+        }
+
+    if use_cache:
+        compilation_cache = get_compilation_cache(project_dir)
+    else:
+        compilation_cache = None
+
+    if source_paths_to_compile:
+        source_units = get_connected_components(
+            get_manifest_import_graph(next_source_manifest),
+            source_paths_to_compile,
+        )
+        next_compiled_sources.update(compile_source_units(
+            source_units,
+            jobs=jobs,
+            compilation_cache=compilation_cache,
+            **compiler_kwargs
+        ))
+
+    return (
+        contract_source_paths,
+        next_compiled_sources,
+        next_source_manifest,
+        tuple(sorted(source_paths_to_compile)),
+    )
+
+
+def compile_selected_contracts(project_dir,
+                               contracts_dir,
+                               selectors,
+                               compiled_sources=None,
+                               source_manifest=None,
+                               use_cache=True,
+                               jobs=1,
+                               **compiler_kwargs):
+    """
+    Compile only the sources needed for the contracts chosen by `selectors`
+    (see `parse_contract_selector`) along with everything they import.
+    Sources which are unchanged since `source_manifest` was built are not
+    recompiled.  The output is merged into `compiled_sources` without
+    discarding any other contracts and the entries for the compiled sources
+    are merged into `source_manifest`.
+
+    Returns the same tuple as `recompile_project_contracts` where
+    `contract_source_paths` is the set of sources the selection requires.
+    """
+    compiler_kwargs.setdefault('output_values', ['bin', 'bin-runtime', 'abi'])
+    contract_source_paths = find_project_contracts(project_dir, contracts_dir)
+
+    if compiled_sources is None:
+        source_manifest = None
+
+    next_source_manifest = build_source_manifest(
+        contract_source_paths,
+        get_solc_toolchain().version,
+        compiler_kwargs,
+    )
+    selected_source_paths = resolve_contract_selectors(next_source_manifest, selectors)
+    import_graph = get_manifest_import_graph(next_source_manifest)
+    required_source_paths = get_transitive_imports(
+        import_graph,
+        selected_source_paths,
+    ).intersection(next_source_manifest['sources'])
+
+    if source_manifest is not None and \
+            not is_same_compiler_configuration(source_manifest, next_source_manifest):
+        # The previous manifest entries describe output from a different
+        # compiler configuration so none of them can be reused.
+        source_manifest = None
+
+    source_paths_to_compile, _ = get_source_paths_to_recompile(
+        source_manifest,
+        next_source_manifest,
+    )
+    source_paths_to_compile.intersection_update(required_source_paths)
+
+    if compiled_sources is not None and not source_paths_to_compile:
+        return (
+            tuple(sorted(required_source_paths)),
+            compiled_sources,
+            source_manifest,
+            tuple(),
+        )
+
+    if source_manifest is None:
+        stale_contract_names = set()
+        merged_sources = {}
+    else:
+        stale_contract_names = get_declared_contract_names(
+            source_manifest,
+            source_paths_to_compile,
+        )
+        # Entries for sources which have since been removed are kept so that
+        # the next full build removes their contracts.
+        merged_sources = dict(source_manifest['sources'])
+
+    next_compiled_sources = {
+        contract_name: contract_data
+        for contract_name, contract_data in (compiled_sources or {}).items()
+        if contract_name not in stale_contract_names
+    }
+    next_compiled_sources.update(compile_source_units(
+        get_connected_components(import_graph, source_paths_to_compile),
+        jobs=jobs,
+        compilation_cache=get_compilation_cache(project_dir) if use_cache else None,
+        **compiler_kwargs
+    ))
 
-def compile_and_write_contracts(project_dir, contracts_dir, **compiler_kwargs):
-    contract_source_paths, compiled_sources = compile_project_contracts(
+    merged_sources.update({
+        source_path: next_source_manifest['sources'][source_path]
+        for source_path in source_paths_to_compile
+    })
+
+    return (
+        tuple(sorted(required_source_paths)),
+        next_compiled_sources,
+        dict(next_source_manifest, sources=merged_sources),
+        tuple(sorted(source_paths_to_compile)),
+    )
+
+
+def compile_project_contracts(project_dir,
+                              contracts_dir,
+                              use_cache=True,
+                              jobs=1,
+                              **compiler_kwargs):
+    contract_source_paths, compiled_sources, _, _ = recompile_project_contracts(
         project_dir,
         contracts_dir,
+        use_cache=use_cache,
+        jobs=jobs,
         **compiler_kwargs
     )
+    return contract_source_paths, compiled_sources
+
+
+def load_source_manifest(project_dir):
+    source_manifest_path = get_source_manifest_file_path(project_dir)
+
+    if not os.path.exists(source_manifest_path):
+        return None
+
+    with open(source_manifest_path) as source_manifest_file:
+        try:
+            return json.load(source_manifest_file)
+        except ValueError:
+            return None
+
+
+def write_source_manifest(project_dir, source_manifest):
+    source_manifest_path = get_source_manifest_file_path(project_dir)
+
+    write_file_if_changed(
+        source_manifest_path,
+        json.dumps(source_manifest, sort_keys=True).encode('utf8'),
+    )
+    return source_manifest_path
+
+
+def load_previous_build(project_dir, artifact_format=ARTIFACT_FORMAT_JSON):
+    """
+    Returns the `(compiled_sources, source_manifest)` of the last build that
+    was written to the build directory or `(None, None)` if there is none.
+    """
+    source_manifest = load_source_manifest(project_dir)
+    if source_manifest is None:
+        return None, None
+
+    # The artifacts in the other format may be left over from an older build.
+    if source_manifest.get('artifact_format', ARTIFACT_FORMAT_JSON) != artifact_format:
+        return None, None
+
+    try:
+        compiled_sources = load_compiled_artifacts(project_dir, artifact_format)
+    except ValueError:
+        return None, None
+
+    return compiled_sources, source_manifest
+
+
+BuildResult = collections.namedtuple('BuildResult', [
+    'contract_source_paths',
+    'compiled_sources',
+    'output_file_path',
+    'changed_contract_names',
+    'source_manifest',
+    'recompiled_source_paths',
+    'contract_deltas',
+])
+
+
+def build_project_contracts(project_dir,
+                            contracts_dir,
+                            use_cache=True,
+                            jobs=1,
+                            artifact_format=ARTIFACT_FORMAT_JSON,
+                            compiled_sources=None,
+                            source_manifest=None,
+                            source_paths=None,
+                            changed_source_paths=None,
+                            selectors=None,
+                            **compiler_kwargs):
+    """
+    Compile the project contracts and write them to the build directory.
+    Artifacts are only written when their content changes and
+    `contract_deltas` of the returned `BuildResult` describes each contract
+    whose compiled output differs from the previous build.
+
+    The previous build is read from the build directory unless it is given as
+    `compiled_sources` and `source_manifest`, which lets a long running
+    process such as watch mode keep it in memory between builds.
+    `source_paths` and `changed_source_paths` are passed through to
+    `recompile_project_contracts`.
+
+    If `selectors` are given only the sources needed for the selected
+    contracts are compiled (see `compile_selected_contracts`) and merged into
+    the existing artifacts.
+    """
+    if compiled_sources is not None:
+        previous_compiled_sources = compiled_sources
+        previous_source_manifest = source_manifest
+    elif use_cache:
+        previous_compiled_sources, previous_source_manifest = load_previous_build(
+            project_dir,
+            artifact_format,
+        )
+    elif selectors:
+        # A selective build is always merged into the existing artifacts but
+        # without the cache nothing from the previous build is reused.
+        previous_compiled_sources, _ = load_previous_build(project_dir, artifact_format)
+        previous_source_manifest = None
+    else:
+        previous_compiled_sources = None
+        previous_source_manifest = None
+
+    if selectors:
+        build_output = compile_selected_contracts(
+            project_dir,
+            contracts_dir,
+            selectors,
+            compiled_sources=previous_compiled_sources,
+            source_manifest=previous_source_manifest,
+            use_cache=use_cache,
+            jobs=jobs,
+            **compiler_kwargs
+        )
+    else:
+        build_output = recompile_project_contracts(
+            project_dir,
+            contracts_dir,
+            compiled_sources=previous_compiled_sources,
+            source_manifest=previous_source_manifest,
+            use_cache=use_cache,
+            jobs=jobs,
+            source_paths=source_paths,
+            changed_source_paths=changed_source_paths,
+            **compiler_kwargs
+        )
+    contract_source_paths, compiled_sources, source_manifest, recompiled_source_paths = (
+        build_output
+    )
 
-    output_file_path = write_compiled_sources(project_dir, compiled_sources)
-    return contract_source_paths, compiled_sources, output_file_path
+    if previous_compiled_sources is not None and compiled_sources is previous_compiled_sources:
+        # Nothing was recompiled so the artifacts on disk are already current.
+        contract_deltas = {}
+        output_file_path = get_compiled_artifacts_path(project_dir, artifact_format)
+    else:
+        if previous_source_manifest is None:
+            contract_names_to_compare = None
+        else:
+            # Only contracts declared in the recompiled or removed sources can
+            # have changed.
+            removed_source_paths = set(previous_source_manifest['sources']).difference(
+                source_manifest['sources'],
+            )
+            contract_names_to_compare = get_declared_contract_names(
+                previous_source_manifest,
+                removed_source_paths.union(recompiled_source_paths),
+            ).union(get_declared_contract_names(
+                source_manifest,
+                recompiled_source_paths,
+            ))
+        contract_deltas = get_contract_deltas(
+            previous_compiled_sources,
+            compiled_sources,
+            contract_names_to_compare,
+        )
+        output_file_path = write_compiled_artifacts(
+            project_dir,
+            compiled_sources,
+            artifact_format,
+            contract_names=(
+                None if previous_compiled_sources is None else set(contract_deltas)
+            ),
+        )
+
+    write_source_manifest(
+        project_dir,
+        dict(source_manifest, artifact_format=artifact_format),
+    )
+    return BuildResult(
+        contract_source_paths,
+        compiled_sources,
+        output_file_path,
+        set(contract_deltas),
+        source_manifest,
+        recompiled_source_paths,
+        contract_deltas,
+    )
+
+
+def compile_and_write_contracts(project_dir,
+                                contracts_dir,
+                                use_cache=True,
+                                jobs=1,
+                                artifact_format=ARTIFACT_FORMAT_JSON,
+                                **compiler_kwargs):
+    result = build_project_contracts(
+        project_dir,
+        contracts_dir,
+        use_cache=use_cache,
+        jobs=jobs,
+        artifact_format=artifact_format,
+        **compiler_kwargs
+    )
+    return result.contract_source_paths, result.compiled_sources, result.output_file_path
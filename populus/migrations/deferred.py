@@ -89,13 +89,23 @@ ALLOWED_VALUE_TYPES = {
 }
 
 
+REGISTRAR_GETTERS_BY_VALUE_TYPE = {
+    'string': 'getString',
+    'bytes32': 'get',
+    'address': 'getAddress',
+    'uint256': 'getUInt',
+    'int256': 'getInt',
+    'bool': 'getBool',
+}
+
+
 class RegistrarValue(DeferredValue):
     key = None
     value_type = None
     value = None
 
     def exists(self, key):
-        return self.chain.registrar.call().exists(key)
+        return self.chain.registrar_client.exists(key)
 
     def get(self):
         if not self.exists(self.key):
@@ -103,20 +113,9 @@ class RegistrarValue(DeferredValue):
                 "The given key is not set on the registrar: `{0}`".format(self.key)
             )
 
-        caller = self.chain.registrar.call()
-
-        if self.value_type == 'string':
-            return caller.getString(self.key)
-        elif self.value_type == 'bytes32':
-            return caller.get(self.key)
-        elif self.value_type == 'address':
-            return caller.getAddress(self.key)
-        elif self.value_type == 'uint256':
-            return caller.getUInt(self.key)
-        elif self.value_type == 'int256':
-            return caller.getInt(self.key)
-        elif self.value_type == 'bool':
-            return caller.getBool(self.key)
+        getter = REGISTRAR_GETTERS_BY_VALUE_TYPE.get(self.value_type)
+        if getter is not None:
+            return self.chain.registrar_client.call(getter, self.key)
 
         raise ValueError("`value_type` must be one of {0}.  Got: {1}".format(
             ', '.join(sorted(ALLOWED_VALUE_TYPES)),
@@ -157,6 +156,7 @@ class RegistrarValue(DeferredValue):
 
         if timeout is not None:
             self.chain.wait.for_receipt(set_txn_hash, timeout=timeout)
+        self.chain.registrar_client.invalidate(self.key)
 
         return set_txn_hash
 
@@ -5,6 +5,13 @@ from toposort import toposort
 
 from web3.utils.types import is_string
 
+from populus.utils.contracts import (
+    DependencyGraph,
+)
+from populus.utils.functional import (
+    cached_property,
+)
+
 from .deferred import (
     generate_registrar_value_setters,
     Bool,
@@ -20,6 +27,10 @@ class Migration(object):
     def __init__(self, chain):
         self.chain = chain
 
+    @cached_property
+    def dependency_graph(self):
+        return DependencyGraph(self.compiled_contracts or {})
+
     @property
     def registrar(self):
         return self.chain.registrar
@@ -39,9 +50,10 @@ class Migration(object):
 
     @property
     def has_been_executed(self):
-        if not self.registrar.call().exists(self.migration_key):
+        registrar_client = self.chain.registrar_client
+        if not registrar_client.exists(self.migration_key):
             return False
-        return self.registrar.call().getBool(self.migration_key)
+        return registrar_client.call('getBool', self.migration_key)
 
     def mark_as_executed(self):
         Bool(self.chain, key=self.migration_key, value=True).set()
@@ -58,7 +70,8 @@ class Migration(object):
         Bool(self.chain, key=operation_key, value=True).set()
 
     def execute(self):
-        if self.registrar.call().exists(self.migration_key):
+        registrar_client = self.chain.registrar_client
+        if registrar_client.exists(self.migration_key):
             raise ValueError("This migration has already been run")
 
         for operation_index, operation in enumerate(self.operations):
@@ -68,8 +81,8 @@ class Migration(object):
             )
 
             operation_alread_executed = (
-                self.registrar.call().exists(operation_key) and
-                self.registrar.call().getBool(operation_key)
+                registrar_client.exists(operation_key) and
+                registrar_client.call('getBool', operation_key)
             )
             if operation_alread_executed:
                 # raise or continue?
@@ -78,6 +91,7 @@ class Migration(object):
             operation_receipt = operation.execute(
                 chain=self.chain,
                 compiled_contracts=self.compiled_contracts,
+                dependency_graph=self.dependency_graph,
             )
 
             self.process_operation_receipt(operation_key, operation_receipt)
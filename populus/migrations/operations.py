@@ -5,7 +5,8 @@ from web3.utils.string import (
 )
 
 from populus.utils.contracts import (
-    get_contract_library_dependencies,
+    expand_shortened_reference_name,
+    get_contract_library_names,
 )
 from populus.utils.deploy import (
     deploy_contract,
@@ -143,7 +144,7 @@ class DeployContract(Operation):
         if timeout is not None:
             self.timeout = timeout
 
-    def execute(self, chain, compiled_contracts, **kwargs):
+    def execute(self, chain, compiled_contracts, dependency_graph=None, **kwargs):
         resolver = Resolver(chain)
 
         contract_name = resolver(self.contract_name)
@@ -173,20 +174,27 @@ class DeployContract(Operation):
         all_known_contract_names = set(libraries.keys()).union(
             set(compiled_contracts.keys())
         )
-        library_dependencies = get_contract_library_dependencies(
-            BaseContractFactory.code,
-            all_known_contract_names,
-        )
+        if dependency_graph is None:
+            library_names = get_contract_library_names(contract_data)
+        else:
+            library_names = dependency_graph.get_dependencies(
+                contract_name,
+                recursive=False,
+            )
+        library_dependencies = {
+            expand_shortened_reference_name(library_name, all_known_contract_names)
+            for library_name in library_names
+        }
 
-        registrar = chain.registrar
+        registrar_client = chain.registrar_client
 
         def resolve_library_link(library_name):
             registrar_key = "contract/{0}".format(library_name)
 
             if library_name in libraries:
                 return libraries[library_name]
-            elif registrar.call().exists(registrar_key):
-                library_address = registrar.call().getAddress(registrar_key)
+            elif registrar_client.exists(registrar_key):
+                library_address = registrar_client.get_address(registrar_key)
                 # TODO: implement validation that this contract address is
                 # in fact the library we want to link against.
                 return library_address
@@ -216,9 +224,13 @@ class DeployContract(Operation):
                 timeout=timeout,
             )
             if verify:
-                code = force_text(chain.web3.eth.getCode(contract_address))
                 expected_code = force_text(contract_factory.code_runtime)
-                if code != expected_code:
+                is_bytecode_match = chain.bytecode_verifier.verify(
+                    contract_address,
+                    expected_code,
+                )
+                if not is_bytecode_match:
+                    code = force_text(chain.web3.eth.getCode(contract_address))
                     raise ValueError(
                         "Bytecode @ {0} does not match expected contract "
                         "bytecode.\n\n"
@@ -325,7 +337,7 @@ class DeployRegistrar(DeployContract):
     def execute(self, chain, **kwargs):
         kwargs.pop('compiled_contracts', None)
         compiled_contracts = {
-            'Registrar': get_compiled_registrar_contract(),
+            'Registrar': get_compiled_registrar_contract(chain.project.project_dir),
         }
         return super(DeployRegistrar, self).execute(
             chain=chain,
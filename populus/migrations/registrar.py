@@ -1,25 +1,48 @@
 import os
+import json
+import time
+import contextlib
 
-from solc import (
-    compile_files,
-    get_solc_version,
+from eth_abi import (
+    decode_abi,
 )
 
+from web3.utils.abi import (
+    get_abi_output_types,
+    normalize_return_type,
+)
+from web3.utils.encoding import (
+    to_decimal,
+)
+from web3.utils.string import (
+    force_obj_to_text,
+)
+
+from populus.utils.rpc import (
+    make_batch_request,
+)
 from populus.utils.contracts import (
     link_bytecode,
 )
+from populus.utils.compiler import (
+    get_solc_toolchain,
+)
+from populus.compilation import (
+    compile_sources,
+    get_compilation_cache,
+)
+
+
+def get_solc_major_minor_version():
+    return get_solc_toolchain().major_minor_version
 
 
 def is_solc_03x():
-    version = get_solc_version()
-    major, minor, _ = version.split('.')[:3]
-    return major == '0' and minor == '3'
+    return get_solc_major_minor_version() == ('0', '3')
 
 
 def is_solc_04x():
-    version = get_solc_version()
-    major, minor, _ = version.split('.')[:3]
-    return major == '0' and minor == '4'
+    return get_solc_major_minor_version() == ('0', '4')
 
 
 BASE_DIR = os.path.dirname(__file__)
@@ -28,23 +51,91 @@ BASE_DIR = os.path.dirname(__file__)
 REGISTRAR_V3_SOURCE_PATH = os.path.join(BASE_DIR, 'RegistrarV3.sol')
 REGISTRAR_V4_SOURCE_PATH = os.path.join(BASE_DIR, 'RegistrarV4.sol')
 
+REGISTRAR_SOURCE_PATHS = {
+    ('0', '3'): REGISTRAR_V3_SOURCE_PATH,
+    ('0', '4'): REGISTRAR_V4_SOURCE_PATH,
+}
+
+
+def get_prebuilt_registrar_artifact_path(version):
+    major, minor = version
+    return os.path.join(BASE_DIR, 'Registrar-{0}.{1}.json'.format(major, minor))
 
-def get_compiled_registrar_contract():
-    if is_solc_03x():
-        compiled_contracts = compile_files([REGISTRAR_V3_SOURCE_PATH])
-    elif is_solc_04x():
-        compiled_contracts = compile_files([REGISTRAR_V4_SOURCE_PATH])
+
+def compile_registrar_contract(version, project_dir=None):
+    """
+    Compile the registrar source for the given solc `version`.  The output is
+    stored in the compilation cache under the build directory of
+    `project_dir` when one is given.
+    """
+    if project_dir is None:
+        compilation_cache = None
     else:
+        compilation_cache = get_compilation_cache(project_dir)
+    compiled_contracts = compile_sources(
+        [REGISTRAR_SOURCE_PATHS[version]],
+        compilation_cache=compilation_cache,
+    )
+    return compiled_contracts['Registrar']
+
+
+def write_prebuilt_registrar_artifact():
+    """
+    Compile the registrar with the installed version of solc and write the
+    output alongside the registrar sources so that it can be shipped with the
+    package.
+    """
+    version = get_solc_major_minor_version()
+    if version not in REGISTRAR_SOURCE_PATHS:
         raise ValueError(
             "Unsupported version of solc.  Found: {0}.  Only 0.3.x and 0.4.x "
-            "are supported".format(get_solc_version())
+            "are supported".format('.'.join(version))
         )
-    contract_data = compiled_contracts['Registrar']
+    artifact_path = get_prebuilt_registrar_artifact_path(version)
+    with open(artifact_path, 'w') as artifact_file:
+        artifact_file.write(json.dumps(
+            compile_registrar_contract(version),
+            sort_keys=True,
+            indent=4,
+            separators=(',', ': '),
+        ))
+    return artifact_path
+
+
+_registrar_contract_data = {}
+
+
+def get_compiled_registrar_contract(project_dir=None):
+    """
+    Returns the compiled registrar for the major/minor version of the installed
+    solc.  The result is looked up, in order, from an in-process memo, the
+    prebuilt artifacts shipped with populus, and the compilation cache of
+    `project_dir` before falling back to compiling the registrar source.
+    """
+    version = get_solc_major_minor_version()
+
+    if version in _registrar_contract_data:
+        return _registrar_contract_data[version]
+
+    if version not in REGISTRAR_SOURCE_PATHS:
+        raise ValueError(
+            "Unsupported version of solc.  Found: {0}.  Only 0.3.x and 0.4.x "
+            "are supported".format(get_solc_toolchain().version)
+        )
+
+    artifact_path = get_prebuilt_registrar_artifact_path(version)
+    if os.path.exists(artifact_path):
+        with open(artifact_path) as artifact_file:
+            contract_data = json.load(artifact_file)
+    else:
+        contract_data = compile_registrar_contract(version, project_dir)
+
+    _registrar_contract_data[version] = contract_data
     return contract_data
 
 
-def get_registrar(web3, address=None):
-    registrar_contract_data = get_compiled_registrar_contract()
+def get_registrar(web3, address=None, project_dir=None):
+    registrar_contract_data = get_compiled_registrar_contract(project_dir)
     return web3.eth.contract(
         address=address,
         abi=registrar_contract_data['abi'],
@@ -53,6 +144,195 @@ def get_registrar(web3, address=None):
     )
 
 
+REGISTRAR_GETTERS = {
+    'exists',
+    'get',
+    'getAddress',
+    'getBool',
+    'getInt',
+    'getString',
+    'getUInt',
+}
+
+
+class RegistrarClient(object):
+    """
+    Read-through cache in front of the registrar contract's getters and
+    `eth_getCode`.  Cached values are only served for the block they were
+    read in, so the current block number is checked on every lookup made
+    outside of an `at_block` scope.  Setting `block_poll_interval` instead
+    re-checks it at most once every that many seconds, serving possibly stale
+    values in between.
+    """
+    hits = 0
+    misses = 0
+
+    def __init__(self, web3, registrar, block_poll_interval=0):
+        self.web3 = web3
+        self.registrar = registrar
+        self.block_poll_interval = block_poll_interval
+        self._cache = {}
+        self._block_number = None
+        self._block_checked_at = None
+        self._pin_depth = 0
+        self._is_block_pinned = False
+
+    @contextlib.contextmanager
+    def at_block(self):
+        """
+        Serve every lookup made within this scope from the block read by the
+        first of them, so the block number is fetched once per scope rather
+        than once per lookup.  Scopes may be nested, in which case the
+        outermost one applies.
+        """
+        self._pin_depth += 1
+        try:
+            yield self
+        finally:
+            self._pin_depth -= 1
+            if not self._pin_depth:
+                self._is_block_pinned = False
+
+    def _set_block_number(self, block_number):
+        self._block_checked_at = time.time()
+        self._is_block_pinned = bool(self._pin_depth)
+        if block_number != self._block_number:
+            self._cache.clear()
+            self._block_number = block_number
+
+    def _refresh_block_number(self):
+        if self._is_block_pinned:
+            return
+        now = time.time()
+        if (self.block_poll_interval and
+                self._block_checked_at is not None and
+                now - self._block_checked_at < self.block_poll_interval):
+            return
+        self._set_block_number(self.web3.eth.blockNumber)
+
+    def _lookup(self, cache_key, fn, *args):
+        self._refresh_block_number()
+        try:
+            value = self._cache[cache_key]
+        except KeyError:
+            self.misses += 1
+            value = self._cache[cache_key] = fn(*args)
+        else:
+            self.hits += 1
+        return value
+
+    def call(self, getter, key):
+        if getter not in REGISTRAR_GETTERS:
+            raise ValueError("Unknown registrar getter: `{0}`".format(getter))
+        return self._lookup(
+            (getter, key),
+            getattr(self.registrar.call(), getter),
+            key,
+        )
+
+    def exists(self, key):
+        return self.call('exists', key)
+
+    def get_address(self, key):
+        return self.call('getAddress', key)
+
+    def get_code(self, address):
+        return self._lookup(('getCode', address), self.web3.eth.getCode, address)
+
+    def _encode_call(self, getter, key):
+        transaction = self.registrar._prepare_transaction(
+            fn_name=getter,
+            fn_args=[key],
+        )
+        # Calls don't need a `from` address, and leaving it out saves a
+        # coinbase lookup for every key.
+        return {
+            'to': transaction['to'],
+            'data': transaction['data'],
+        }
+
+    def _decode_call(self, getter, key, return_data):
+        fn_abi = self.registrar._find_matching_fn_abi(getter, [key], {})
+        output_types = get_abi_output_types(fn_abi)
+        output_values = decode_abi(output_types, return_data)
+        return force_obj_to_text(normalize_return_type(
+            output_types[0],
+            output_values[0],
+        ))
+
+    def prefetch(self, keys, getters=('exists', 'getAddress')):
+        """
+        Load the `getters` for all of `keys` in one batched request, followed
+        by a second batch for the bytecode at each address found through
+        `getAddress`.  Subsequent lookups of these values are served from the
+        cache until the next block, and within an `at_block` scope the block
+        read here is pinned so they skip the block number check entirely.
+
+        Returns the `(number, hash)` of the block the values were read from.
+        """
+        for getter in getters:
+            if getter not in REGISTRAR_GETTERS:
+                raise ValueError("Unknown registrar getter: `{0}`".format(getter))
+
+        keys = tuple(keys)
+        lookups = [(getter, key) for key in keys for getter in getters]
+        # The latest block is fetched in the same batch so the results can be
+        # attributed to the block they were read from.
+        results = make_batch_request(self.web3, [
+            ('eth_getBlockByNumber', ['latest', False]),
+        ] + [
+            ('eth_call', [self._encode_call(getter, key), self.web3.eth.defaultBlock])
+            for getter, key in lookups
+        ])
+        block_number = to_decimal(results[0]['number'])
+        block_hash = results[0]['hash']
+        self._set_block_number(block_number)
+
+        for (getter, key), return_data in zip(lookups, results[1:]):
+            self._cache[(getter, key)] = self._decode_call(getter, key, return_data)
+
+        if 'getAddress' not in getters:
+            return block_number, block_hash
+
+        addresses = sorted({
+            self._cache[('getAddress', key)]
+            for key in keys
+            if self._cache.get(('exists', key), True) and
+            ('getAddress', key) in self._cache
+        })
+        code_lookups = [
+            address
+            for address in addresses
+            if ('getCode', address) not in self._cache
+        ]
+        code_results = make_batch_request(self.web3, [
+            ('eth_getCode', [address, self.web3.eth.defaultBlock])
+            for address in code_lookups
+        ])
+        for address, code in zip(code_lookups, code_results):
+            self._cache[('getCode', address)] = code
+
+        return block_number, block_hash
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, key=None):
+        """
+        Drop the cached values for `key`, or everything when no key is given.
+        """
+        if key is None:
+            self._cache.clear()
+            self._block_number = None
+            self._block_checked_at = None
+            self._is_block_pinned = False
+        else:
+            for cache_key in tuple(self._cache):
+                if cache_key[1] == key:
+                    del self._cache[cache_key]
+
+
 def get_contract_from_registrar(chain,
                                 contract_name,
                                 contract_factory,
@@ -60,23 +340,26 @@ def get_contract_from_registrar(chain,
     if link_dependencies is None:
         link_dependencies = {}
 
-    web3 = chain.web3
-    registrar = chain.registrar
+    registrar_client = chain.registrar_client
     registrar_key = 'contract/{name}'.format(name=contract_name)
 
-    if not registrar.call().exists(registrar_key):
+    if not registrar_client.exists(registrar_key):
         return None
 
-    contract_address = registrar.call().getAddress(registrar_key)
+    contract_address = registrar_client.get_address(registrar_key)
 
     expected_runtime = link_bytecode(
         contract_factory.code_runtime,
         **link_dependencies
     )
-    actual_runtime = web3.eth.getCode(contract_address)
 
     # If the runtime doesn't match then don't choose it.
-    if actual_runtime != expected_runtime:
+    is_bytecode_match = chain.bytecode_verifier.verify(
+        contract_address,
+        expected_runtime,
+        get_code=registrar_client.get_code,
+    )
+    if not is_bytecode_match:
         return None
 
     return contract_factory(address=contract_address)
@@ -1,27 +1,40 @@
 """
-From: https://gist.github.com/fpom/92a690a8cf89cebd7d4a
+Stat polling backend from: https://gist.github.com/fpom/92a690a8cf89cebd7d4a
 """
 import os
+import sys
+import errno
+import struct
 import collections
+import ctypes
+import ctypes.util
+
 import gevent
 from gevent import pool
 from gevent import queue
+from gevent import socket
 
 
 event = collections.namedtuple("event", ["name", "path", "isdir"])
 
 
-class DirWatcher (object):
-    def __init__(self, root):
-        self.root = os.path.abspath(root)
+# Events which arrive within this many seconds of each other are delivered as
+# a single batch by `DirWatcher.get_batch`.
+DEFAULT_DEBOUNCE = 0.2
+
+
+class StatBackend(object):
+    """
+    Portable backend which spawns a greenlet per file and directory that
+    polls it for changes once a second.
+    """
+    def __init__(self, root, q):
+        self.root = root
         self.pool = pool.Pool()
-        self.q = queue.Queue()
+        self.q = q
         self.w = {}
         self.add(root, "crawl")
 
-    def get(self):
-        return self.q.get()
-
     def add(self, path, evt="create"):
         if os.path.isdir(path):
             for name in os.listdir(path):
@@ -56,3 +69,216 @@ class DirWatcher (object):
                 self.w.pop(os.path.join(path, name), None)
         self.w.pop(path, None)
         self.q.put(event("delete", path, isdir))
+
+    def stop(self):
+        self.w.clear()
+        self.pool.kill()
+
+
+#
+# inotify(7) constants from <sys/inotify.h>
+#
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_WATCH_MASK = (
+    IN_MODIFY |
+    IN_ATTRIB |
+    IN_CLOSE_WRITE |
+    IN_MOVED_FROM |
+    IN_MOVED_TO |
+    IN_CREATE |
+    IN_DELETE |
+    IN_DELETE_SELF |
+    IN_MOVE_SELF
+)
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; }
+INOTIFY_EVENT_HEADER = struct.Struct('iIII')
+
+INOTIFY_READ_SIZE = 64 * 1024
+
+
+_libc = None
+
+
+def get_libc():
+    global _libc
+
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    return _libc
+
+
+def is_inotify_available():
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        return hasattr(get_libc(), 'inotify_init1')
+    except OSError:
+        return False
+
+
+def _check_inotify_result(result):
+    if result < 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error))
+    return result
+
+
+class InotifyBackend(object):
+    """
+    Linux backend which receives change notifications from the kernel through
+    a single inotify file descriptor read by one greenlet.
+    """
+    def __init__(self, root, q):
+        self.root = root
+        self.q = q
+        self.wds = {}
+        self.fd = _check_inotify_result(
+            get_libc().inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        )
+        try:
+            self.add(root, "crawl")
+        except OSError:
+            os.close(self.fd)
+            raise
+        self.greenlet = gevent.spawn(self.read_events)
+
+    def add_watch(self, path):
+        wd = _check_inotify_result(get_libc().inotify_add_watch(
+            self.fd,
+            os.fsencode(path) if hasattr(os, 'fsencode') else path,
+            INOTIFY_WATCH_MASK,
+        ))
+        self.wds[wd] = path
+
+    def add(self, path, evt="create"):
+        isdir = os.path.isdir(path)
+        if isdir:
+            self.add_watch(path)
+            for name in os.listdir(path):
+                self.add(os.path.join(path, name), evt)
+        self.q.put(event(evt, path, isdir))
+
+    def read_events(self):
+        while True:
+            socket.wait_read(self.fd)
+            try:
+                data = os.read(self.fd, INOTIFY_READ_SIZE)
+            except OSError as err:
+                if err.errno in {errno.EAGAIN, errno.EINTR}:
+                    continue
+                raise
+            self.handle_events(data)
+
+    def handle_events(self, data):
+        offset = 0
+        while offset + INOTIFY_EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b'\0')
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped by the kernel.  Report the whole tree as
+                # updated so that consumers re-check everything.
+                self.q.put(event("update", self.root, True))
+                continue
+
+            if wd not in self.wds:
+                continue
+            directory = self.wds[wd]
+
+            if mask & IN_IGNORED:
+                self.wds.pop(wd, None)
+                continue
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if not name:
+                    self.q.put(event("delete", directory, True))
+                continue
+
+            path = os.path.join(directory, name.decode(sys.getfilesystemencoding()))
+            isdir = bool(mask & IN_ISDIR)
+
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self.add(path)
+                except OSError:
+                    # Removed again before it could be watched.
+                    pass
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self.q.put(event("delete", path, isdir))
+            elif not isdir:
+                self.q.put(event("update", path, isdir))
+
+    def stop(self):
+        self.greenlet.kill()
+        os.close(self.fd)
+
+
+def get_default_backend():
+    if is_inotify_available():
+        return InotifyBackend
+    return StatBackend
+
+
+class DirWatcher(object):
+    """
+    Watches the directory tree at `root` for changes using inotify on Linux
+    and stat polling elsewhere.  `get_batch` coalesces the events of a burst
+    of changes, such as an editor saving a file, into a single batch.
+    """
+    def __init__(self, root, debounce=DEFAULT_DEBOUNCE, backend=None):
+        self.root = os.path.abspath(root)
+        self.debounce = debounce
+        self.q = queue.Queue()
+
+        if backend is None:
+            backend = get_default_backend()
+
+        try:
+            self.backend = backend(self.root, self.q)
+        except OSError:
+            if backend is StatBackend:
+                raise
+            # The inotify instance or watch limits have been reached.
+            self.q = queue.Queue()
+            self.backend = StatBackend(self.root, self.q)
+
+    def get(self):
+        return self.q.get()
+
+    def get_batch(self, debounce=None):
+        """
+        Block until an event arrives and then keep collecting events until
+        none arrive for `debounce` seconds.  Returns the distinct events in
+        the order they first arrived.
+        """
+        if debounce is None:
+            debounce = self.debounce
+
+        events = [self.q.get()]
+        while True:
+            try:
+                events.append(self.q.get(timeout=debounce))
+            except queue.Empty:
+                break
+
+        return list(collections.OrderedDict.fromkeys(events))
+
+    def stop(self):
+        self.backend.stop()
@@ -1,12 +1,18 @@
+import os
+
 import pytest
 
 from populus.migrations.migration import (
     get_migration_classes_for_execution,
 )
 from populus.project import Project
+from populus.compilation import (
+    ARTIFACT_FORMAT_JSON,
+)
 
 CACHE_KEY_MTIME = "populus/project/compiled_contracts_mtime"
 CACHE_KEY_CONTRACTS = "populus/project/compiled_contracts"
+CACHE_KEY_SOURCE_DIGEST = "populus/project/compiled_contracts_source_digest"
 
 
 @pytest.fixture(scope="session")
@@ -14,25 +20,138 @@ def project(request):
     # This should probably be configurable using the `request` fixture but it's
     # unclear what needs to be configurable.
 
+    project = Project()
+
+    if project.artifact_format != ARTIFACT_FORMAT_JSON:
+        # Contracts are loaded lazily from the build directory so there is no
+        # need to round trip all of them through the pytest cache.
+        return project
+
     # use pytest cache to preset the sessions project to recently compiled contracts
     contracts = request.config.cache.get(CACHE_KEY_CONTRACTS, None)
     mtime = request.config.cache.get(CACHE_KEY_MTIME, None)
-    project = Project()
-    project.fill_contracts_cache(contracts, mtime)
+    source_digest = request.config.cache.get(CACHE_KEY_SOURCE_DIGEST, None)
+    project.fill_contracts_cache(contracts, mtime, source_digest)
     request.config.cache.set(CACHE_KEY_CONTRACTS, project.compiled_contracts)
     request.config.cache.set(CACHE_KEY_MTIME, project.get_source_modification_time())
+    request.config.cache.set(CACHE_KEY_SOURCE_DIGEST, project.get_source_file_hash())
 
     return project
 
 
+def get_fixture_value(request, name):
+    if hasattr(request, 'getfixturevalue'):
+        return request.getfixturevalue(name)
+    return request.getfuncargvalue(name)
+
+
+def execute_pending_migrations(chain):
+    migrations_to_execute = get_migration_classes_for_execution(
+        chain.project.migrations,
+        chain,
+    )
+
+    for migration in migrations_to_execute:
+        migration.execute()
+
+
+def get_latest_block_marker(chain):
+    latest_block = chain.web3.eth.getBlock('latest')
+    return latest_block['number'], latest_block['hash']
+
+
+def is_block_marker_valid(chain, marker):
+    block_number, block_hash = marker
+    block = chain.web3.eth.getBlock(block_number)
+    return block is not None and block['hash'] == block_hash
+
+
+def get_migrated_chain_key(project):
+    """
+    Identifies the migrated state for `project`.  The project directory
+    follows the current working directory so a session can move between
+    projects.
+    """
+    return (
+        os.path.abspath(project.project_dir),
+        tuple(migration.migration_id for migration in project.migrations),
+        project.get_source_file_hash(),
+    )
+
+
+class MigratedChainBase(object):
+    """
+    A `testrpc` chain which has had the project migrations run on it once.
+    Tests run against an EVM snapshot of this state which is reverted when
+    they finish.
+
+    All `testrpc` chains share a single EVM, so entering another one (such as
+    the `unmigrated_chain` fixture) wipes out the migrated state.  This is
+    detected from the hash of the last block written by the migrations, in
+    which case a new chain is started and the migrations are run again.  The
+    same happens when the project directory, its migrations or its contract
+    sources change.
+    """
+    chain = None
+    marker = None
+    key = None
+
+    def __init__(self, project):
+        self.project = project
+
+    @property
+    def is_valid(self):
+        return self.chain is not None and is_block_marker_valid(self.chain, self.marker)
+
+    def get_chain(self):
+        key = get_migrated_chain_key(self.project)
+        if key != self.key or not self.is_valid:
+            self.close()
+            chain = self.project.get_chain('testrpc')
+            chain.__enter__()
+            try:
+                execute_pending_migrations(chain)
+                # Deploy the registrar as part of the base state so that it
+                # is not reverted away along with the first test using it.
+                chain.registrar
+            except Exception:
+                chain.__exit__(None, None, None)
+                raise
+            self.chain = chain
+            self.marker = get_latest_block_marker(chain)
+            self.key = key
+        return self.chain
+
+    def close(self):
+        if self.chain is not None:
+            chain, self.chain = self.chain, None
+            chain.__exit__(None, None, None)
+
+
+def validate_chain_fixtures(request):
+    """
+    All `testrpc` chains share a single EVM so entering `unmigrated_chain`
+    would wipe out the migrated state that `chain` is using.
+    """
+    if 'chain' in request.fixturenames and 'unmigrated_chain' in request.fixturenames:
+        raise ValueError(
+            "The `chain` and `unmigrated_chain` fixtures share a single EVM and "
+            "cannot be used by the same test.  Test `{0}` uses both, either "
+            "directly or through the fixtures it depends on.".format(
+                request.node.name,
+            )
+        )
+
+
 @pytest.yield_fixture()
 def unmigrated_chain(request, project):
+    validate_chain_fixtures(request)
+
     # This should probably allow you to specify the test chain to be used based
     # on the `request` object.  It's unclear what the best way to do this is
     # so... punt!
     chain = project.get_chain('testrpc')
 
-    # TODO: this should run migrations.  If `testrpc` it should be snapshotted.
     # In the future we should be able to snapshot the `geth` chains too and
     # save them for faster test runs.
 
@@ -40,28 +159,48 @@ def unmigrated_chain(request, project):
         yield chain
 
 
-@pytest.fixture()
-def chain(unmigrated_chain):
-    # Determine if we have any migrations to run.
-    migrations_to_execute = get_migration_classes_for_execution(
-        unmigrated_chain.project.migrations,
-        unmigrated_chain,
-    )
+@pytest.yield_fixture(scope="session")
+def migrated_chain_base(project):
+    base = MigratedChainBase(project)
+    try:
+        yield base
+    finally:
+        base.close()
+
+
+@pytest.yield_fixture()
+def chain(request, migrated_chain_base):
+    validate_chain_fixtures(request)
+
+    chain = migrated_chain_base.get_chain()
+    snapshot_id = chain.snapshot()
+
+    yield chain
+
+    # Skip the revert if the EVM was reset out from under this chain during
+    # the test.  The base state is rebuilt by the next test that needs it.
+    if migrated_chain_base.is_valid:
+        chain.revert(snapshot_id)
 
-    for migration in migrations_to_execute:
-        migration.execute()
 
-    return unmigrated_chain
+def get_test_chain(request):
+    """
+    The chain that the `web3` and `contracts` fixtures are built from; the
+    migrated `chain` when the test uses it, otherwise `unmigrated_chain`.
+    """
+    if 'chain' in request.fixturenames:
+        return get_fixture_value(request, 'chain')
+    return get_fixture_value(request, 'unmigrated_chain')
 
 
 @pytest.fixture()
-def web3(unmigrated_chain):
-    return unmigrated_chain.web3
+def web3(request):
+    return get_test_chain(request).web3
 
 
 @pytest.fixture()
-def contracts(unmigrated_chain):
-    return unmigrated_chain.contract_factories
+def contracts(request):
+    return get_test_chain(request).contract_factories
 
 
 @pytest.fixture()
@@ -1,5 +1,4 @@
 import os
-import hashlib
 
 from web3.utils.string import (
     is_string,
@@ -20,6 +19,15 @@ from populus.utils.chains import (
     get_geth_ipc_path,
     get_nodekey_path,
 )
+from populus.utils.contracts import (
+    DependencyGraph,
+)
+from populus.utils.fingerprints import (
+    SourceFingerprints,
+)
+from populus.utils.artifacts import (
+    CompactContractArtifacts,
+)
 from populus.utils.config import (
     load_config,
     get_config_paths,
@@ -33,8 +41,10 @@ from populus.migrations.loading import (
     load_project_migrations,
 )
 from populus.compilation import (
-    find_project_contracts,
-    compile_project_contracts,
+    recompile_project_contracts,
+    load_previous_build,
+    validate_artifact_format,
+    ARTIFACT_FORMAT_JSON,
 )
 
 from populus.chain import (
@@ -132,51 +142,153 @@ class Project(object):
     def compiled_contracts_file_path(self):
         return get_compiled_contracts_file_path(self.project_dir)
 
+    @property
+    def compile_jobs(self):
+        """
+        The number of worker processes `populus compile` uses to compile
+        independent groups of source files.
+        """
+        if self.config.has_option('populus', 'compile_jobs'):
+            return self.config.getint('populus', 'compile_jobs')
+        else:
+            return 1
+
+    @property
+    def artifact_format(self):
+        """
+        The format that compiled contracts are written to the build directory
+        in.  One of `json` (a single `contracts.json` file), `split` (one file
+        per contract with a lazily loaded index) or `compact` (a memory mapped
+        binary file written alongside `contracts.json`).
+        """
+        if self.config.has_option('populus', 'artifact_format'):
+            artifact_format = self.config.get('populus', 'artifact_format')
+            validate_artifact_format(artifact_format)
+            return artifact_format
+        else:
+            return ARTIFACT_FORMAT_JSON
+
     _cached_compiled_contracts_mtime = None
+    _cached_compiled_contracts_digest = None
     _cached_compiled_contracts = None
+    _cached_source_manifest = None
+    _source_fingerprints = None
+
+    @property
+    def source_fingerprints(self):
+        """
+        A `SourceFingerprints` table for the project's contract source files.
+        """
+        contracts_dir = os.path.abspath(
+            os.path.join(self.project_dir, self.contracts_dir)
+        )
+        if self._source_fingerprints is None or \
+                self._source_fingerprints.source_dir != contracts_dir:
+            self._source_fingerprints = SourceFingerprints(contracts_dir)
+        return self._source_fingerprints
 
     def get_source_file_hash(self):
-        source_file_paths = find_project_contracts(self.project_dir, self.contracts_dir)
-        return hashlib.md5(b''.join(
-            open(source_file_path, 'rb').read()
-            for source_file_path
-            in source_file_paths
-        )).hexdigest()
+        source_fingerprints = self.source_fingerprints
+        source_fingerprints.refresh()
+        return source_fingerprints.get_digest()
 
     def get_source_modification_time(self):
-        source_file_paths = find_project_contracts(self.project_dir, self.contracts_dir)
-        return max(
-            os.path.getmtime(source_file_path)
-            for source_file_path
-            in source_file_paths
-        ) if len(source_file_paths) > 0 else None
+        source_fingerprints = self.source_fingerprints
+        source_fingerprints.refresh()
+        return source_fingerprints.get_modification_time()
 
     def compiled_contracts_stale(self):
-        return self._cached_compiled_contracts_mtime is None or \
-            self._cached_compiled_contracts_mtime < self.get_source_modification_time()
-
-    def fill_contracts_cache(self, contracts, contracts_mtime):
+        source_fingerprints = self.source_fingerprints
+        # Refreshed even when nothing has been compiled yet, otherwise
+        # `compiled_contracts` would record the modification time and digest
+        # from before the first refresh and recompile on every read.
+        source_fingerprints.refresh()
+
+        if self._cached_compiled_contracts_digest is not None:
+            # Unlike the modification time the digest also changes when a
+            # source is removed, renamed or restored to an older version.
+            return self._cached_compiled_contracts_digest != \
+                source_fingerprints.get_digest()
+        elif self._cached_compiled_contracts_mtime is None:
+            return True
+        return self._cached_compiled_contracts_mtime < \
+            source_fingerprints.get_modification_time()
+
+    def fill_contracts_cache(self, contracts, contracts_mtime, contracts_digest=None):
         """
         :param contracts: become the Project's cache for compiled contracts
         :param contracts_mtime: last modification of supplied contracts
+        :param contracts_digest: digest of the sources the supplied contracts
+                                 were compiled from.  When given it is used
+                                 rather than `contracts_mtime` to decide
+                                 whether they are stale.
         :return:
         """
         self._cached_compiled_contracts_mtime = contracts_mtime
-        self._cached_compiled_contracts = contracts
+        self._cached_compiled_contracts_digest = contracts_digest
+        self._replace_compiled_contracts(contracts)
+        self._cached_source_manifest = None
+
+    def _replace_compiled_contracts(self, compiled_contracts):
+        previous_compiled_contracts = self._cached_compiled_contracts
+        self._cached_compiled_contracts = compiled_contracts
+        if previous_compiled_contracts is not compiled_contracts and \
+                isinstance(previous_compiled_contracts, CompactContractArtifacts):
+            # Release the memory map of the artifacts file which is no longer
+            # in use.
+            previous_compiled_contracts.close()
 
     @property
     def compiled_contracts(self):
         if self.compiled_contracts_stale():
-            self._cached_compiled_contracts_mtime = self.get_source_modification_time()
+            # `compiled_contracts_stale` has just refreshed the fingerprints.
+            self._cached_compiled_contracts_mtime = (
+                self.source_fingerprints.get_modification_time()
+            )
+            self._cached_compiled_contracts_digest = (
+                self.source_fingerprints.get_digest()
+            )
+            if (self._cached_compiled_contracts is None and
+                    self.artifact_format != ARTIFACT_FORMAT_JSON):
+                # Start from the last build written to the build directory so
+                # that unchanged contracts are not recompiled.
+                compiled_contracts, source_manifest = load_previous_build(
+                    self.project_dir,
+                    self.artifact_format,
+                )
+                self._cached_compiled_contracts = compiled_contracts
+                self._cached_source_manifest = source_manifest
             # TODO: the hard coded `optimize=True` should be configurable
             # somehow.
-            _, self._cached_compiled_contracts = compile_project_contracts(
+            _, compiled_contracts, source_manifest, _ = recompile_project_contracts(
                 project_dir=self.project_dir,
                 contracts_dir=self.contracts_dir,
+                compiled_sources=self._cached_compiled_contracts,
+                source_manifest=self._cached_source_manifest,
+                # Forking worker processes is not safe alongside the gevent
+                # hub which chains and the pytest plugin run on.
+                jobs=1,
                 optimize=True,
             )
+            self._replace_compiled_contracts(compiled_contracts)
+            self._cached_source_manifest = source_manifest
         return self._cached_compiled_contracts
 
+    _cached_dependency_graph = None
+
+    @property
+    def dependency_graph(self):
+        """
+        A `DependencyGraph` of the library dependencies between the
+        `compiled_contracts`.  It is only rebuilt when the compiled contracts
+        change.
+        """
+        compiled_contracts = self.compiled_contracts
+        if self._cached_dependency_graph is None or \
+                self._cached_dependency_graph.compiled_contracts is not compiled_contracts:
+            self._cached_dependency_graph = DependencyGraph(compiled_contracts)
+        return self._cached_dependency_graph
+
     #
     # Local Blockchains
     #
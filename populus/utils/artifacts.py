@@ -0,0 +1,377 @@
+import os
+import re
+import json
+import mmap
+import struct
+import hashlib
+import binascii
+import itertools
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from .contracts import (
+    get_contract_library_names,
+    LINK_PLACEHOLDER_LENGTH,
+)
+from .filesystem import (
+    atomic_write,
+    ensure_path_exists,
+    remove_file_if_exists,
+    write_file_if_changed,
+)
+
+
+ARTIFACT_INDEX_FILENAME = 'index.json'
+
+
+def get_contract_artifact_path(artifacts_dir, contract_name):
+    return os.path.join(artifacts_dir, '{0}.json'.format(contract_name))
+
+
+def get_artifact_index_path(artifacts_dir):
+    return os.path.join(artifacts_dir, ARTIFACT_INDEX_FILENAME)
+
+
+def serialize_contract_artifact(contract_data):
+    return json.dumps(contract_data, sort_keys=True).encode('utf8')
+
+
+def build_artifact_index_entry(contract_data, serialized_artifact):
+    return {
+        'hash': hashlib.sha256(serialized_artifact).hexdigest(),
+        'link_references': sorted(get_contract_library_names(contract_data)),
+    }
+
+
+def load_artifact_index(artifacts_dir):
+    index_path = get_artifact_index_path(artifacts_dir)
+
+    if not os.path.exists(index_path):
+        raise ValueError("No compiled contracts found")
+
+    with open(index_path) as index_file:
+        return json.load(index_file)
+
+
+def write_contract_artifacts(artifacts_dir, compiled_sources, contract_names=None):
+    """
+    Write each contract in `compiled_sources` to its own file in
+    `artifacts_dir` along with an index of the contract names, the hash of
+    each contract file and the link references in each contract's bytecode.
+    Contract files whose hash matches the existing index are left untouched.
+
+    If `contract_names` is given, only those contracts along with contracts
+    missing from the existing index are serialized.  The index entries of all
+    other contracts are assumed to be current.
+    """
+    ensure_path_exists(artifacts_dir)
+
+    try:
+        previous_index = load_artifact_index(artifacts_dir)
+    except ValueError:
+        previous_index = {}
+
+    if contract_names is None:
+        contract_names_to_write = set(compiled_sources.keys())
+    else:
+        contract_names_to_write = set(contract_names).union(
+            set(compiled_sources.keys()).difference(previous_index.keys())
+        ).intersection(compiled_sources.keys())
+
+    index = {
+        contract_name: previous_index[contract_name]
+        for contract_name in compiled_sources.keys()
+        if contract_name not in contract_names_to_write
+    }
+    for contract_name in contract_names_to_write:
+        contract_data = compiled_sources[contract_name]
+        serialized_artifact = serialize_contract_artifact(contract_data)
+        index[contract_name] = build_artifact_index_entry(
+            contract_data,
+            serialized_artifact,
+        )
+        artifact_path = get_contract_artifact_path(artifacts_dir, contract_name)
+        previous_entry = previous_index.get(contract_name, {})
+        is_unchanged = (
+            previous_entry.get('hash') == index[contract_name]['hash'] and
+            os.path.exists(artifact_path)
+        )
+        if not is_unchanged:
+            atomic_write(artifact_path, serialized_artifact)
+
+    for contract_name in set(previous_index.keys()).difference(index.keys()):
+        remove_file_if_exists(get_contract_artifact_path(artifacts_dir, contract_name))
+
+    index_path = get_artifact_index_path(artifacts_dir)
+    write_file_if_changed(
+        index_path,
+        json.dumps(index, sort_keys=True, indent=4, separators=(',', ': ')).encode('utf8'),
+    )
+
+    return index_path
+
+
+class LazyContractArtifacts(Mapping):
+    """
+    Read-only mapping of contract name to compiled contract data backed by the
+    per-contract artifact layout.  Only the index is read up front.  Each
+    contract's data is read from disk the first time it is accessed and checked
+    against the hash recorded in the index.
+    """
+    def __init__(self, artifacts_dir, index=None):
+        self.artifacts_dir = artifacts_dir
+        if index is None:
+            index = load_artifact_index(artifacts_dir)
+        self.index = index
+        self._loaded = {}
+
+    def __getitem__(self, contract_name):
+        if contract_name not in self._loaded:
+            if contract_name not in self.index:
+                raise KeyError(contract_name)
+            artifact_path = get_contract_artifact_path(self.artifacts_dir, contract_name)
+            with open(artifact_path, 'rb') as artifact_file:
+                serialized_artifact = artifact_file.read()
+            artifact_hash = hashlib.sha256(serialized_artifact).hexdigest()
+            if artifact_hash != self.index[contract_name]['hash']:
+                raise ValueError(
+                    "The artifact for {0} at {1} does not match the hash in the "
+                    "artifact index.  Recompile the project contracts.".format(
+                        contract_name,
+                        artifact_path,
+                    )
+                )
+            self._loaded[contract_name] = json.loads(serialized_artifact.decode('utf8'))
+        return self._loaded[contract_name]
+
+    def __contains__(self, contract_name):
+        return contract_name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def is_loaded(self, contract_name):
+        return contract_name in self._loaded
+
+    def get_link_references(self, contract_name):
+        return set(self.index[contract_name]['link_references'])
+
+
+#
+# Compact binary artifacts
+#
+# Layout:
+#
+#   MAGIC | version (uint8) | header length (uint32) | header | blob
+#
+# The header is UTF-8 encoded JSON which maps each contract name to the
+# location of its ABI and bytecode within the blob.  Bytecode is stored as raw
+# bytes with each unlinked library placeholder replaced by zero bytes.  The
+# placeholders are recorded in the header by their offset within the hex
+# encoded bytecode.  Identical ABIs are only stored once.
+#
+COMPACT_ARTIFACTS_MAGIC = b'POPA'
+COMPACT_ARTIFACTS_VERSION = 1
+COMPACT_ARTIFACTS_PREAMBLE = struct.Struct('>4sBI')
+
+NON_HEX_RE = re.compile('[^0-9a-fA-F]')
+
+
+def encode_compact_bytecode(bytecode):
+    """
+    Returns the raw bytes of the hex encoded `bytecode` along with a list of
+    `(offset, placeholder)` for each unlinked library placeholder.
+    """
+    if bytecode.startswith('0x'):
+        bytecode = bytecode[2:]
+
+    link_placeholders = []
+    hex_chunks = []
+    position = 0
+    while True:
+        match = NON_HEX_RE.search(bytecode, position)
+        if match is None:
+            hex_chunks.append(bytecode[position:])
+            break
+        start = match.start()
+        placeholder = bytecode[start:start + LINK_PLACEHOLDER_LENGTH]
+        link_placeholders.append((start, placeholder))
+        hex_chunks.append(bytecode[position:start])
+        hex_chunks.append('0' * len(placeholder))
+        position = start + LINK_PLACEHOLDER_LENGTH
+
+    return binascii.unhexlify(''.join(hex_chunks).encode('ascii')), link_placeholders
+
+
+def decode_compact_bytecode(raw_bytecode, link_placeholders):
+    bytecode = binascii.hexlify(raw_bytecode).decode('ascii')
+    for offset, placeholder in link_placeholders:
+        bytecode = ''.join((
+            bytecode[:offset],
+            placeholder,
+            bytecode[offset + len(placeholder):],
+        ))
+    return '0x' + bytecode
+
+
+def is_compactable_bytecode(bytecode):
+    """
+    Whether `bytecode` survives a round trip through the compact encoding
+    unchanged.  Anything else is stored as-is.
+    """
+    if not bytecode or not bytecode.startswith('0x'):
+        return False
+    try:
+        return decode_compact_bytecode(*encode_compact_bytecode(bytecode)) == bytecode
+    except (TypeError, ValueError, binascii.Error):
+        return False
+
+
+COMPACT_BYTECODE_KEYS = ('code', 'code_runtime')
+
+
+def serialize_compact_artifacts(compiled_sources):
+    blob = []
+    blob_length = [0]
+
+    def append_to_blob(data):
+        location = [blob_length[0], len(data)]
+        blob.append(data)
+        blob_length[0] += len(data)
+        return location
+
+    abi_locations = {}
+    abis = []
+    contracts = {}
+
+    for contract_name in sorted(compiled_sources.keys()):
+        contract_data = compiled_sources[contract_name]
+        contract_header = {'extra': {}}
+
+        for key, value in contract_data.items():
+            if key == 'abi':
+                serialized_abi = json.dumps(value, sort_keys=True).encode('utf8')
+                if serialized_abi not in abi_locations:
+                    abi_locations[serialized_abi] = len(abis)
+                    abis.append(append_to_blob(serialized_abi))
+                contract_header['abi'] = abi_locations[serialized_abi]
+            elif key in COMPACT_BYTECODE_KEYS and is_compactable_bytecode(value):
+                raw_bytecode, link_placeholders = encode_compact_bytecode(value)
+                contract_header[key] = {
+                    'location': append_to_blob(raw_bytecode),
+                    'link_placeholders': link_placeholders,
+                }
+            else:
+                contract_header['extra'][key] = value
+
+        contracts[contract_name] = contract_header
+
+    header = json.dumps({
+        'abis': abis,
+        'contracts': contracts,
+    }, sort_keys=True).encode('utf8')
+
+    return b''.join(itertools.chain((
+        COMPACT_ARTIFACTS_PREAMBLE.pack(
+            COMPACT_ARTIFACTS_MAGIC,
+            COMPACT_ARTIFACTS_VERSION,
+            len(header),
+        ),
+        header,
+    ), blob))
+
+
+def write_compact_artifacts(artifacts_path, compiled_sources):
+    write_file_if_changed(artifacts_path, serialize_compact_artifacts(compiled_sources))
+    return artifacts_path
+
+
+class CompactContractArtifacts(Mapping):
+    """
+    Read-only mapping of contract name to compiled contract data backed by a
+    memory mapped compact artifacts file.  Only the header is parsed up front.
+    ABIs and bytecode are decoded the first time a contract is accessed.
+    Contracts which share an ABI in the file each get their own copy of it.
+    """
+    def __init__(self, artifacts_path):
+        self.artifacts_path = artifacts_path
+
+        if not os.path.exists(artifacts_path):
+            raise ValueError("No compiled contracts found")
+
+        with open(artifacts_path, 'rb') as artifacts_file:
+            try:
+                self._mmap = mmap.mmap(artifacts_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError("Invalid compact artifacts file: {0}".format(artifacts_path))
+
+        preamble_size = COMPACT_ARTIFACTS_PREAMBLE.size
+        if len(self._mmap) < preamble_size:
+            raise ValueError("Invalid compact artifacts file: {0}".format(artifacts_path))
+
+        magic, version, header_length = COMPACT_ARTIFACTS_PREAMBLE.unpack(
+            self._mmap[:preamble_size],
+        )
+        if magic != COMPACT_ARTIFACTS_MAGIC or version != COMPACT_ARTIFACTS_VERSION:
+            raise ValueError(
+                "Unsupported compact artifacts file: {0}".format(artifacts_path)
+            )
+
+        header = json.loads(
+            self._mmap[preamble_size:preamble_size + header_length].decode('utf8')
+        )
+        self._blob_offset = preamble_size + header_length
+        self._abi_locations = header['abis']
+        self.index = header['contracts']
+        self._loaded = {}
+
+    def _read_blob(self, location):
+        offset, length = location
+        start = self._blob_offset + offset
+        return self._mmap[start:start + length]
+
+    def _get_abi(self, abi_index):
+        # Decoded separately for each contract so that changes made to one
+        # contract's ABI are not seen through the others.
+        return json.loads(
+            self._read_blob(self._abi_locations[abi_index]).decode('utf8')
+        )
+
+    def __getitem__(self, contract_name):
+        if contract_name not in self._loaded:
+            contract_header = self.index[contract_name]
+            contract_data = dict(contract_header['extra'])
+
+            if 'abi' in contract_header:
+                contract_data['abi'] = self._get_abi(contract_header['abi'])
+
+            for key in COMPACT_BYTECODE_KEYS:
+                if key in contract_header:
+                    contract_data[key] = decode_compact_bytecode(
+                        self._read_blob(contract_header[key]['location']),
+                        contract_header[key]['link_placeholders'],
+                    )
+
+            self._loaded[contract_name] = contract_data
+        return self._loaded[contract_name]
+
+    def __contains__(self, contract_name):
+        return contract_name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def is_loaded(self, contract_name):
+        return contract_name in self._loaded
+
+    def close(self):
+        self._mmap.close()
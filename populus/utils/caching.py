@@ -0,0 +1,70 @@
+from pylru import lrucache
+
+
+class InstrumentedLRUCache(object):
+    """
+    Least recently used cache which counts its hits, misses and evictions.
+    Membership checks with `in` are not counted.
+    """
+    hits = 0
+    misses = 0
+    evictions = 0
+
+    def __init__(self, capacity):
+        self._cache = lrucache(capacity, self._on_evict)
+
+    def _on_evict(self, key, value):
+        self.evictions += 1
+
+    @property
+    def capacity(self):
+        return self._cache.size()
+
+    @capacity.setter
+    def capacity(self, value):
+        self._cache.size(value)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __getitem__(self, key):
+        try:
+            value = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._cache[key] = value
+
+    def __delitem__(self, key):
+        del self._cache[key]
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self):
+        self._cache.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stats(self):
+        return {
+            'capacity': self.capacity,
+            'size': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
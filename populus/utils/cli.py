@@ -1,5 +1,7 @@
 import os
+import time
 import itertools
+import collections
 import random
 
 import click
@@ -8,12 +10,16 @@ import gevent
 
 from populus.observers import (
     DirWatcher,
+    DEFAULT_DEBOUNCE,
 )
 from populus.compilation import (
-    compile_and_write_contracts,
+    build_project_contracts,
+    load_previous_build,
+    CONTRACT_CHANGED,
 )
 from .deploy import (
     deploy_contract,
+    get_next_nonce,
 )
 from .accounts import (
     is_account_locked,
@@ -239,56 +245,16 @@ def request_account_unlock(chain, account, timeout):
         raise click.ClickException("Unable to unlock account: `{0}`".format(account))
 
 
-def deploy_contract_and_verify(chain,
-                               contract_name,
-                               base_contract_factory=None,
-                               deploy_transaction=None,
-                               deploy_arguments=None,
-                               link_dependencies=None):
-    """
-    This is a *loose* wrapper around `populus.utils.deploy.deploy_contract`
-    that handles the various concerns and logging that need to be present when
-    doing this as a CLI interaction.
-
-    Deploy a contract, displaying information about the deploy process as it
-    happens.  This also verifies that the deployed contract's bytecode matches
-    the expected value.
-    """
-    if link_dependencies is None:
-        link_dependencies = {}
-
+def unlock_deploy_account(chain):
     web3 = chain.web3
-
-    if base_contract_factory is None:
-        base_contract_factory = chain.contract_factories[contract_name]
-
     if is_account_locked(web3, web3.eth.defaultAccount):
         deploy_from = select_account(chain)
         if is_account_locked(web3, deploy_from):
             request_account_unlock(chain, deploy_from, None)
 
-    # TODO: this needs to do contract linking.
-    click.echo("Deploying {0}".format(contract_name))
 
-    deploy_txn_hash, contract_factory = deploy_contract(
-        chain=chain,
-        contract_name=contract_name,
-        contract_factory=base_contract_factory,
-        deploy_transaction=deploy_transaction,
-        deploy_arguments=deploy_arguments,
-        link_dependencies=link_dependencies,
-    )
+def echo_mined_deploy_transaction(web3, deploy_txn_hash, deploy_receipt):
     deploy_txn = web3.eth.getTransaction(deploy_txn_hash)
-
-    click.echo("Deploy Transaction Sent: {0}".format(deploy_txn_hash))
-    click.echo("Waiting for confirmation...")
-
-    contract_address = chain.wait.for_contract_address(
-        deploy_txn_hash,
-        timeout=180,
-    )
-    deploy_receipt = web3.eth.getTransactionReceipt(deploy_txn_hash)
-
     click.echo((
         "\n"
         "Transaction Mined\n"
@@ -298,18 +264,30 @@ def deploy_contract_and_verify(chain,
         "Gas Provided : {2}\n"
         "Gas Used     : {3}\n\n".format(
             deploy_txn_hash,
-            contract_address,
+            deploy_receipt['contractAddress'],
             deploy_txn['gas'],
             deploy_receipt['gasUsed'],
         )
     ))
 
-    # Verification
-    deployed_code = web3.eth.getCode(contract_address)
+
+def verify_deployed_bytecode(chain, contract_factory, contract_address):
+    """
+    Verify that the bytecode at `contract_address` matches the runtime
+    bytecode of `contract_factory`, raising a `click.ClickException` if it
+    does not.
+    """
+    deployed_code = chain.web3.eth.getCode(contract_address)
 
     if contract_factory.code_runtime:
         click.echo("Verifying deployed bytecode...")
-        is_bytecode_match = deployed_code == contract_factory.code_runtime
+        # Recording the verified address lets later `chain.get_contract`
+        # calls skip fetching the code again.
+        is_bytecode_match = chain.bytecode_verifier.verify(
+            contract_address,
+            contract_factory.code_runtime,
+            get_code=lambda address: deployed_code,
+        )
         if is_bytecode_match:
             click.echo(
                 "Verified contract bytecode @ {0} matches expected runtime "
@@ -342,9 +320,160 @@ def deploy_contract_and_verify(chain,
             click.echo(
                 "Verified bytecode @ {0} is non-empty".format(contract_address)
             )
+
+
+def deploy_contract_and_verify(chain,
+                               contract_name,
+                               base_contract_factory=None,
+                               deploy_transaction=None,
+                               deploy_arguments=None,
+                               link_dependencies=None):
+    """
+    This is a *loose* wrapper around `populus.utils.deploy.deploy_contract`
+    that handles the various concerns and logging that need to be present when
+    doing this as a CLI interaction.
+
+    Deploy a contract, displaying information about the deploy process as it
+    happens.  This also verifies that the deployed contract's bytecode matches
+    the expected value.
+    """
+    if link_dependencies is None:
+        link_dependencies = {}
+
+    web3 = chain.web3
+
+    if base_contract_factory is None:
+        base_contract_factory = chain.contract_factories[contract_name]
+
+    unlock_deploy_account(chain)
+
+    # TODO: this needs to do contract linking.
+    click.echo("Deploying {0}".format(contract_name))
+
+    deploy_txn_hash, contract_factory = deploy_contract(
+        chain=chain,
+        contract_name=contract_name,
+        contract_factory=base_contract_factory,
+        deploy_transaction=deploy_transaction,
+        deploy_arguments=deploy_arguments,
+        link_dependencies=link_dependencies,
+    )
+
+    click.echo("Deploy Transaction Sent: {0}".format(deploy_txn_hash))
+    click.echo("Waiting for confirmation...")
+
+    contract_address = chain.wait.for_contract_address(
+        deploy_txn_hash,
+        timeout=180,
+    )
+    deploy_receipt = web3.eth.getTransactionReceipt(deploy_txn_hash)
+    echo_mined_deploy_transaction(web3, deploy_txn_hash, deploy_receipt)
+
+    # Verification
+    verify_deployed_bytecode(chain, contract_factory, contract_address)
     return contract_factory(address=contract_address)
 
 
+def get_nonce_transaction(chain, nonce):
+    """
+    The transaction fields which set `nonce`, for chains that accept an
+    explicit nonce.
+    """
+    if nonce is None or not chain.accepts_explicit_nonces:
+        return {}
+    return {'nonce': nonce}
+
+
+def deploy_contracts_and_verify(chain,
+                                contract_names,
+                                link_dependencies=None,
+                                nonce=None):
+    """
+    Same as `deploy_contract_and_verify` for several contracts which do not
+    depend on each other.  All of the deploy transactions are sent up front
+    using consecutive nonces starting at `nonce` and then waited for
+    together.  Chains which do not accept explicit nonces are sent the
+    transactions without one.
+
+    Returns a tuple of an ordered mapping of contract name to the deployed
+    contract and the next unused nonce.
+    """
+    if link_dependencies is None:
+        link_dependencies = {}
+
+    web3 = chain.web3
+
+    unlock_deploy_account(chain)
+
+    if nonce is None and chain.accepts_explicit_nonces:
+        nonce = get_next_nonce(web3, web3.eth.defaultAccount)
+
+    deploy_txn_hashes = []
+    contract_factories = []
+    for contract_name in contract_names:
+        click.echo("Deploying {0}".format(contract_name))
+        deploy_txn_hash, contract_factory = deploy_contract(
+            chain=chain,
+            contract_name=contract_name,
+            deploy_transaction=get_nonce_transaction(chain, nonce),
+            link_dependencies=link_dependencies,
+        )
+        click.echo("Deploy Transaction Sent: {0}".format(deploy_txn_hash))
+        deploy_txn_hashes.append(deploy_txn_hash)
+        contract_factories.append(contract_factory)
+        if nonce is not None:
+            nonce += 1
+
+    click.echo("Waiting for confirmation of {0} transactions...".format(
+        len(deploy_txn_hashes),
+    ))
+    deploy_receipts = chain.wait.for_receipts(deploy_txn_hashes, timeout=180)
+
+    deployed_contracts = collections.OrderedDict()
+    for contract_name, contract_factory, deploy_txn_hash, deploy_receipt in zip(
+            contract_names, contract_factories, deploy_txn_hashes, deploy_receipts):
+        contract_address = deploy_receipt['contractAddress']
+        echo_mined_deploy_transaction(web3, deploy_txn_hash, deploy_receipt)
+        verify_deployed_bytecode(chain, contract_factory, contract_address)
+        deployed_contracts[contract_name] = contract_factory(address=contract_address)
+    return deployed_contracts, nonce
+
+
+def register_contract_addresses(chain, contracts, nonce=None):
+    """
+    Send a registrar transaction for each of the deployed `contracts` using
+    consecutive nonces starting at `nonce` without waiting for them to be
+    mined.
+
+    Returns a tuple of the transaction hashes and the next unused nonce.
+    """
+    web3 = chain.web3
+
+    if nonce is None and chain.accepts_explicit_nonces:
+        nonce = get_next_nonce(web3, web3.eth.defaultAccount)
+
+    register_txn_hashes = []
+    for contract_name, contract in contracts.items():
+        contract_key = 'contract/{name}'.format(name=contract_name)
+        register_txn_hash = chain.registrar.transact(
+            get_nonce_transaction(chain, nonce),
+        ).setAddress(
+            contract_key, contract.address
+        )
+        click.echo(
+            "Registering contract '{name}' @ {address} "
+            "in registrar in txn: {txn_hash}".format(
+                name=contract_name,
+                address=contract.address,
+                txn_hash=register_txn_hash,
+            )
+        )
+        register_txn_hashes.append(register_txn_hash)
+        if nonce is not None:
+            nonce += 1
+    return register_txn_hashes, nonce
+
+
 def show_chain_sync_progress(chain):
     """
     Display the syncing status of a chain as a progress bar
@@ -461,53 +590,167 @@ def get_unlocked_deploy_from_address(chain):
     return account
 
 
-def compile_project_contracts(project, optimize=True):
+def format_contract_delta(contract_name, contract_delta):
+    if contract_delta.status != CONTRACT_CHANGED:
+        return "- {0} ({1})".format(contract_name, contract_delta.status)
+
+    changed_parts = [
+        part for part, is_changed in (
+            ('abi', contract_delta.abi_changed),
+            ('bytecode', contract_delta.bytecode_changed),
+        ) if is_changed
+    ]
+    return "- {0} ({1}: {2})".format(
+        contract_name,
+        contract_delta.status,
+        ', '.join(changed_parts) or 'metadata',
+    )
+
+
+def echo_contract_deltas(contract_deltas):
+    click.echo("> Changed {0} contracts".format(len(contract_deltas)))
+    for contract_name in sorted(contract_deltas.keys()):
+        click.echo(format_contract_delta(contract_name, contract_deltas[contract_name]))
+
+
+def compile_project_contracts(project,
+                              optimize=True,
+                              use_cache=True,
+                              jobs=1,
+                              selectors=None):
     click.echo("============ Compiling ==============")
     click.echo("> Loading source files from: ./{0}\n".format(project.contracts_dir))
 
-    result = compile_and_write_contracts(
-        project.project_dir,
-        project.contracts_dir,
-        optimize=optimize
-    )
-    contract_source_paths, compiled_sources, output_file_path = result
+    try:
+        result = build_project_contracts(
+            project.project_dir,
+            project.contracts_dir,
+            use_cache=use_cache,
+            jobs=jobs,
+            artifact_format=project.artifact_format,
+            selectors=selectors,
+            optimize=optimize
+        )
+    except ValueError as err:
+        raise click.ClickException(str(err))
 
-    click.echo("> Found {0} contract source files".format(
-        len(contract_source_paths)
-    ))
-    for path in contract_source_paths:
+    if selectors:
+        click.echo("> Selected {0} contract source files".format(
+            len(result.contract_source_paths)
+        ))
+    else:
+        click.echo("> Found {0} contract source files".format(
+            len(result.contract_source_paths)
+        ))
+    for path in result.contract_source_paths:
         click.echo("- {0}".format(os.path.relpath(path)))
     click.echo("")
-    click.echo("> Compiled {0} contracts".format(len(compiled_sources)))
+    click.echo("> Compiled {0} contracts".format(len(result.compiled_sources)))
 
-    for contract_name in sorted(compiled_sources.keys()):
+    for contract_name in sorted(result.compiled_sources.keys()):
         click.echo("- {0}".format(contract_name))
 
+    click.echo("")
+    if not result.contract_deltas:
+        click.echo(
+            "> No changes.  Compiled assets at ./{0} are up to date".format(
+                os.path.relpath(result.output_file_path)
+            )
+        )
+        return
+
+    echo_contract_deltas(result.contract_deltas)
+
     click.echo("")
     click.echo(
         "> Wrote compiled assets to: ./{0}".format(
-            os.path.relpath(output_file_path)
+            os.path.relpath(result.output_file_path)
         )
     )
 
 
-def watch_project_contracts(project, **compile_kwargs):
-    watcher = DirWatcher(project.contracts_dir)
+def watch_project_contracts(project,
+                            debounce=DEFAULT_DEBOUNCE,
+                            optimize=True,
+                            use_cache=True,
+                            selectors=None):
+    """
+    Recompile the project contracts each time the sources change.  The
+    compiled contracts are kept in memory between builds and only the
+    sources affected by each change are read and recompiled.
+
+    If `selectors` are given only the sources needed for the selected
+    contracts are recompiled, the same as `compile_project_contracts`.
+
+    Sources are always compiled in this process since forking worker
+    processes is not safe from within the greenlet this runs in.
+    """
+    watcher = DirWatcher(project.contracts_dir, debounce=debounce)
 
-    last_hash = project.get_source_file_hash()
+    source_fingerprints = project.source_fingerprints
+    source_fingerprints.refresh()
+
+    compiled_sources, source_manifest = load_previous_build(
+        project.project_dir,
+        project.artifact_format,
+    )
 
     try:
         while True:
-            event = watcher.get()
-            if event.name in {'update', 'add', 'create'}:
-                current_hash = project.get_source_file_hash()
-                if current_hash == last_hash:
-                    continue
-                last_hash = current_hash
-                click.echo("Change detected in: {e.path}".format(e=event))
-                compile_project_contracts(project, **compile_kwargs)
+            # An editor save typically produces several events in quick
+            # succession so recompile once per batch rather than per event.
+            watcher.get_batch()
+
+            changed_source_paths = {
+                os.path.relpath(source_path)
+                for source_path in source_fingerprints.refresh()
+            }
+            if not changed_source_paths:
+                continue
+
+            for source_path in sorted(changed_source_paths):
+                click.echo("Change detected in: {0}".format(source_path))
+
+            start_time = time.time()
+            try:
+                result = build_project_contracts(
+                    project.project_dir,
+                    project.contracts_dir,
+                    use_cache=use_cache,
+                    jobs=1,
+                    artifact_format=project.artifact_format,
+                    compiled_sources=compiled_sources,
+                    source_manifest=source_manifest,
+                    source_paths=source_fingerprints.source_paths,
+                    changed_source_paths=changed_source_paths,
+                    selectors=selectors,
+                    optimize=optimize,
+                )
+            except ValueError as err:
+                # A selected contract may have been removed or renamed; keep
+                # watching so the next change can bring it back.
+                click.echo("> {0}".format(err))
+                continue
+            compiled_sources = result.compiled_sources
+            source_manifest = result.source_manifest
+
+            click.echo("> Recompiled {0} source files in {1:.2f}s".format(
+                len(result.recompiled_source_paths),
+                time.time() - start_time,
+            ))
+            if result.contract_deltas:
+                echo_contract_deltas(result.contract_deltas)
+                click.echo(
+                    "> Wrote compiled assets to: ./{0}".format(
+                        os.path.relpath(result.output_file_path)
+                    )
+                )
+            else:
+                click.echo("> No contracts changed")
     except KeyboardInterrupt:
         pass
+    finally:
+        watcher.stop()
 
 
 def select_project_contract(project):
@@ -0,0 +1,128 @@
+import os
+import json
+import hashlib
+
+from .empty import empty
+from .filesystem import (
+    atomic_write,
+    remove_file_if_exists,
+)
+
+
+# 64MB
+DEFAULT_MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+CACHE_ENTRY_SUFFIX = '.json'
+
+
+def get_source_file_digest(source_file_path):
+    with open(source_file_path, 'rb') as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+def get_compilation_cache_key(source_paths, solc_version, compiler_kwargs):
+    """
+    Returns a digest which uniquely identifies the output of compiling
+    `source_paths` with the given version of solc and compiler arguments.
+    """
+    key_data = {
+        'sources': [
+            [os.path.normpath(source_path), get_source_file_digest(source_path)]
+            for source_path in sorted(source_paths)
+        ],
+        'solc_version': solc_version,
+        'compiler_kwargs': compiler_kwargs,
+    }
+    return hashlib.sha256(
+        json.dumps(key_data, sort_keys=True, default=str).encode('utf8')
+    ).hexdigest()
+
+
+class CompilationCache(object):
+    """
+    A content addressed on-disk store of compiler output.  Entries are stored
+    as one JSON file per cache key and the least recently used entries are
+    evicted once the total size of the cache exceeds `max_size` bytes.
+    """
+    cache_dir = None
+    max_size = DEFAULT_MAX_CACHE_SIZE
+
+    def __init__(self, cache_dir, max_size=empty):
+        self.cache_dir = cache_dir
+        if max_size is not empty:
+            self.max_size = max_size
+
+    def get_cache_key(self, source_paths, solc_version, compiler_kwargs):
+        return get_compilation_cache_key(source_paths, solc_version, compiler_kwargs)
+
+    def get_entry_path(self, cache_key):
+        return os.path.join(self.cache_dir, cache_key + CACHE_ENTRY_SUFFIX)
+
+    def get(self, cache_key):
+        entry_path = self.get_entry_path(cache_key)
+        try:
+            with open(entry_path) as entry_file:
+                compiled_sources = json.load(entry_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+        # mark the entry as recently used.
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return compiled_sources
+
+    def set(self, cache_key, compiled_sources):
+        atomic_write(
+            self.get_entry_path(cache_key),
+            json.dumps(compiled_sources, sort_keys=True).encode('utf8'),
+        )
+        self.evict()
+
+    def __contains__(self, cache_key):
+        return os.path.exists(self.get_entry_path(cache_key))
+
+    def get_entries(self):
+        """
+        Returns a list of `(mtime, size, path)` for every entry in the cache.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(CACHE_ENTRY_SUFFIX):
+                continue
+            entry_path = os.path.join(self.cache_dir, filename)
+            try:
+                stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        return entries
+
+    @property
+    def size(self):
+        return sum(size for _, size, _ in self.get_entries())
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits within
+        `max_size`.  Returns the paths of the evicted entries.
+        """
+        entries = sorted(self.get_entries())
+        total_size = sum(size for _, size, _ in entries)
+
+        evicted = []
+        for _, size, entry_path in entries:
+            if total_size <= self.max_size:
+                break
+            if remove_file_if_exists(entry_path):
+                evicted.append(entry_path)
+            total_size -= size
+        return evicted
+
+    def clear(self):
+        for _, _, entry_path in self.get_entries():
+            remove_file_if_exists(entry_path)
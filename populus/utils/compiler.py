@@ -0,0 +1,132 @@
+import os
+import re
+import time
+import subprocess
+
+from solc import (
+    get_solc_version,
+)
+
+from .functional import (
+    cached_property,
+)
+from .filesystem import (
+    find_executable,
+)
+
+
+DEFAULT_SOLC_BINARY = 'solc'
+
+
+def get_solc_binary_path():
+    """
+    Returns the absolute path to the solc binary that py-solc will invoke.
+    """
+    return find_executable(os.environ.get('SOLC_BINARY', DEFAULT_SOLC_BINARY))
+
+
+def get_file_mtime(path):
+    if path is None:
+        return None
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+FLAG_RE = re.compile(r'(?<![\w-])(--[a-z][a-z0-9-]*)')
+
+
+class SolcToolchain(object):
+    """
+    Describes the installed solc compiler.  Each piece of information is
+    probed from the binary at most once.
+    """
+    binary_path = None
+    binary_mtime = None
+
+    def __init__(self, binary_path, binary_mtime):
+        self.binary_path = binary_path
+        self.binary_mtime = binary_mtime
+
+    @cached_property
+    def version(self):
+        if self.binary_path is None:
+            return get_solc_version()
+        return get_solc_version(solc_binary=self.binary_path)
+
+    @cached_property
+    def version_info(self):
+        major, minor, patch = self.version.split('.')[:3]
+        return major, minor, patch
+
+    @property
+    def major_minor_version(self):
+        return self.version_info[:2]
+
+    @cached_property
+    def supported_flags(self):
+        if self.binary_path is None:
+            return frozenset()
+
+        proc = subprocess.Popen(
+            [self.binary_path, '--help'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        stdoutdata, _ = proc.communicate()
+        return frozenset(FLAG_RE.findall(stdoutdata.decode('utf8', 'replace')))
+
+    def supports_flag(self, flag):
+        return flag in self.supported_flags
+
+    def is_current(self):
+        """
+        Whether this descriptor still describes the solc binary that would be
+        invoked.
+        """
+        binary_path = get_solc_binary_path()
+        return (
+            binary_path == self.binary_path and
+            get_file_mtime(binary_path) == self.binary_mtime
+        )
+
+
+# How long, in seconds, the solc binary is assumed to be unchanged before its
+# location and modification time are checked again.
+SOLC_TOOLCHAIN_CHECK_INTERVAL = 5
+
+_solc_toolchain = None
+_solc_toolchain_environ = None
+_solc_toolchain_checked_at = None
+
+
+def get_solc_toolchain():
+    """
+    Returns the shared `SolcToolchain` for this process, creating a new one if
+    the path or modification time of the solc binary has changed.  The binary
+    is only looked up again when the `SOLC_BINARY` or `PATH` environment
+    variables change or once `SOLC_TOOLCHAIN_CHECK_INTERVAL` seconds have
+    passed since the last check.
+    """
+    global _solc_toolchain
+    global _solc_toolchain_environ
+    global _solc_toolchain_checked_at
+
+    environ = (os.environ.get('SOLC_BINARY'), os.environ.get('PATH'))
+    now = time.time()
+
+    if _solc_toolchain is None or environ != _solc_toolchain_environ:
+        is_stale = True
+    elif now - _solc_toolchain_checked_at < SOLC_TOOLCHAIN_CHECK_INTERVAL:
+        is_stale = False
+    else:
+        is_stale = not _solc_toolchain.is_current()
+        _solc_toolchain_checked_at = now
+
+    if is_stale:
+        binary_path = get_solc_binary_path()
+        _solc_toolchain = SolcToolchain(binary_path, get_file_mtime(binary_path))
+        _solc_toolchain_environ = environ
+        _solc_toolchain_checked_at = now
+    return _solc_toolchain
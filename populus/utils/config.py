@@ -40,6 +40,7 @@ MORDEN_DEFAULTS = {
 
 OPTION_TYPES = {
     'is_external': 'getboolean',
+    'factory_cache_size': 'getint',
 }
 
 
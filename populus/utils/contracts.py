@@ -6,6 +6,8 @@ import functools
 
 import toposort
 
+from pylru import lrucache
+
 from web3.utils.formatting import (
     remove_0x_prefix,
 )
@@ -13,12 +15,15 @@ from web3.utils.string import (
     coerce_args_to_text,
 )
 
-from populus.utils.functional import (
-    compose,
+from .caching import (
+    InstrumentedLRUCache,
 )
 from .filesystem import (
     get_compiled_contracts_file_path,
 )
+from .functional import (
+    cached_property,
+)
 
 
 def package_contracts(contract_classes):
@@ -36,21 +41,67 @@ def package_contracts(contract_classes):
     return type('contracts', (object,), _dict)()
 
 
+def construct_contract_factory(web3, contract_data):
+    return web3.eth.contract(
+        code=contract_data.get('code'),
+        code_runtime=contract_data.get('code_runtime'),
+        abi=contract_data.get('abi'),
+        source=contract_data.get('source'),
+        address=contract_data.get('address'),
+    )
+
+
+class ContractFactories(object):
+    """
+    Same interface as the object returned by `package_contracts` but each
+    contract factory is only constructed (and its compiled data only loaded)
+    the first time it is accessed.
+    """
+    def __init__(self, web3, contracts):
+        self._web3 = web3
+        self._contracts = contracts
+        self._factories = {}
+
+    def __getitem__(self, contract_name):
+        if contract_name not in self._factories:
+            self._factories[contract_name] = construct_contract_factory(
+                self._web3,
+                self._contracts[contract_name],
+            )
+        return self._factories[contract_name]
+
+    def __setitem__(self, contract_name, contract_factory):
+        self._factories[contract_name] = contract_factory
+
+    def __getattr__(self, contract_name):
+        if contract_name.startswith('_'):
+            raise AttributeError(contract_name)
+        try:
+            return self[contract_name]
+        except KeyError:
+            raise AttributeError(contract_name)
+
+    def __contains__(self, contract_name):
+        return contract_name in self._factories or contract_name in self._contracts
+
+    def keys(self):
+        return set(self._contracts.keys()).union(self._factories.keys())
+
+    def values(self):
+        return [self[contract_name] for contract_name in self.keys()]
+
+    def items(self):
+        return [(contract_name, self[contract_name]) for contract_name in self.keys()]
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __len__(self):
+        return len(self.keys())
+
+
 def construct_contract_factories(web3, contracts):
-    constructor_kwargs = {
-        contract_name: {
-            'code': contract_data.get('code'),
-            'code_runtime': contract_data.get('code_runtime'),
-            'abi': contract_data.get('abi'),
-            'source': contract_data.get('source'),
-            'address': contract_data.get('address'),
-        } for contract_name, contract_data in contracts.items()
-    }
-    contract_classes = {
-        name: web3.eth.contract(**contract_data)
-        for name, contract_data in constructor_kwargs.items()
-    }
-    return package_contracts(contract_classes)
+    return ContractFactories(web3, contracts)
 
 
 def load_compiled_contract_json(project_dir):
@@ -84,14 +135,46 @@ def find_link_references(bytecode):
     return set(DEPENDENCY_RE.findall(bytecode))
 
 
+LINK_PLACEHOLDER_LENGTH = 40
+
+
+def make_link_placeholder(contract_name):
+    """
+    Returns the placeholder which solc embeds in unlinked bytecode in place of
+    the address of the library `contract_name`.
+    """
+    return contract_name[:36].ljust(38, "_").rjust(LINK_PLACEHOLDER_LENGTH, "_")
+
+
 def make_link_regex(contract_name):
     """
     Returns a regex that will match embedded link references within a
     contract's bytecode.
     """
-    return re.compile(
-        contract_name[:36].ljust(38, "_").rjust(40, "_")
+    return re.compile(make_link_placeholder(contract_name))
+
+
+_link_offsets_cache = lrucache(256)
+
+
+def find_link_offsets(bytecode):
+    """
+    Returns a tuple of `(start, end, placeholder)` for every link reference
+    placeholder in the bytecode in the order that they appear.  The result is
+    cached so that linking the same bytecode more than once only scans it
+    once.
+    """
+    try:
+        return _link_offsets_cache[bytecode]
+    except KeyError:
+        pass
+
+    link_offsets = tuple(
+        (match.start(), match.end(), match.group())
+        for match in DEPENDENCY_RE.finditer(bytecode)
     )
+    _link_offsets_cache[bytecode] = link_offsets
+    return link_offsets
 
 
 def expand_shortened_reference_name(name, full_names):
@@ -127,38 +210,224 @@ def expand_shortened_reference_name(name, full_names):
         )
 
 
+def try_expand_shortened_reference_name(name, full_names):
+    """
+    Same as `expand_shortened_reference_name` but returns `name` unchanged if
+    it cannot be expanded.
+    """
+    try:
+        return expand_shortened_reference_name(name, full_names)
+    except ValueError:
+        return name
+
+
+LINKABLE_BYTECODE_KEYS = ('code', 'code_runtime')
+
+
+def find_library_link_offsets(bytecode, full_contract_names):
+    """
+    Returns a mapping of the name of each library that `bytecode` must be
+    linked against to the offsets of its placeholders within `bytecode`.
+    Names that were truncated to 36 characters are expanded using
+    `full_contract_names` where this can be done unambiguously.
+    """
+    library_link_offsets = {}
+    for start, _, placeholder in find_link_offsets(bytecode):
+        name = try_expand_shortened_reference_name(
+            DEPENDENCY_RE.match(placeholder).group('name'),
+            full_contract_names,
+        )
+        library_link_offsets.setdefault(name, []).append(start)
+    return library_link_offsets
+
+
+def build_contract_link_references(contract_data, full_contract_names):
+    """
+    Returns the link reference metadata for a compiled contract, a mapping of
+    `code` and `code_runtime` to the output of `find_library_link_offsets`
+    for that bytecode.
+    """
+    return {
+        key: find_library_link_offsets(contract_data[key], full_contract_names)
+        for key in LINKABLE_BYTECODE_KEYS
+        if contract_data.get(key)
+    }
+
+
+def add_link_references(compiled_contracts):
+    """
+    Returns a copy of `compiled_contracts` where each contract that does not
+    already have one has a `link_references` entry.
+    """
+    full_contract_names = set(compiled_contracts.keys())
+    return {
+        contract_name: (
+            contract_data
+            if 'link_references' in contract_data
+            else dict(
+                contract_data,
+                link_references=build_contract_link_references(
+                    contract_data,
+                    full_contract_names,
+                ),
+            )
+        )
+        for contract_name, contract_data in compiled_contracts.items()
+    }
+
+
+def get_library_link_offsets(contract_data, key):
+    """
+    Returns the stored link offsets of the `code` or `code_runtime` of
+    `contract_data` or `None` if the contract data predates link reference
+    metadata.
+    """
+    return contract_data.get('link_references', {}).get(key)
+
+
+def get_contract_library_names(contract_data):
+    """
+    The names of the libraries that the `code` of `contract_data` links
+    against as recorded in its link references.  These may be truncated for
+    contract data which predates link reference metadata.
+    """
+    library_link_offsets = get_library_link_offsets(contract_data, 'code')
+    if library_link_offsets is None:
+        return find_link_references(contract_data.get('code') or '')
+    return set(library_link_offsets.keys())
+
+
+def _splice_link_addresses(bytecode, link_offsets, addresses):
+    chunks = []
+    position = 0
+    for start, end, placeholder in link_offsets:
+        if placeholder not in addresses:
+            # Not a dependency that we were given an address for.
+            continue
+        chunks.append(bytecode[position:start])
+        chunks.append(addresses[placeholder])
+        position = end
+
+    if not chunks:
+        return bytecode
+
+    chunks.append(bytecode[position:])
+    return ''.join(chunks)
+
+
+def _get_link_addresses(dependencies):
+    return {
+        make_link_placeholder(name): remove_0x_prefix(address)
+        for name, address in dependencies.items()
+    }
+
+
 def link_bytecode(bytecode, **dependencies):
     """
     Given the bytecode for a contract, and it's dependencies in the form of
     {contract_name: address} this functino returns the bytecode with all of the
     link references replaced with the dependency addresses.
+
+    The link reference offsets are computed once per bytecode and the linked
+    bytecode is assembled in a single pass.
+    """
+    if not bytecode or not dependencies:
+        return bytecode
+
+    link_offsets = find_link_offsets(bytecode)
+    if not link_offsets:
+        return bytecode
+
+    return _splice_link_addresses(
+        bytecode,
+        link_offsets,
+        _get_link_addresses(dependencies),
+    )
+
+
+def link_bytecode_at_offsets(bytecode, library_link_offsets, **dependencies):
     """
-    linker_fn = compose(*(
-        functools.partial(
-            make_link_regex(name).sub,
-            remove_0x_prefix(address),
+    Same as `link_bytecode` but uses the placeholder offsets from
+    `library_link_offsets` (see `find_library_link_offsets`) rather than
+    scanning the bytecode.  Falls back to `link_bytecode` if the offsets do
+    not match the bytecode.
+    """
+    if not library_link_offsets or not dependencies:
+        return bytecode
+
+    link_offsets = sorted(
+        (offset, offset + LINK_PLACEHOLDER_LENGTH, make_link_placeholder(name))
+        for name, offsets in library_link_offsets.items()
+        for offset in offsets
+    )
+    is_valid = all(
+        bytecode[start:end] == placeholder
+        for start, end, placeholder in link_offsets
+    )
+    if not is_valid:
+        return link_bytecode(bytecode, **dependencies)
+
+    return _splice_link_addresses(
+        bytecode,
+        link_offsets,
+        _get_link_addresses(dependencies),
+    )
+
+
+#: Linked bytecode keyed by the unlinked bytecode and the addresses it was
+#: linked against.  This is shared by every chain in the process so that
+#: chains which link against the same library addresses only link each
+#: bytecode once.
+linked_bytecode_cache = InstrumentedLRUCache(1024)
+
+
+def get_linked_bytecode(bytecode, library_link_offsets, dependencies):
+    """
+    Returns `bytecode` linked against `dependencies`, a mapping of library
+    name to address, using `library_link_offsets` when they are available.
+    The result is stored in `linked_bytecode_cache`.
+    """
+    cache_key = (bytecode, tuple(sorted(dependencies.items())))
+    try:
+        return linked_bytecode_cache[cache_key]
+    except KeyError:
+        pass
+
+    if library_link_offsets is None:
+        linked_bytecode = link_bytecode(bytecode, **dependencies)
+    else:
+        linked_bytecode = link_bytecode_at_offsets(
+            bytecode,
+            library_link_offsets,
+            **dependencies
         )
-        for name, address in dependencies.items()
-    ))
-    linked_bytecode = linker_fn(bytecode)
+    linked_bytecode_cache[cache_key] = linked_bytecode
     return linked_bytecode
 
 
-def get_contract_library_dependencies(bytecode, full_contract_names):
+def get_contract_library_dependencies(bytecode,
+                                      full_contract_names,
+                                      library_link_offsets=None):
     """
     Given a contract bytecode and an iterable of all of the known full names of
     contracts, returns a set of the contract names that this contract bytecode
-    depends on.
+    depends on.  If the stored `library_link_offsets` for the bytecode are
+    given the bytecode is not scanned.
 
     To get the full dependency graph use the `get_recursive_contract_dependencies`
     function.
     """
+    if library_link_offsets is None:
+        reference_names = find_link_references(bytecode)
+    else:
+        reference_names = library_link_offsets.keys()
+
     expand_fn = functools.partial(
         expand_shortened_reference_name,
         full_names=full_contract_names,
     )
     return {
-        expand_fn(name) for name in find_link_references(bytecode)
+        expand_fn(name) for name in reference_names
     }
 
 
@@ -167,10 +436,12 @@ def get_shallow_dependency_graph(contracts):
     Given a dictionary of compiled contract data, this returns a *shallow*
     dependency graph of each contracts explicit link dependencies.
     """
+    full_contract_names = set(contracts.keys())
     dependencies = {
         contract_name: get_contract_library_dependencies(
             contract_data['code'],
-            contracts.keys(),
+            full_contract_names,
+            get_library_link_offsets(contract_data, 'code'),
         )
         for contract_name, contract_data
         in contracts.items()
@@ -183,14 +454,147 @@ def get_contract_deploy_order(dependency_graph):
     return toposort.toposort_flatten(dependency_graph)
 
 
-def get_recursive_contract_dependencies(contract_name, dependency_graph):
+def get_recursive_contract_dependencies(contract_name, dependency_graph, memo=None):
     """
     Recursive computation of the linker dependencies for a specific contract
     within a contract dependency graph.
+
+    The dependencies of every contract visited along the way are stored in
+    `memo` so that shared dependencies are only computed once.  Pass the same
+    `memo` to subsequent calls against the same graph to reuse them.
+    """
+    if memo is None:
+        memo = {}
+
+    if contract_name not in memo:
+        direct_dependencies = dependency_graph.get(contract_name, set())
+        memo[contract_name] = frozenset(itertools.chain(
+            direct_dependencies, *(
+                get_recursive_contract_dependencies(dep, dependency_graph, memo)
+                for dep in direct_dependencies
+            )
+        ))
+    return set(memo[contract_name])
+
+
+class DependencyGraph(object):
     """
-    return set(itertools.chain(
-        dependency_graph.get(contract_name, set()), *(
-            get_recursive_contract_dependencies(dep, dependency_graph)
-            for dep in dependency_graph.get(contract_name, set())
+    The library link dependencies between a set of compiled contracts.
+
+    The shallow graph is built once from the `link_references` of each
+    contract (or its bytecode for contracts compiled before these were
+    recorded).  Transitive dependencies, dependents and the topological
+    levels of the graph are computed the first time they are requested and
+    cached, so a single instance should be shared for as long as the compiled
+    contracts do not change.
+
+    Library names which cannot be matched to one of the compiled contracts
+    are kept as they appear in the bytecode.
+    """
+    def __init__(self, compiled_contracts):
+        self.compiled_contracts = compiled_contracts
+        self._dependencies_memo = {}
+        self._dependents_memo = {}
+
+    @cached_property
+    def graph(self):
+        full_contract_names = set(self.compiled_contracts.keys())
+        return {
+            contract_name: {
+                try_expand_shortened_reference_name(name, full_contract_names)
+                for name in get_contract_library_names(contract_data)
+            }
+            for contract_name, contract_data
+            in self.compiled_contracts.items()
+            if contract_data.get('code') is not None
+        }
+
+    @cached_property
+    def reverse_graph(self):
+        reverse_graph = {contract_name: set() for contract_name in self.graph}
+        for contract_name, dependencies in self.graph.items():
+            for dependency in dependencies:
+                reverse_graph.setdefault(dependency, set()).add(contract_name)
+        return reverse_graph
+
+    @cached_property
+    def levels(self):
+        """
+        Tuple of sets of contract names where every contract only depends on
+        contracts in earlier sets.
+        """
+        return tuple(
+            frozenset(level) for level in toposort.toposort(self.graph)
+        )
+
+    @cached_property
+    def deploy_order(self):
+        return tuple(itertools.chain.from_iterable(
+            sorted(level) for level in self.levels
+        ))
+
+    def __contains__(self, contract_name):
+        return contract_name in self.graph or contract_name in self.reverse_graph
+
+    def get_dependencies(self, contract_name, recursive=True):
+        """
+        The libraries that `contract_name` links against, including their own
+        dependencies if `recursive`.
+        """
+        if not recursive:
+            return set(self.graph.get(contract_name, set()))
+        return get_recursive_contract_dependencies(
+            contract_name,
+            self.graph,
+            self._dependencies_memo,
+        )
+
+    def get_dependents(self, contract_name, recursive=True):
+        """
+        The contracts that link against `contract_name`, including the
+        contracts that depend on those if `recursive`.
+        """
+        if not recursive:
+            return set(self.reverse_graph.get(contract_name, set()))
+        return get_recursive_contract_dependencies(
+            contract_name,
+            self.reverse_graph,
+            self._dependents_memo,
+        )
+
+    def get_deploy_order(self, contract_names):
+        """
+        The names of the given contracts and all of their dependencies in an
+        order that they can be deployed in.
+        """
+        return [
+            contract_name
+            for level in self.get_deploy_levels(contract_names)
+            for contract_name in level
+        ]
+
+    def get_deploy_levels(self, contract_names):
+        """
+        The given contracts and all of their dependencies grouped by
+        topological level.  Contracts within a level do not depend on each
+        other so they can be deployed in any order.
+        """
+        required_contract_names = set(contract_names).union(*(
+            self.get_dependencies(contract_name)
+            for contract_name in contract_names
+        ))
+        unknown_contract_names = required_contract_names.difference(
+            self.compiled_contracts.keys()
+        )
+        if unknown_contract_names:
+            raise ValueError(
+                "No compiled contract data found for: {0}".format(
+                    ', '.join(sorted(unknown_contract_names)),
+                )
+            )
+
+        deploy_levels = (
+            sorted(level.intersection(required_contract_names))
+            for level in self.levels
         )
-    ))
+        return [level for level in deploy_levels if level]
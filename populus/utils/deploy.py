@@ -1,37 +1,37 @@
-import itertools
 from collections import OrderedDict
 
 from populus.utils.contracts import (
-    get_shallow_dependency_graph,
-    get_contract_deploy_order,
-    get_recursive_contract_dependencies,
+    DependencyGraph,
     link_bytecode,
 )
 
 
-def get_deploy_order(contracts_to_deploy, compiled_contracts):
-    # Extract and dependencies that exist due to library linking.
-    dependency_graph = get_shallow_dependency_graph(compiled_contracts)
+def get_deploy_order(contracts_to_deploy, compiled_contracts, dependency_graph=None):
+    """
+    Returns an ordered dictionary of the contract data for the contracts in
+    `contracts_to_deploy` along with all of their library dependencies in
+    the order they should be deployed.  Pass the `dependency_graph` for
+    `compiled_contracts` if one is available to avoid rebuilding it.
+    """
+    if dependency_graph is None:
+        dependency_graph = DependencyGraph(compiled_contracts)
 
-    # Compute the full set of dependencies needed to deploy the desired
-    # contracts.
-    all_deploy_dependencies = set(itertools.chain.from_iterable(
-        get_recursive_contract_dependencies(contract_name, dependency_graph)
-        for contract_name in contracts_to_deploy
-    ))
-    all_contracts_to_deploy = all_deploy_dependencies.union(contracts_to_deploy)
-
-    # Now compute the order that the contracts should be deployed based on
-    # their dependencies.
     deploy_order = [
         (contract_name, compiled_contracts[contract_name])
         for contract_name
-        in get_contract_deploy_order(dependency_graph)
-        if contract_name in all_contracts_to_deploy
+        in dependency_graph.get_deploy_order(contracts_to_deploy)
     ]
     return OrderedDict(deploy_order)
 
 
+def get_next_nonce(web3, account):
+    """
+    The nonce to use for the next transaction sent from `account`, taking
+    transactions which have not yet been mined into account.
+    """
+    return web3.eth.getTransactionCount(account, 'pending')
+
+
 def deploy_contract(chain,
                     contract_name,
                     contract_factory=None,
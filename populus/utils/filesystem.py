@@ -42,6 +42,11 @@ def remove_file_if_exists(path):
     return False
 
 
+# `os.replace` overwrites the destination on all platforms but is not
+# available on python 2.
+replace_file = getattr(os, 'replace', os.rename)
+
+
 def remove_dir_if_exists(path):
     if os.path.isdir(path):
         shutil.rmtree(path)
@@ -49,6 +54,48 @@ def remove_dir_if_exists(path):
     return False
 
 
+def atomic_write(file_path, data):
+    """
+    Write `data` (bytes) to `file_path` by writing to a temporary file in the
+    same directory and then renaming it into place so that readers never
+    observe a partially written file.
+    """
+    base_dir = os.path.dirname(os.path.abspath(file_path))
+    ensure_path_exists(base_dir)
+
+    if os.path.exists(file_path):
+        mode = os.stat(file_path).st_mode & 0o777
+    else:
+        # `mkstemp` creates the file readable only by the owner so apply the
+        # permissions that a regular `open` would have used.
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    fd, temp_path = tempfile.mkstemp(dir=base_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(data)
+        os.chmod(temp_path, mode)
+        replace_file(temp_path, file_path)
+    except Exception:
+        remove_file_if_exists(temp_path)
+        raise
+
+
+def write_file_if_changed(file_path, data):
+    """
+    Atomically write `data` (bytes) to `file_path` unless the file already
+    has exactly this content.  Returns whether the file was written.
+    """
+    if os.path.isfile(file_path):
+        with open(file_path, 'rb') as existing_file:
+            if existing_file.read() == data:
+                return False
+    atomic_write(file_path, data)
+    return True
+
+
 def mkdir(path):
     try:
         os.makedirs(path)
@@ -84,6 +131,38 @@ def get_compiled_contracts_file_path(project_dir):
     return os.path.join(build_dir, COMPILED_CONTRACTS_FILENAME)
 
 
+COMPACT_ARTIFACTS_FILENAME = "contracts.bin"
+
+
+def get_compact_artifacts_file_path(project_dir):
+    build_dir = get_build_dir(project_dir)
+    return os.path.join(build_dir, COMPACT_ARTIFACTS_FILENAME)
+
+
+CONTRACT_ARTIFACTS_DIR = "./contracts/"
+
+
+def get_contract_artifacts_dir(project_dir):
+    build_dir = get_build_dir(project_dir)
+    return os.path.join(build_dir, CONTRACT_ARTIFACTS_DIR)
+
+
+SOURCE_MANIFEST_FILENAME = "source_manifest.json"
+
+
+def get_source_manifest_file_path(project_dir):
+    build_dir = get_build_dir(project_dir)
+    return os.path.join(build_dir, SOURCE_MANIFEST_FILENAME)
+
+
+COMPILE_CACHE_DIR = "./.compile-cache/"
+
+
+def get_compile_cache_dir(project_dir):
+    build_dir = get_build_dir(project_dir)
+    return os.path.join(build_dir, COMPILE_CACHE_DIR)
+
+
 BLOCKCHAIN_DIR = "./chains/"
 
 
@@ -105,22 +184,30 @@ def get_migrations_dir(project_dir, lazy_create=True):
     return migrations_dir
 
 
-def is_executable_available(program):
+def find_executable(program):
+    """
+    Returns the absolute path to `program`, searching the `PATH` if it is not
+    already a path, or `None` if no executable can be found.
+    """
     def is_exe(fpath):
         return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
 
     fpath = os.path.dirname(program)
     if fpath:
         if is_exe(program):
-            return True
+            return os.path.abspath(program)
     else:
         for path in os.environ["PATH"].split(os.pathsep):
             path = path.strip('"')
             exe_file = os.path.join(path, program)
             if is_exe(exe_file):
-                return True
+                return os.path.abspath(exe_file)
 
-    return False
+    return None
+
+
+def is_executable_available(program):
+    return find_executable(program) is not None
 
 
 def recursive_find_files(base_dir, pattern):
@@ -0,0 +1,186 @@
+import os
+import time
+import fnmatch
+import hashlib
+
+from .functional import (
+    cached_property,
+)
+
+
+# Filesystem timestamps can be coarse.  A file or directory modified within
+# this window of being stat'd may be modified again without its timestamp
+# changing so its stat result can't be trusted.
+RACY_WINDOW_NS = 1000000000
+
+
+def get_time_ns():
+    return int(time.time() * 1000000000)
+
+
+def get_mtime_ns(stat_result):
+    # `st_mtime_ns` is not available on python 2.
+    mtime_ns = getattr(stat_result, 'st_mtime_ns', None)
+    if mtime_ns is None:
+        return int(stat_result.st_mtime * 1000000000)
+    return mtime_ns
+
+
+class FileFingerprint(object):
+    """
+    The size and modification time of a file along with a digest of its
+    contents which is only computed the first time it is needed.
+    """
+    def __init__(self, path, stat_result, observed_at_ns):
+        self.path = path
+        self.size = stat_result.st_size
+        self.mtime = stat_result.st_mtime
+        self.mtime_ns = get_mtime_ns(stat_result)
+        self.observed_at_ns = observed_at_ns
+
+    @property
+    def stat_key(self):
+        return self.size, self.mtime_ns
+
+    @property
+    def is_racy(self):
+        return self.mtime_ns >= self.observed_at_ns - RACY_WINDOW_NS
+
+    @cached_property
+    def digest(self):
+        with open(self.path, 'rb') as source_file:
+            return hashlib.sha256(source_file.read()).hexdigest()
+
+
+class SourceFingerprints(object):
+    """
+    Tracks a `FileFingerprint` for every file under `source_dir` whose name
+    matches `pattern`.  A file is only re-hashed when its size or modification
+    time changes.
+
+    The modification times of the directories seen during the last walk are
+    used as a change token.  Adding, removing or renaming a file updates the
+    modification time of its directory, so `source_dir` is only walked again
+    when the token changes.  Otherwise only the known files are stat'd.
+
+    Files and directories modified within `RACY_WINDOW_NS` of being stat'd
+    are always re-checked since a coarse timestamp may not reflect a second
+    modification.
+    """
+    def __init__(self, source_dir, pattern='*.sol'):
+        self.source_dir = os.path.abspath(source_dir)
+        self.pattern = pattern
+        self.fingerprints = {}
+        self._directories = None
+        self._directory_token = None
+
+    def get_directory_token(self):
+        """
+        Returns the modification times of the known directories or `None` if
+        they can't be relied on.
+        """
+        if self._directories is None:
+            return None
+
+        now_ns = get_time_ns()
+        try:
+            directory_token = tuple(
+                (directory, get_mtime_ns(os.stat(directory)))
+                for directory in self._directories
+            )
+        except OSError:
+            return None
+
+        if any(mtime_ns >= now_ns - RACY_WINDOW_NS for _, mtime_ns in directory_token):
+            return None
+        return directory_token
+
+    def _walk(self):
+        directories = []
+        source_paths = []
+        for dirpath, _, filenames in os.walk(self.source_dir):
+            directories.append(dirpath)
+            source_paths.extend(
+                os.path.join(dirpath, filename)
+                for filename in filenames
+                if fnmatch.fnmatch(filename, self.pattern)
+            )
+        return directories, source_paths
+
+    def refresh(self):
+        """
+        Bring the table up to date with the filesystem.  Returns the set of
+        paths which were added, removed or modified since the last refresh.
+        """
+        directory_token = self.get_directory_token()
+
+        if directory_token is None or directory_token != self._directory_token:
+            # Keep the token from before the walk so that any change made
+            # while walking is picked up by the next refresh.  If the set of
+            # directories changed the tokens won't match and the next refresh
+            # walks again.
+            self._directories, source_paths = self._walk()
+            self._directory_token = directory_token
+        else:
+            source_paths = list(self.fingerprints.keys())
+
+        changed_paths = set(self.fingerprints.keys()).difference(source_paths)
+        fingerprints = {}
+        now_ns = get_time_ns()
+
+        for source_path in source_paths:
+            try:
+                stat_result = os.stat(source_path)
+            except OSError:
+                # Removed since the directory was walked.
+                self._directory_token = None
+                changed_paths.add(source_path)
+                continue
+
+            previous_fingerprint = self.fingerprints.get(source_path)
+            fingerprint = FileFingerprint(source_path, stat_result, now_ns)
+
+            if previous_fingerprint is None:
+                changed_paths.add(source_path)
+            elif previous_fingerprint.stat_key != fingerprint.stat_key:
+                changed_paths.add(source_path)
+            elif not previous_fingerprint.is_racy:
+                fingerprint = previous_fingerprint
+            elif fingerprint.digest != previous_fingerprint.digest:
+                # The file changed without its stat result changing.
+                changed_paths.add(source_path)
+
+            if fingerprint.is_racy:
+                # Hash recently modified files right away so that a later
+                # modification which leaves the stat result unchanged can
+                # still be detected by comparing contents.
+                fingerprint.digest
+            fingerprints[source_path] = fingerprint
+
+        self.fingerprints = fingerprints
+        return changed_paths
+
+    @property
+    def source_paths(self):
+        return tuple(sorted(
+            os.path.relpath(source_path) for source_path in self.fingerprints
+        ))
+
+    def get_modification_time(self):
+        if not self.fingerprints:
+            return None
+        return max(
+            fingerprint.mtime for fingerprint in self.fingerprints.values()
+        )
+
+    def get_digest(self):
+        """
+        Returns a digest of the contents of every tracked file.
+        """
+        return hashlib.md5(b''.join(
+            (
+                os.path.relpath(source_path, self.source_dir) +
+                self.fingerprints[source_path].digest
+            ).encode('utf8')
+            for source_path in sorted(self.fingerprints.keys())
+        )).hexdigest()
@@ -0,0 +1,156 @@
+import contextlib
+import json
+
+import gevent
+from gevent import socket
+from geventhttpclient import HTTPClient
+
+from web3.providers.base import BaseProvider
+from web3.providers.rpc import RPCProvider
+from web3.providers.ipc import (
+    IPCProvider,
+    get_ipc_socket,
+)
+from web3.utils.string import (
+    force_bytes,
+    force_obj_to_text,
+    force_text,
+)
+
+
+def encode_batch_request(provider, requests):
+    """
+    Returns the request ids and the JSON body for a batch of `(method, params)`
+    requests.
+    """
+    payload = [
+        {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(provider.request_counter),
+        }
+        for method, params in requests
+    ]
+    request_ids = [request['id'] for request in payload]
+    return request_ids, force_bytes(json.dumps(force_obj_to_text(payload)))
+
+
+def send_http_batch_request(provider, request_data):
+    client = HTTPClient(
+        host=provider.host,
+        port=provider.port,
+        ssl=provider.ssl,
+        connection_timeout=provider.connection_timeout,
+        network_timeout=provider.network_timeout,
+        headers={'Content-Type': 'application/json'},
+    )
+    with contextlib.closing(client):
+        response = client.post(provider.path, body=request_data)
+        return response.read()
+
+
+def send_ipc_batch_request(provider, request_data):
+    provider._lock.acquire()
+    try:
+        with get_ipc_socket(provider.ipc_path) as sock:
+            sock.sendall(request_data)
+            response_raw = b""
+            while True:
+                try:
+                    response_raw += sock.recv(4096)
+                except socket.timeout:
+                    pass
+                if response_raw == b"":
+                    gevent.sleep(0)
+                    continue
+                try:
+                    json.loads(force_text(response_raw))
+                except ValueError:
+                    continue
+                else:
+                    return response_raw
+    finally:
+        provider._lock.release()
+
+
+def decode_batch_response(request_ids, response_raw):
+    responses = json.loads(force_text(response_raw))
+    if isinstance(responses, dict):
+        # Nodes answer a batch they cannot process with a single error object.
+        raise ValueError(responses.get('error', responses))
+
+    responses_by_id = {response['id']: response for response in responses}
+    results = []
+    for request_id in request_ids:
+        response = responses_by_id[request_id]
+        if "error" in response:
+            raise ValueError(response["error"])
+        results.append(response['result'])
+    return results
+
+
+def make_batch_request(web3, requests):
+    """
+    Send all of the `(method, params)` pairs in `requests` to the node in a
+    single JSON-RPC batch and return their results in the same order.
+
+    Providers other than the HTTP and IPC providers fall back to making the
+    requests one at a time.
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+
+    provider = web3.currentProvider
+
+    if isinstance(provider, RPCProvider):
+        send_batch_request = send_http_batch_request
+    elif isinstance(provider, IPCProvider):
+        send_batch_request = send_ipc_batch_request
+    else:
+        return [
+            web3._requestManager.request_blocking(method, params)
+            for method, params in requests
+        ]
+
+    request_ids, request_data = encode_batch_request(provider, requests)
+    return decode_batch_response(
+        request_ids,
+        send_batch_request(provider, request_data),
+    )
+
+
+class InProcessTestRPCProvider(BaseProvider):
+    """
+    Provider which dispatches requests straight to the methods registered by
+    the `eth-testrpc` server in the current process rather than through its
+    HTTP server.  Only the methods the server registers are available and,
+    since the server wraps each of them in its EVM lock, calls are serialized
+    with any requests it serves over HTTP from the same process.
+    """
+    def make_request(self, method, params):
+        from testrpc.server import dispatcher
+
+        response = {
+            "jsonrpc": "2.0",
+            "id": next(self.request_counter),
+        }
+
+        try:
+            rpc_fn = dispatcher[method]
+        except KeyError:
+            response['error'] = {
+                "code": -32601,
+                "message": "Method not found: {0}".format(method),
+            }
+        else:
+            try:
+                response['result'] = rpc_fn(*force_obj_to_text(params or []))
+            except Exception as err:
+                response['error'] = {
+                    "code": -32603,
+                    "message": "{0}: {1}".format(type(err).__name__, err),
+                }
+
+        return force_bytes(json.dumps(force_obj_to_text(response)))
@@ -0,0 +1,199 @@
+import os
+import re
+import itertools
+
+
+COMMENT_RE = re.compile(
+    r'//[^\n]*|/\*.*?\*/',
+    re.DOTALL,
+)
+
+
+IMPORT_RE = re.compile((
+    r'\bimport\s+'
+    # Optional `* as x from`, `{a, b as c} from`, `x from` prefix.
+    r'(?:[^;"\']*?\s+from\s+)?'
+    # The import path
+    r'["\'](?P<path>[^"\']+)["\']'
+))
+
+
+DECLARATION_RE = re.compile((
+    r'\b(?:contract|library|interface)\s+'
+    r'(?P<name>[a-zA-Z_$][a-zA-Z0-9_$]*)'
+))
+
+
+def strip_comments(source):
+    return COMMENT_RE.sub('', source)
+
+
+def find_solidity_imports(source):
+    """
+    Returns the import paths declared by the given solidity source in the
+    order that they appear.
+    """
+    return [
+        match.group('path') for match in IMPORT_RE.finditer(strip_comments(source))
+    ]
+
+
+def find_solidity_declarations(source):
+    """
+    Returns the set of contract, library, and interface names declared by the
+    given solidity source.
+    """
+    return {
+        match.group('name')
+        for match in DECLARATION_RE.finditer(strip_comments(source))
+    }
+
+
+def resolve_import_path(import_path, source_path):
+    """
+    Resolve an import path found in the source file located at `source_path`.
+    Relative imports (starting with `./` or `../`) are resolved against the
+    directory of the importing file.  All other imports are resolved against
+    the current working directory which is where solc is invoked from.
+    """
+    if import_path.startswith('./') or import_path.startswith('../'):
+        import_path = os.path.join(os.path.dirname(source_path), import_path)
+    return os.path.relpath(os.path.normpath(import_path))
+
+
+def read_source_file(source_path):
+    with open(source_path) as source_file:
+        return source_file.read()
+
+
+def get_import_graph(source_paths, sources=None):
+    """
+    Returns a mapping of each source path to the set of source paths that it
+    directly imports.  `sources` may be provided as a mapping of already read
+    source code keyed by path.
+    """
+    if sources is None:
+        sources = {}
+
+    return {
+        os.path.relpath(source_path): {
+            resolve_import_path(import_path, source_path)
+            for import_path in find_solidity_imports(
+                sources[source_path]
+                if source_path in sources
+                else read_source_file(source_path)
+            )
+        }
+        for source_path in source_paths
+    }
+
+
+def get_reverse_import_graph(import_graph):
+    """
+    Returns a mapping of each source path to the set of source paths which
+    directly import it.
+    """
+    reverse_graph = {source_path: set() for source_path in import_graph}
+    for source_path, import_paths in import_graph.items():
+        for import_path in import_paths:
+            reverse_graph.setdefault(import_path, set()).add(source_path)
+    return reverse_graph
+
+
+def _walk_graph(graph, start_paths):
+    seen = set()
+    to_visit = list(start_paths)
+
+    while to_visit:
+        source_path = to_visit.pop()
+        if source_path in seen:
+            continue
+        seen.add(source_path)
+        to_visit.extend(graph.get(source_path, set()).difference(seen))
+    return seen
+
+
+def get_transitive_imports(import_graph, source_paths):
+    """
+    Returns the set of `source_paths` along with every source path that they
+    import either directly or indirectly.
+    """
+    return _walk_graph(import_graph, source_paths)
+
+
+def get_transitive_importers(import_graph, source_paths):
+    """
+    Returns the set of `source_paths` along with every source path that
+    imports them either directly or indirectly.
+    """
+    return _walk_graph(get_reverse_import_graph(import_graph), source_paths)
+
+
+def find_transitive_source_imports(source_paths):
+    """
+    Returns the set of `source_paths` along with every existing source file
+    that they import either directly or indirectly by reading each file.
+    """
+    seen = set()
+    to_visit = [os.path.relpath(source_path) for source_path in source_paths]
+
+    while to_visit:
+        source_path = to_visit.pop()
+        if source_path in seen:
+            continue
+        seen.add(source_path)
+        to_visit.extend(
+            import_path
+            for import_path in (
+                resolve_import_path(import_path, source_path)
+                for import_path in find_solidity_imports(read_source_file(source_path))
+            )
+            if import_path not in seen and os.path.isfile(import_path)
+        )
+    return seen
+
+
+def get_declared_contract_names(source_manifest, source_paths):
+    """
+    Returns the names of all contracts declared in the given source paths
+    according to the `source_manifest`.
+    """
+    sources = source_manifest['sources']
+    return set(itertools.chain.from_iterable(
+        sources[source_path]['contracts']
+        for source_path in source_paths
+        if source_path in sources
+    ))
+
+
+def get_connected_components(import_graph, source_paths):
+    """
+    Partition `source_paths` into groups which share no imports (directly or
+    indirectly) with any other group.  Each group can be compiled
+    independently.  Groups are returned as sorted tuples in sorted order so
+    the result is deterministic.
+    """
+    parents = {}
+
+    def find(node):
+        parents.setdefault(node, node)
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parents[root_b] = root_a
+
+    for source_path, import_paths in import_graph.items():
+        find(source_path)
+        for import_path in import_paths:
+            union(source_path, import_path)
+
+    components = {}
+    for source_path in source_paths:
+        components.setdefault(find(source_path), set()).add(source_path)
+
+    return sorted(tuple(sorted(component)) for component in components.values())
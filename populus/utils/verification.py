@@ -0,0 +1,119 @@
+import time
+
+from web3.utils.crypto import (
+    sha3,
+)
+from web3.utils.formatting import (
+    remove_0x_prefix,
+)
+from web3.utils.string import (
+    force_text,
+)
+
+
+def normalize_bytecode(bytecode):
+    """
+    Lower case hex bytecode without the `0x` prefix.
+    """
+    if not bytecode:
+        return ''
+    return remove_0x_prefix(force_text(bytecode)).lower()
+
+
+def get_code_hash(bytecode):
+    """
+    Keccak digest of the raw bytes of the hex encoded `bytecode`.
+    """
+    return sha3(normalize_bytecode(bytecode), encoding='hex')
+
+
+class BytecodeVerifier(object):
+    """
+    Checks that the code deployed at an address matches an expected runtime
+    bytecode by comparing keccak digests.  Verified (address, code hash)
+    pairs are remembered so that later checks for the same pair do not
+    fetch the code again.
+
+    The remembered pairs are dropped when a reorg is detected.  The hash of
+    the most recent block seen while verifying is re-checked at most once
+    every `reorg_check_interval` seconds, and is itself only refreshed once
+    that long has passed since it was taken.
+    """
+    hits = 0
+    misses = 0
+
+    def __init__(self, web3, reorg_check_interval=1):
+        self.web3 = web3
+        self.reorg_check_interval = reorg_check_interval
+        self._verified = set()
+        self._checkpoint = None
+        self._checkpoint_checked_at = None
+        self._checkpoint_taken_at = None
+
+    def _check_for_reorg(self):
+        if self._checkpoint is None:
+            return
+        now = time.time()
+        if now - self._checkpoint_checked_at < self.reorg_check_interval:
+            return
+        block_number, block_hash = self._checkpoint
+        block = self.web3.eth.getBlock(block_number)
+        if block is None or block['hash'] != block_hash:
+            self.invalidate()
+        else:
+            self._checkpoint_checked_at = now
+
+    def _update_checkpoint(self):
+        if (self._checkpoint is not None and
+                time.time() - self._checkpoint_taken_at < self.reorg_check_interval):
+            return
+        block = self.web3.eth.getBlock('latest')
+        self.set_checkpoint(block['number'], block['hash'])
+
+    def set_checkpoint(self, block_number, block_hash):
+        """
+        Use a block which the caller has already fetched as the checkpoint
+        for reorg detection.
+        """
+        self._check_for_reorg()
+        self._checkpoint = (block_number, block_hash)
+        self._checkpoint_taken_at = self._checkpoint_checked_at = time.time()
+
+    def is_verified(self, address, expected_code):
+        self._check_for_reorg()
+        return (address, get_code_hash(expected_code)) in self._verified
+
+    def verify(self, address, expected_code, get_code=None):
+        """
+        Returns whether the code at `address` matches `expected_code`.  The
+        code is only fetched, using `get_code` if provided, when the pair has
+        not been verified before.
+        """
+        expected_code_hash = get_code_hash(expected_code)
+
+        self._check_for_reorg()
+        if (address, expected_code_hash) in self._verified:
+            self.hits += 1
+            return True
+        self.misses += 1
+
+        if get_code is None:
+            get_code = self.web3.eth.getCode
+        code = get_code(address)
+
+        if get_code_hash(code) != expected_code_hash:
+            return False
+
+        self._update_checkpoint()
+        self._verified.add((address, expected_code_hash))
+        return True
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        self._verified.clear()
+        self._checkpoint = None
+        self._checkpoint_checked_at = None
+        self._checkpoint_taken_at = None
@@ -19,6 +19,29 @@ def wait_for_transaction_receipt(web3, txn_hash, timeout=120, poll_interval=None
     return txn_receipt
 
 
+def wait_for_transaction_receipts(web3, txn_hashes, timeout=120, poll_interval=None):
+    """
+    Wait for all of `txn_hashes` to be mined.  Returns their receipts in the
+    same order.
+    """
+    txn_receipts = {}
+    with gevent.Timeout(timeout):
+        while True:
+            for txn_hash in txn_hashes:
+                if txn_hash in txn_receipts:
+                    continue
+                txn_receipt = web3.eth.getTransactionReceipt(txn_hash)
+                if txn_receipt is not None and txn_receipt['blockHash'] is not None:
+                    txn_receipts[txn_hash] = txn_receipt
+            if len(txn_receipts) == len(set(txn_hashes)):
+                break
+            if poll_interval is None:
+                gevent.sleep(random.random())
+            else:
+                gevent.sleep(poll_interval)
+    return [txn_receipts[txn_hash] for txn_hash in txn_hashes]
+
+
 def wait_for_block_number(web3, block_number=1, timeout=120, poll_interval=None):
 
     with gevent.Timeout(timeout):
@@ -104,6 +127,19 @@ class Wait(object):
 
         return wait_for_transaction_receipt(self.web3, txn_hash, **kwargs)
 
+    def for_receipts(self, txn_hashes, timeout=empty, poll_interval=empty):
+        kwargs = {}
+
+        if timeout is not empty:
+            kwargs['timeout'] = timeout
+        if poll_interval is not empty:
+            kwargs['poll_interval'] = poll_interval
+
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('poll_interval', self.poll_interval)
+
+        return wait_for_transaction_receipts(self.web3, txn_hashes, **kwargs)
+
     def for_block(self, block_number=empty, timeout=empty, poll_interval=empty):
         kwargs = {}
 
@@ -45,7 +45,7 @@ setup(
         'pytest11': ['ethereum=populus.plugin'],
     },
     keywords='ethereum pytest',
-    packages=find_packages(exclude=["tests", "tests.*"]),
+    packages=find_packages(exclude=["tests", "tests.*", "benchmarks", "benchmarks.*"]),
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Intended Audience :: Developers',
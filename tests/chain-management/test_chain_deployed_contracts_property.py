@@ -1,11 +1,13 @@
 import pytest
 
+from populus.utils import rpc
 from populus.utils.contracts import (
     link_bytecode,
 )
 from populus.chain import (
     NoKnownAddress,
     BytecodeMismatchError,
+    DeployedContracts,
 )
 from populus import Project
 
@@ -159,3 +161,92 @@ def test_missing_dependencies_ignored(testrpc_chain,
 
     assert 'Library13' not in chain.deployed_contracts
     assert 'Multiply13' not in chain.deployed_contracts
+
+
+def test_registrar_lookups_are_batched(testrpc_chain,
+                                       math,
+                                       library_13,
+                                       register_address):
+    chain = testrpc_chain
+
+    register_address('Math', math.address)
+    register_address('Library13', library_13.address)
+
+    registrar_client = chain.registrar_client
+    registrar_client.invalidate()
+    registrar_client.reset_stats()
+
+    assert len(chain.deployed_contracts) == 2
+    assert registrar_client.misses == 0
+    assert registrar_client.hits > 0
+
+
+def test_resolving_all_contracts_takes_two_round_trips(testrpc_chain,
+                                                      math,
+                                                      library_13,
+                                                      multiply_13,
+                                                      register_address,
+                                                      monkeypatch):
+    chain = testrpc_chain
+
+    register_address('Math', math.address)
+    register_address('Library13', library_13.address)
+    register_address('Multiply13', multiply_13.address)
+
+    provider = chain.web3.currentProvider
+    requests = []
+
+    make_request = provider.make_request
+    send_http_batch_request = rpc.send_http_batch_request
+
+    def count_request(method, params):
+        requests.append(method)
+        return make_request(method, params)
+
+    def count_batch_request(provider, request_data):
+        requests.append('batch')
+        return send_http_batch_request(provider, request_data)
+
+    monkeypatch.setattr(provider, 'make_request', count_request)
+    monkeypatch.setattr(rpc, 'send_http_batch_request', count_batch_request)
+
+    chain.registrar_client.invalidate()
+    chain.bytecode_verifier.invalidate()
+
+    assert len(chain.deployed_contracts) == 3
+    assert requests == ['batch', 'batch']
+
+
+def test_contracts_are_resolved_lazily(testrpc_chain,
+                                       math,
+                                       library_13,
+                                       multiply_13,
+                                       register_address):
+    chain = testrpc_chain
+
+    register_address('Math', math.address)
+    register_address('Library13', library_13.address)
+    register_address('Multiply13', multiply_13.address)
+
+    deployed_contracts = chain.deployed_contracts
+
+    assert deployed_contracts.Multiply13.call().multiply13(3) == 39
+    assert set(deployed_contracts.latencies.keys()) == {'Library13', 'Multiply13'}
+
+    assert len(deployed_contracts) == 3
+    assert set(deployed_contracts.latencies.keys()) == {'Math', 'Library13', 'Multiply13'}
+    assert all(latency >= 0 for latency in deployed_contracts.latencies.values())
+
+
+def test_resolution_with_single_greenlet_pool(testrpc_chain,
+                                              library_13,
+                                              multiply_13,
+                                              register_address):
+    chain = testrpc_chain
+
+    register_address('Library13', library_13.address)
+    register_address('Multiply13', multiply_13.address)
+
+    deployed_contracts = DeployedContracts(chain, pool_size=1)
+
+    assert set(deployed_contracts.keys()) == {'Library13', 'Multiply13'}
@@ -0,0 +1,44 @@
+import pytest
+
+from populus.project import Project
+
+
+def test_chain_factory_cache_size_is_configurable(project_dir):
+    project = Project()
+    assert project.get_chain('testrpc').factory_cache.capacity == 128
+
+    project.config.add_section('chain:testrpc')
+    project.config.set('chain:testrpc', 'factory_cache_size', '4')
+
+    assert project.get_chain('testrpc').factory_cache.capacity == 4
+
+
+@pytest.yield_fixture()
+def testrpc_chain(project_dir, write_project_file, LIBRARY_13, MULTIPLY_13):
+    write_project_file(
+        'contracts/Multiply13.sol',
+        '\n'.join((LIBRARY_13['source'], MULTIPLY_13['source'])),
+    )
+
+    project = Project()
+
+    with project.get_chain('testrpc') as chain:
+        yield chain
+
+
+def test_chain_factory_cache_counts_hits_and_misses(testrpc_chain):
+    chain = testrpc_chain
+    library_address = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+
+    factory = chain.get_contract_factory(
+        'Multiply13',
+        link_dependencies={'Library13': library_address},
+    )
+    assert chain.get_contract_factory(
+        'Multiply13',
+        link_dependencies={'Library13': library_address},
+    ) is factory
+
+    assert chain.factory_cache.stats['hits'] == 1
+    assert chain.factory_cache.stats['misses'] == 1
+    assert library_address[2:] in factory.code
@@ -0,0 +1,44 @@
+import pytest
+
+from populus.project import Project
+from populus.utils.rpc import InProcessTestRPCProvider
+
+
+@pytest.yield_fixture()
+def in_process_chain(project_dir, write_project_file, MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+
+    project = Project()
+    project.config.add_section('chain:testrpc')
+    project.config.set(
+        'chain:testrpc',
+        'provider',
+        'populus.utils.rpc.InProcessTestRPCProvider',
+    )
+
+    with project.get_chain('testrpc') as chain:
+        yield chain
+
+
+def test_testrpc_chain_uses_in_process_provider(in_process_chain):
+    chain = in_process_chain
+
+    assert isinstance(chain.provider, InProcessTestRPCProvider)
+    assert chain.port is None
+    assert chain.web3.eth.blockNumber == 1
+
+
+def test_in_process_provider_deploys_contracts(in_process_chain):
+    chain = in_process_chain
+
+    math = chain.get_contract('Math')
+    chain.wait.for_receipt(math.transact().increment())
+
+    assert math.call().counter() == 1
+
+
+def test_in_process_provider_reports_unknown_methods(in_process_chain):
+    chain = in_process_chain
+
+    with pytest.raises(ValueError):
+        chain.web3._requestManager.request_blocking('eth_notAMethod', [])
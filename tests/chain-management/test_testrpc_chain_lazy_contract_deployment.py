@@ -1,7 +1,10 @@
 import pytest
 
 from populus import Project
-from populus.chain import UnknownContract
+from populus.chain import (
+    UnknownContract,
+    get_deploy_cache_key,
+)
 
 
 @pytest.yield_fixture()
@@ -100,6 +103,28 @@ def test_it_lazily_deploys_contract(testrpc_chain):
     assert 'Math' in chain.deployed_contracts
 
 
+def test_it_records_lazy_deployments(testrpc_chain):
+    chain = testrpc_chain
+
+    math = chain.get_contract('Math')
+    cache_key = get_deploy_cache_key('Math', chain.contract_factories.Math.code)
+
+    assert chain.deploy_cache == {cache_key: math.address}
+
+
+def test_it_reuses_cached_deployments(testrpc_chain, math):
+    chain = testrpc_chain
+
+    cache_key = get_deploy_cache_key('Math', chain.contract_factories.Math.code)
+    chain.deploy_cache[cache_key] = math.address
+
+    block_number = chain.web3.eth.blockNumber
+    actual_math = chain.get_contract('Math')
+    assert actual_math.address == math.address
+    # Only the registrar transaction was sent.
+    assert chain.web3.eth.blockNumber == block_number + 1
+
+
 def test_it_handles_library_dependencies(testrpc_chain):
     chain = testrpc_chain
 
@@ -72,3 +72,49 @@ def test_deployment_command_with_prompt_for_contracts(project_dir,
     assert 'WithNoArgumentConstructor' in result.output
     assert 'Emitter' in result.output
     assert 'Deploying Math' in result.output
+
+
+@flaky
+def test_parallel_deployment_command(project_dir,
+                                     write_project_file,
+                                     MATH,
+                                     SIMPLE_CONSTRUCTOR,
+                                     EMITTER):
+    write_project_file('./contracts/Math.sol', MATH['source'])
+    write_project_file('./contracts/SimpleConstructor.sol', SIMPLE_CONSTRUCTOR['source'])
+    write_project_file('./contracts/Emitter.sol', EMITTER['source'])
+    runner = CliRunner()
+    result = runner.invoke(main, [
+        'deploy', 'Math', 'Emitter', '--chain', 'testrpc', '--deploy-from', '0',
+        '--parallel',
+    ])
+
+    assert result.exit_code == 0, result.output + str(result.exception)
+
+    assert 'Deploying Math' in result.output
+    assert 'Deploying Emitter' in result.output
+    assert 'Waiting for confirmation of 2 transactions' in result.output
+    assert 'WithNoArgumentConstructor' not in result.output
+
+
+@flaky
+def test_parallel_deployment_command_with_library_levels(project_dir,
+                                                         write_project_file,
+                                                         LIBRARY_13,
+                                                         MULTIPLY_13):
+    write_project_file(
+        './contracts/Multiply13.sol',
+        '\n'.join((LIBRARY_13['source'], MULTIPLY_13['source'])),
+    )
+    runner = CliRunner()
+    result = runner.invoke(main, [
+        'deploy', 'Multiply13', '--chain', 'testrpc', '--deploy-from', '0',
+        '--parallel',
+    ])
+
+    assert result.exit_code == 0, result.output + str(result.exception)
+
+    assert result.output.index('Deploying Library13') < result.output.index('Deploying Multiply13')
+    assert "Registering contract 'Library13'" in result.output
+    assert "Registering contract 'Multiply13'" in result.output
+    assert 'Deployment Successful' in result.output
@@ -0,0 +1,26 @@
+from populus.utils.cli import (
+    get_nonce_transaction,
+)
+
+
+class FakeChain(object):
+    def __init__(self, accepts_explicit_nonces):
+        self.accepts_explicit_nonces = accepts_explicit_nonces
+
+
+def test_nonce_is_set_when_the_chain_accepts_it():
+    assert get_nonce_transaction(FakeChain(True), 3) == {'nonce': 3}
+    assert get_nonce_transaction(FakeChain(True), None) == {}
+
+
+def test_nonce_is_omitted_when_the_chain_rejects_it():
+    assert get_nonce_transaction(FakeChain(False), 3) == {}
+
+
+def test_testrpc_chain_does_not_accept_explicit_nonces(project_dir):
+    from populus.project import Project
+
+    project = Project()
+
+    assert project.get_chain('testrpc').accepts_explicit_nonces is False
+    assert project.get_chain('temp').accepts_explicit_nonces is True
@@ -0,0 +1,84 @@
+import os
+import json
+
+from populus.compilation import (
+    write_compiled_sources,
+    get_changed_contract_names,
+)
+from populus.utils.artifacts import (
+    write_contract_artifacts,
+    get_contract_artifact_path,
+)
+from populus.utils.filesystem import (
+    get_contract_artifacts_dir,
+)
+
+
+COMPILED_SOURCES = {
+    'Math': {
+        'abi': [],
+        'code': '0x6060',
+        'code_runtime': '0x6060',
+    },
+    'Token': {
+        'abi': [],
+        'code': '0x6061',
+        'code_runtime': '0x6061',
+    },
+}
+
+
+def test_unchanged_compiled_sources_are_not_rewritten(project_dir):
+    contracts_path = write_compiled_sources(project_dir, COMPILED_SOURCES)
+    first_inode = os.stat(contracts_path).st_ino
+
+    write_compiled_sources(project_dir, COMPILED_SOURCES)
+    assert os.stat(contracts_path).st_ino == first_inode
+
+    write_compiled_sources(project_dir, {'Math': COMPILED_SOURCES['Math']})
+    assert os.stat(contracts_path).st_ino != first_inode
+
+    with open(contracts_path) as contracts_file:
+        assert json.load(contracts_file) == {'Math': COMPILED_SOURCES['Math']}
+
+    assert not any(
+        filename.endswith('.tmp')
+        for filename in os.listdir(os.path.dirname(contracts_path))
+    )
+
+
+def test_split_artifacts_only_rewrite_changed_contracts(project_dir):
+    artifacts_dir = get_contract_artifacts_dir(project_dir)
+    write_contract_artifacts(artifacts_dir, COMPILED_SOURCES)
+
+    math_path = get_contract_artifact_path(artifacts_dir, 'Math')
+    token_path = get_contract_artifact_path(artifacts_dir, 'Token')
+    math_inode = os.stat(math_path).st_ino
+    token_inode = os.stat(token_path).st_ino
+
+    write_contract_artifacts(artifacts_dir, dict(
+        COMPILED_SOURCES,
+        Token=dict(COMPILED_SOURCES['Token'], code='0x6062'),
+    ))
+
+    assert os.stat(math_path).st_ino == math_inode
+    assert os.stat(token_path).st_ino != token_inode
+
+
+def test_get_changed_contract_names():
+    next_compiled_sources = {
+        'Math': COMPILED_SOURCES['Math'],
+        'Token': dict(COMPILED_SOURCES['Token'], code='0x6062'),
+        'Wallet': COMPILED_SOURCES['Token'],
+    }
+
+    assert get_changed_contract_names(None, COMPILED_SOURCES) == {'Math', 'Token'}
+    assert get_changed_contract_names(COMPILED_SOURCES, COMPILED_SOURCES) == set()
+    assert get_changed_contract_names(
+        COMPILED_SOURCES,
+        next_compiled_sources,
+    ) == {'Token', 'Wallet'}
+    assert get_changed_contract_names(
+        next_compiled_sources,
+        {'Math': COMPILED_SOURCES['Math']},
+    ) == {'Token', 'Wallet'}
@@ -0,0 +1,66 @@
+from populus.utils.artifacts import (
+    write_compact_artifacts,
+    CompactContractArtifacts,
+)
+from populus.utils.filesystem import (
+    get_compact_artifacts_file_path,
+)
+
+
+ABI = [{"constant": True, "inputs": [], "name": "data", "outputs": [{"name": "", "type": "uint256"}], "type": "function"}]
+
+
+COMPILED_SOURCES = {
+    'Library13': {
+        'abi': ABI,
+        'code': '0x6060604052',
+        'code_runtime': '0x60606040',
+        'meta': {'compilerVersion': '0.4.2'},
+    },
+    'Multiply13': {
+        'abi': ABI,
+        'code': '0x6060' + '__Library13_____________________________' + '6060',
+        'code_runtime': '0x',
+        'source': None,
+    },
+    'Empty': {
+        'abi': [],
+        'code': '',
+    },
+}
+
+
+def test_compact_artifacts_round_trip(project_dir):
+    artifacts_path = get_compact_artifacts_file_path(project_dir)
+    write_compact_artifacts(artifacts_path, COMPILED_SOURCES)
+
+    contracts = CompactContractArtifacts(artifacts_path)
+
+    assert set(contracts.keys()) == set(COMPILED_SOURCES.keys())
+    assert not contracts.is_loaded('Multiply13')
+
+    for contract_name, contract_data in COMPILED_SOURCES.items():
+        assert contracts[contract_name] == contract_data
+
+    assert contracts.is_loaded('Multiply13')
+
+
+def test_compact_artifacts_deduplicate_abis(project_dir):
+    artifacts_path = get_compact_artifacts_file_path(project_dir)
+    write_compact_artifacts(artifacts_path, COMPILED_SOURCES)
+
+    contracts = CompactContractArtifacts(artifacts_path)
+
+    assert contracts.index['Library13']['abi'] == contracts.index['Multiply13']['abi']
+    assert len(contracts._abi_locations) == 2
+
+
+def test_compact_artifacts_abis_are_not_shared(project_dir):
+    artifacts_path = get_compact_artifacts_file_path(project_dir)
+    write_compact_artifacts(artifacts_path, COMPILED_SOURCES)
+
+    contracts = CompactContractArtifacts(artifacts_path)
+    contracts['Library13']['abi'].append({'type': 'fallback'})
+
+    assert contracts['Library13']['abi'] is not contracts['Multiply13']['abi']
+    assert contracts['Multiply13']['abi'] == ABI
@@ -0,0 +1,96 @@
+import os
+
+from populus import compilation
+from populus.compilation import (
+    compile_sources,
+)
+from populus.utils.compile_cache import (
+    CompilationCache,
+)
+from populus.utils.filesystem import (
+    get_compile_cache_dir,
+)
+
+
+COMPILED_SOURCES = {
+    'Math': {
+        'abi': [],
+        'code': '0x6060',
+        'code_runtime': '0x6060',
+    },
+}
+
+
+def test_cache_round_trip(project_dir, write_project_file):
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+    cache = CompilationCache(get_compile_cache_dir(project_dir))
+
+    cache_key = cache.get_cache_key(['contracts/Math.sol'], '0.4.2', {'optimize': True})
+
+    assert cache.get(cache_key) is None
+    cache.set(cache_key, COMPILED_SOURCES)
+    assert cache_key in cache
+    assert cache.get(cache_key) == COMPILED_SOURCES
+
+
+def test_cache_key_changes_with_inputs(project_dir, write_project_file):
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+    cache = CompilationCache(get_compile_cache_dir(project_dir))
+
+    base_key = cache.get_cache_key(['contracts/Math.sol'], '0.4.2', {'optimize': True})
+
+    assert base_key == cache.get_cache_key(
+        ['contracts/Math.sol'], '0.4.2', {'optimize': True},
+    )
+    assert base_key != cache.get_cache_key(
+        ['contracts/Math.sol'], '0.4.1', {'optimize': True},
+    )
+    assert base_key != cache.get_cache_key(
+        ['contracts/Math.sol'], '0.4.2', {'optimize': False},
+    )
+
+    write_project_file('contracts/Math.sol', 'contract Math { uint x; }')
+    assert base_key != cache.get_cache_key(
+        ['contracts/Math.sol'], '0.4.2', {'optimize': True},
+    )
+
+
+def test_cache_evicts_least_recently_used(project_dir):
+    cache = CompilationCache(get_compile_cache_dir(project_dir), max_size=0)
+
+    cache.set('a' * 64, COMPILED_SOURCES)
+
+    assert 'a' * 64 not in cache
+    assert not os.listdir(cache.cache_dir)
+
+
+class FakeToolchain(object):
+    version = '0.4.2'
+    binary_path = '/usr/local/bin/solc'
+
+
+def test_changing_an_import_invalidates_cached_output(project_dir,
+                                                      write_project_file,
+                                                      monkeypatch):
+    write_project_file('contracts/Math.sol', 'import "./Base.sol"; contract Math is Base {}')
+    write_project_file('contracts/Base.sol', 'contract Base {}')
+
+    compile_calls = []
+
+    def compile_files(source_paths, **compiler_kwargs):
+        assert compiler_kwargs['solc_binary'] == FakeToolchain.binary_path
+        compile_calls.append(source_paths)
+        return COMPILED_SOURCES
+
+    monkeypatch.setattr(compilation, 'compile_files', compile_files)
+    monkeypatch.setattr(compilation, 'get_solc_toolchain', lambda: FakeToolchain)
+    cache = CompilationCache(get_compile_cache_dir(project_dir))
+
+    compile_sources(['contracts/Math.sol'], compilation_cache=cache)
+    compile_sources(['contracts/Math.sol'], compilation_cache=cache)
+    assert len(compile_calls) == 1
+
+    write_project_file('contracts/Base.sol', 'contract Base { uint x; }')
+
+    compile_sources(['contracts/Math.sol'], compilation_cache=cache)
+    assert len(compile_calls) == 2
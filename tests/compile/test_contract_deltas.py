@@ -0,0 +1,71 @@
+from populus.compilation import (
+    build_source_manifest,
+    update_source_manifest,
+    get_contract_deltas,
+    ContractDelta,
+)
+
+
+PREVIOUS_COMPILED_SOURCES = {
+    'Math': {'abi': [], 'code': '0x6060', 'code_runtime': '0x6060'},
+    'Token': {'abi': [], 'code': '0x6061', 'code_runtime': '0x6061'},
+    'Wallet': {'abi': [], 'code': '0x6062', 'code_runtime': '0x6062'},
+}
+
+
+def test_contract_deltas():
+    compiled_sources = {
+        'Math': PREVIOUS_COMPILED_SOURCES['Math'],
+        'Token': dict(PREVIOUS_COMPILED_SOURCES['Token'], code='0x6063'),
+        'Escrow': {'abi': [], 'code': '0x6064', 'code_runtime': '0x6064'},
+    }
+
+    assert get_contract_deltas(PREVIOUS_COMPILED_SOURCES, compiled_sources) == {
+        'Token': ContractDelta('changed', False, True),
+        'Wallet': ContractDelta('removed', True, True),
+        'Escrow': ContractDelta('added', True, True),
+    }
+
+
+def test_contract_deltas_only_compare_given_contracts():
+    compiled_sources = {
+        'Math': dict(PREVIOUS_COMPILED_SOURCES['Math'], abi=[{'type': 'fallback'}]),
+        'Token': dict(PREVIOUS_COMPILED_SOURCES['Token'], code='0x6063'),
+        'Wallet': PREVIOUS_COMPILED_SOURCES['Wallet'],
+    }
+
+    assert get_contract_deltas(
+        PREVIOUS_COMPILED_SOURCES,
+        compiled_sources,
+        {'Math'},
+    ) == {
+        'Math': ContractDelta('changed', True, False),
+    }
+
+
+def test_update_source_manifest_only_reads_changed_sources(project_dir,
+                                                            write_project_file):
+    write_project_file('contracts/A.sol', 'import "./B.sol"; contract A is B {}')
+    write_project_file('contracts/B.sol', 'contract B {}')
+    source_paths = ['contracts/A.sol', 'contracts/B.sol']
+
+    source_manifest = build_source_manifest(source_paths, '0.4.2', {})
+
+    write_project_file('contracts/A.sol', 'contract A {}')
+    write_project_file('contracts/B.sol', 'contract B { uint x; }')
+
+    next_source_manifest = update_source_manifest(
+        source_manifest,
+        source_paths,
+        {'contracts/B.sol'},
+        '0.4.2',
+        {},
+    )
+
+    # A.sol was not reported as changed so its previous entry is kept.
+    assert next_source_manifest['sources']['contracts/A.sol'] == (
+        source_manifest['sources']['contracts/A.sol']
+    )
+    assert next_source_manifest['sources']['contracts/B.sol'] == (
+        build_source_manifest(source_paths, '0.4.2', {})['sources']['contracts/B.sol']
+    )
@@ -0,0 +1,97 @@
+import textwrap
+
+from populus.utils.sources import (
+    find_solidity_imports,
+    find_solidity_declarations,
+    get_import_graph,
+    get_transitive_importers,
+    get_transitive_imports,
+    get_connected_components,
+)
+
+
+SOURCE = textwrap.dedent(("""
+    import "contracts/A.sol";
+    import './B.sol';
+    import * as c from "./C.sol";
+    import {D, E as F} from "../lib/D.sol";
+    // import "contracts/Commented.sol";
+    /*
+    import "contracts/AlsoCommented.sol";
+    */
+
+    library MathLib {}
+    contract Thing is owned {}
+    interface IThing {}
+"""))
+
+
+def test_find_solidity_imports():
+    assert find_solidity_imports(SOURCE) == [
+        'contracts/A.sol',
+        './B.sol',
+        './C.sol',
+        '../lib/D.sol',
+    ]
+
+
+def test_find_solidity_declarations():
+    assert find_solidity_declarations(SOURCE) == {'MathLib', 'Thing', 'IThing'}
+
+
+def test_import_graph(project_dir, write_project_file):
+    write_project_file('contracts/A.sol', 'import "./B.sol"; contract A is B {}')
+    write_project_file('contracts/B.sol', 'import "contracts/C.sol"; contract B is C {}')
+    write_project_file('contracts/C.sol', 'contract C {}')
+    write_project_file('contracts/D.sol', 'contract D {}')
+
+    import_graph = get_import_graph([
+        'contracts/A.sol',
+        'contracts/B.sol',
+        'contracts/C.sol',
+        'contracts/D.sol',
+    ])
+
+    assert import_graph == {
+        'contracts/A.sol': {'contracts/B.sol'},
+        'contracts/B.sol': {'contracts/C.sol'},
+        'contracts/C.sol': set(),
+        'contracts/D.sol': set(),
+    }
+
+    assert get_transitive_importers(import_graph, ['contracts/C.sol']) == {
+        'contracts/A.sol',
+        'contracts/B.sol',
+        'contracts/C.sol',
+    }
+    assert get_transitive_imports(import_graph, ['contracts/B.sol']) == {
+        'contracts/B.sol',
+        'contracts/C.sol',
+    }
+    assert get_transitive_importers(import_graph, ['contracts/D.sol']) == {
+        'contracts/D.sol',
+    }
+
+
+def test_connected_components():
+    import_graph = {
+        'contracts/A.sol': {'contracts/C.sol'},
+        'contracts/B.sol': {'contracts/C.sol'},
+        'contracts/C.sol': set(),
+        'contracts/D.sol': set(),
+        'contracts/E.sol': {'contracts/F.sol'},
+        'contracts/F.sol': set(),
+    }
+
+    components = get_connected_components(import_graph, [
+        'contracts/A.sol',
+        'contracts/B.sol',
+        'contracts/D.sol',
+        'contracts/F.sol',
+    ])
+
+    assert components == [
+        ('contracts/A.sol', 'contracts/B.sol'),
+        ('contracts/D.sol',),
+        ('contracts/F.sol',),
+    ]
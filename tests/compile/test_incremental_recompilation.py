@@ -0,0 +1,62 @@
+from populus.compilation import (
+    build_source_manifest,
+    get_source_paths_to_recompile,
+)
+
+
+SOURCE_PATHS = [
+    'contracts/A.sol',
+    'contracts/B.sol',
+    'contracts/C.sol',
+    'contracts/D.sol',
+]
+
+
+def write_sources(write_project_file, c_source='contract C {}'):
+    write_project_file('contracts/A.sol', 'import "./B.sol"; contract A is B {}')
+    write_project_file('contracts/B.sol', 'import "./C.sol"; contract B is C {}')
+    write_project_file('contracts/C.sol', c_source)
+    write_project_file('contracts/D.sol', 'contract D {}')
+
+
+def test_no_previous_manifest_recompiles_everything(project_dir, write_project_file):
+    write_sources(write_project_file)
+    manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {})
+
+    to_compile, removed = get_source_paths_to_recompile(None, manifest)
+
+    assert to_compile == set(SOURCE_PATHS)
+    assert removed == set()
+
+
+def test_leaf_change_recompiles_importers(project_dir, write_project_file):
+    write_sources(write_project_file)
+    previous_manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {})
+
+    write_sources(write_project_file, 'contract C { uint x; }')
+    manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {})
+
+    to_compile, removed = get_source_paths_to_recompile(previous_manifest, manifest)
+
+    assert to_compile == {'contracts/A.sol', 'contracts/B.sol', 'contracts/C.sol'}
+    assert removed == set()
+
+
+def test_unchanged_sources_recompile_nothing(project_dir, write_project_file):
+    write_sources(write_project_file)
+    previous_manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {})
+    manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {})
+
+    to_compile, removed = get_source_paths_to_recompile(previous_manifest, manifest)
+
+    assert to_compile == set()
+
+
+def test_compiler_change_recompiles_everything(project_dir, write_project_file):
+    write_sources(write_project_file)
+    previous_manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {})
+    manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {'optimize': True})
+
+    to_compile, _ = get_source_paths_to_recompile(previous_manifest, manifest)
+
+    assert to_compile == set(SOURCE_PATHS)
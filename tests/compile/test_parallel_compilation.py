@@ -0,0 +1,33 @@
+from populus.utils.filesystem import DEFAULT_CONTRACTS_DIR
+from populus.compilation import (
+    compile_project_contracts,
+)
+
+
+CONTRACT_SOURCES = (
+    ('contracts/owned.sol', 'contract owned { address owner; function owned() { owner = msg.sender; }}'),
+    ('contracts/mortal.sol', 'import "./owned.sol"; contract mortal is owned { function kill() { suicide(msg.sender); }}'),
+    ('contracts/Math.sol', 'library Math { function add(uint a, uint b) returns (uint) { return a + b; }}'),
+    ('contracts/Greeter.sol', 'contract Greeter { function greet() returns (uint) { return 1; }}'),
+)
+
+
+def test_parallel_compilation_matches_serial(project_dir, write_project_file):
+    for filename, source in CONTRACT_SOURCES:
+        write_project_file(filename, source)
+
+    _, serial_sources = compile_project_contracts(
+        project_dir,
+        DEFAULT_CONTRACTS_DIR,
+        use_cache=False,
+        jobs=1,
+    )
+    _, parallel_sources = compile_project_contracts(
+        project_dir,
+        DEFAULT_CONTRACTS_DIR,
+        use_cache=False,
+        jobs=4,
+    )
+
+    assert set(parallel_sources.keys()) == {'owned', 'mortal', 'Math', 'Greeter'}
+    assert parallel_sources == serial_sources
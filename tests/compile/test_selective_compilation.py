@@ -0,0 +1,66 @@
+import pytest
+
+from populus.utils.filesystem import DEFAULT_CONTRACTS_DIR
+from populus.compilation import (
+    build_project_contracts,
+    build_source_manifest,
+    parse_contract_selector,
+    resolve_contract_selectors,
+)
+
+
+CONTRACT_SOURCES = (
+    ('contracts/owned.sol', 'contract owned { address owner; function owned() { owner = msg.sender; }}'),
+    ('contracts/mortal.sol', 'import "./owned.sol"; contract mortal is owned { function kill() { suicide(msg.sender); }}'),
+    ('contracts/Math.sol', 'library Math { function add(uint a, uint b) returns (uint) { return a + b; }}'),
+    ('contracts/Greeter.sol', 'contract Greeter { function greet() returns (uint) { return 1; }}'),
+)
+
+SOURCE_PATHS = [filename for filename, _ in CONTRACT_SOURCES]
+
+
+@pytest.mark.parametrize(
+    'selector,expected',
+    (
+        ('Greeter', (None, 'Greeter')),
+        ('contracts/Greeter.sol', ('contracts/Greeter.sol', None)),
+        ('contracts/Greeter.sol:Greeter', ('contracts/Greeter.sol', 'Greeter')),
+    ),
+)
+def test_parse_contract_selector(selector, expected):
+    assert parse_contract_selector(selector) == expected
+
+
+def test_resolve_contract_selectors(project_dir, write_project_file):
+    for filename, source in CONTRACT_SOURCES:
+        write_project_file(filename, source)
+
+    source_manifest = build_source_manifest(SOURCE_PATHS, '0.4.2', {})
+
+    assert resolve_contract_selectors(source_manifest, ['mortal', 'contracts/Math.sol']) == {
+        'contracts/mortal.sol',
+        'contracts/Math.sol',
+    }
+
+    with pytest.raises(ValueError):
+        resolve_contract_selectors(source_manifest, ['Unknown'])
+
+    with pytest.raises(ValueError):
+        resolve_contract_selectors(source_manifest, ['contracts/Math.sol:Greeter'])
+
+
+def test_selective_build_merges_into_existing_artifacts(project_dir, write_project_file):
+    for filename, source in CONTRACT_SOURCES:
+        write_project_file(filename, source)
+
+    build_project_contracts(project_dir, DEFAULT_CONTRACTS_DIR, selectors=['Greeter'])
+
+    result = build_project_contracts(
+        project_dir,
+        DEFAULT_CONTRACTS_DIR,
+        selectors=['contracts/mortal.sol:mortal'],
+    )
+
+    assert result.contract_source_paths == ('contracts/mortal.sol', 'contracts/owned.sol')
+    assert result.recompiled_source_paths == ('contracts/mortal.sol', 'contracts/owned.sol')
+    assert set(result.compiled_sources.keys()) == {'Greeter', 'mortal', 'owned'}
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from populus.utils.artifacts import (
+    write_contract_artifacts,
+    get_contract_artifact_path,
+    LazyContractArtifacts,
+)
+from populus.utils.filesystem import (
+    get_contract_artifacts_dir,
+)
+
+
+COMPILED_SOURCES = {
+    'Library13': {
+        'abi': [],
+        'code': '0x6060',
+        'code_runtime': '0x6060',
+    },
+    'Multiply13': {
+        'abi': [],
+        'code': '0x606073__Library13_____________________________6060',
+        'code_runtime': '0x6060',
+    },
+}
+
+
+def test_split_artifacts_are_loaded_lazily(project_dir):
+    artifacts_dir = get_contract_artifacts_dir(project_dir)
+    write_contract_artifacts(artifacts_dir, COMPILED_SOURCES)
+
+    contracts = LazyContractArtifacts(artifacts_dir)
+
+    assert set(contracts.keys()) == {'Library13', 'Multiply13'}
+    assert len(contracts) == 2
+    assert 'Library13' in contracts
+    assert contracts.get_link_references('Multiply13') == {'Library13'}
+    assert not contracts.is_loaded('Library13')
+    assert not contracts.is_loaded('Multiply13')
+
+    assert contracts['Library13'] == COMPILED_SOURCES['Library13']
+
+    assert contracts.is_loaded('Library13')
+    assert not contracts.is_loaded('Multiply13')
+
+
+def test_split_artifacts_remove_stale_contracts(project_dir):
+    artifacts_dir = get_contract_artifacts_dir(project_dir)
+    write_contract_artifacts(artifacts_dir, COMPILED_SOURCES)
+    write_contract_artifacts(artifacts_dir, {
+        'Library13': COMPILED_SOURCES['Library13'],
+    })
+
+    contracts = LazyContractArtifacts(artifacts_dir)
+
+    assert set(contracts.keys()) == {'Library13'}
+    assert not os.path.exists(get_contract_artifact_path(artifacts_dir, 'Multiply13'))
+
+
+def test_split_artifacts_are_checked_against_the_index(project_dir):
+    artifacts_dir = get_contract_artifacts_dir(project_dir)
+    write_contract_artifacts(artifacts_dir, COMPILED_SOURCES)
+
+    with open(get_contract_artifact_path(artifacts_dir, 'Library13'), 'w') as artifact_file:
+        artifact_file.write('{"abi": [], "code": "0x6061", "code_runtime": "0x6061"}')
+
+    contracts = LazyContractArtifacts(artifacts_dir)
+
+    with pytest.raises(ValueError):
+        contracts['Library13']
+    assert contracts['Multiply13'] == COMPILED_SOURCES['Multiply13']
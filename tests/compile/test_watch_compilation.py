@@ -0,0 +1,72 @@
+import pytest
+
+from populus.compilation import (
+    BuildResult,
+)
+from populus.project import Project
+from populus.utils import cli
+
+
+@pytest.fixture()
+def build_calls(project_dir, write_project_file, monkeypatch):
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+    write_project_file('contracts/Other.sol', 'contract Other {}')
+
+    build_calls = []
+
+    class FakeDirWatcher(object):
+        batches = 0
+
+        def __init__(self, root, debounce=None):
+            pass
+
+        def get_batch(self):
+            self.batches += 1
+            if self.batches > 1:
+                raise KeyboardInterrupt
+            write_project_file('contracts/Math.sol', 'contract Math { uint x; }')
+
+        def stop(self):
+            pass
+
+    def build_project_contracts(project_dir, contracts_dir, **kwargs):
+        build_calls.append(kwargs)
+        return BuildResult(
+            contract_source_paths=(),
+            compiled_sources={},
+            output_file_path=None,
+            changed_contract_names=set(),
+            source_manifest=None,
+            recompiled_source_paths=(),
+            contract_deltas={},
+        )
+
+    monkeypatch.setattr(cli, 'DirWatcher', FakeDirWatcher)
+    monkeypatch.setattr(cli, 'build_project_contracts', build_project_contracts)
+    return build_calls
+
+
+def test_watch_recompiles_changed_sources(project_dir, build_calls):
+    cli.watch_project_contracts(Project())
+
+    assert len(build_calls) == 1
+    assert build_calls[0]['changed_source_paths'] == {'contracts/Math.sol'}
+    assert build_calls[0]['selectors'] is None
+
+
+def test_watch_compiles_in_a_single_process(project_dir,
+                                            write_project_file,
+                                            build_calls):
+    write_project_file('populus.ini', '[populus]\ncompile_jobs=4')
+
+    cli.watch_project_contracts(Project())
+
+    assert len(build_calls) == 1
+    assert build_calls[0]['jobs'] == 1
+
+
+def test_watch_applies_contract_selectors(project_dir, build_calls):
+    cli.watch_project_contracts(Project(), selectors=('Math',))
+
+    assert len(build_calls) == 1
+    assert build_calls[0]['selectors'] == ('Math',)
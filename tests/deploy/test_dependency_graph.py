@@ -0,0 +1,92 @@
+import pytest
+
+from populus.utils.contracts import (
+    DependencyGraph,
+    get_recursive_contract_dependencies,
+)
+
+
+def make_contract_data(*library_names):
+    return {
+        'code': '0x6060',
+        'link_references': {
+            'code': {library_name: [] for library_name in library_names},
+        },
+    }
+
+
+#
+# A -> (B, C)
+# B -> null
+# C -> (E,)
+# D -> (B, E)
+# E -> (B,)
+#
+CONTRACTS = {
+    'A': make_contract_data('B', 'C'),
+    'B': make_contract_data(),
+    'C': make_contract_data('E'),
+    'D': make_contract_data('B', 'E'),
+    'E': make_contract_data('B'),
+}
+
+
+@pytest.fixture()
+def dependency_graph():
+    return DependencyGraph(CONTRACTS)
+
+
+def test_dependency_graph_dependencies(dependency_graph):
+    assert dependency_graph.get_dependencies('A') == {'B', 'C', 'E'}
+    assert dependency_graph.get_dependencies('A', recursive=False) == {'B', 'C'}
+    assert dependency_graph.get_dependencies('B') == set()
+
+
+def test_dependency_graph_dependents(dependency_graph):
+    assert dependency_graph.get_dependents('B') == {'A', 'C', 'D', 'E'}
+    assert dependency_graph.get_dependents('E', recursive=False) == {'C', 'D'}
+    assert dependency_graph.get_dependents('E') == {'A', 'C', 'D'}
+    assert dependency_graph.get_dependents('A') == set()
+
+
+def test_dependency_graph_levels(dependency_graph):
+    assert dependency_graph.levels == (
+        {'B'},
+        {'E'},
+        {'C', 'D'},
+        {'A'},
+    )
+    assert dependency_graph.deploy_order == ('B', 'E', 'C', 'D', 'A')
+
+
+def test_dependency_graph_deploy_levels(dependency_graph):
+    assert dependency_graph.get_deploy_levels(['A']) == [['B'], ['E'], ['C'], ['A']]
+    assert dependency_graph.get_deploy_levels(['C', 'D']) == [['B'], ['E'], ['C', 'D']]
+    assert dependency_graph.get_deploy_order(['D']) == ['B', 'E', 'D']
+
+
+def test_dependency_graph_unknown_library():
+    dependency_graph = DependencyGraph({'A': make_contract_data('Missing')})
+
+    assert dependency_graph.get_dependencies('A') == {'Missing'}
+    with pytest.raises(ValueError):
+        dependency_graph.get_deploy_order(['A'])
+
+
+def test_recursive_dependencies_are_memoized():
+    # Each layer depends on both contracts in the layer below it, which is
+    # exponential to walk without memoization.
+    depth = 64
+    graph = {'L0-a': set(), 'L0-b': set()}
+    for layer in range(1, depth):
+        for side in 'ab':
+            graph['L{0}-{1}'.format(layer, side)] = {
+                'L{0}-a'.format(layer - 1),
+                'L{0}-b'.format(layer - 1),
+            }
+
+    memo = {}
+    dependencies = get_recursive_contract_dependencies('L63-a', graph, memo)
+
+    assert len(dependencies) == 2 * (depth - 1)
+    assert memo['L1-a'] == {'L0-a', 'L0-b'}
@@ -0,0 +1,114 @@
+import pytest
+
+from populus.utils.contracts import (
+    find_link_offsets,
+    get_linked_bytecode,
+    link_bytecode,
+    linked_bytecode_cache,
+    make_link_placeholder,
+    _link_offsets_cache,
+)
+
+
+LONG_NAME = 'LongerThan40Characters1234567890123456789012345678901234567890'
+
+ADDRESS_A = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+ADDRESS_B = '0x0000000000000000000000000000000000000001'
+ADDRESS_C = '0xabcdefabcdefabcdefabcdefabcdefabcdefabcd'
+
+
+def make_code(*names):
+    return '0x6060' + '73'.join(
+        make_link_placeholder(name) for name in names
+    ) + '6060'
+
+
+@pytest.mark.parametrize(
+    'name,expected',
+    (
+        ('A', '__A_____________________________________'),
+        ('_StartsWithUnderscore', '___StartsWithUnderscore_________________'),
+        (LONG_NAME, '__LongerThan40Characters12345678901234__'),
+    ),
+)
+def test_make_link_placeholder(name, expected):
+    assert make_link_placeholder(name) == expected
+
+
+def test_find_link_offsets():
+    code = make_code('A', 'B', 'A')
+
+    link_offsets = find_link_offsets(code)
+
+    assert [placeholder for _, _, placeholder in link_offsets] == [
+        make_link_placeholder('A'),
+        make_link_placeholder('B'),
+        make_link_placeholder('A'),
+    ]
+    for start, end, placeholder in link_offsets:
+        assert code[start:end] == placeholder
+
+
+def test_link_bytecode_multiple_libraries():
+    code = make_code('A', 'Has_Underscores_In_The_Name', 'A')
+
+    linked_code = link_bytecode(
+        code,
+        A=ADDRESS_A,
+        Has_Underscores_In_The_Name=ADDRESS_B,
+    )
+
+    assert linked_code == '0x6060' + '73'.join((
+        ADDRESS_A[2:],
+        ADDRESS_B[2:],
+        ADDRESS_A[2:],
+    )) + '6060'
+
+
+def test_link_bytecode_with_truncated_name():
+    code = make_code(LONG_NAME)
+
+    assert link_bytecode(code, **{LONG_NAME: ADDRESS_C}) == '0x6060' + ADDRESS_C[2:] + '6060'
+    assert link_bytecode(code, **{LONG_NAME[:36]: ADDRESS_C}) == '0x6060' + ADDRESS_C[2:] + '6060'
+
+
+def test_link_bytecode_leaves_unknown_references():
+    code = make_code('A', 'B')
+
+    linked_code = link_bytecode(code, A=ADDRESS_A)
+
+    assert linked_code == '0x6060' + ADDRESS_A[2:] + '73' + make_link_placeholder('B') + '6060'
+
+
+def test_link_bytecode_same_code_different_addresses():
+    code = make_code('A')
+
+    assert link_bytecode(code, A=ADDRESS_A) == '0x6060' + ADDRESS_A[2:] + '6060'
+    assert link_bytecode(code, A=ADDRESS_C) == '0x6060' + ADDRESS_C[2:] + '6060'
+    assert link_bytecode(code) == code
+
+
+@pytest.mark.parametrize('bytecode', (None, ''))
+def test_link_bytecode_without_bytecode(bytecode):
+    assert link_bytecode(bytecode, A=ADDRESS_A) == bytecode
+    assert link_bytecode(bytecode) == bytecode
+
+
+def test_link_bytecode_without_dependencies_does_not_scan():
+    code = make_code('A') + '60'
+
+    assert link_bytecode(code) == code
+    assert code not in _link_offsets_cache
+
+
+def test_get_linked_bytecode_is_cached():
+    code = make_code('A')
+    linked_bytecode_cache.clear()
+    linked_bytecode_cache.reset_stats()
+
+    assert get_linked_bytecode(code, None, {'A': ADDRESS_A}) == '0x6060' + ADDRESS_A[2:] + '6060'
+    assert get_linked_bytecode(code, None, {'A': ADDRESS_A}) == '0x6060' + ADDRESS_A[2:] + '6060'
+    assert get_linked_bytecode(code, {'A': [6]}, {'A': ADDRESS_C}) == '0x6060' + ADDRESS_C[2:] + '6060'
+
+    assert linked_bytecode_cache.hits == 1
+    assert linked_bytecode_cache.misses == 2
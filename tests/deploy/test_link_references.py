@@ -0,0 +1,89 @@
+from populus.utils.contracts import (
+    add_link_references,
+    find_library_link_offsets,
+    get_shallow_dependency_graph,
+    link_bytecode_at_offsets,
+    make_link_placeholder,
+)
+
+
+LONG_NAME = 'LongerThan40Characters1234567890123456789012345678901234567890'
+
+ADDRESS = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+
+COMPILED_CONTRACTS = {
+    'Library13': {
+        'code': '0x6060',
+        'code_runtime': '0x6060',
+    },
+    LONG_NAME: {
+        'code': '0x6060',
+        'code_runtime': '0x6060',
+    },
+    'Multiply13': {
+        'code': '0x6060' + make_link_placeholder('Library13') + '73' + make_link_placeholder(LONG_NAME),
+        'code_runtime': '0x6060' + make_link_placeholder(LONG_NAME),
+    },
+}
+
+
+def test_find_library_link_offsets_expands_truncated_names():
+    code = COMPILED_CONTRACTS['Multiply13']['code']
+
+    assert find_library_link_offsets(code, COMPILED_CONTRACTS.keys()) == {
+        'Library13': [6],
+        LONG_NAME: [48],
+    }
+
+
+def test_add_link_references():
+    compiled_contracts = add_link_references(COMPILED_CONTRACTS)
+
+    assert compiled_contracts['Library13']['link_references'] == {
+        'code': {},
+        'code_runtime': {},
+    }
+    assert compiled_contracts['Multiply13']['link_references'] == {
+        'code': {'Library13': [6], LONG_NAME: [48]},
+        'code_runtime': {LONG_NAME: [6]},
+    }
+    assert 'link_references' not in COMPILED_CONTRACTS['Multiply13']
+
+
+def test_shallow_dependency_graph_uses_link_references():
+    compiled_contracts = {
+        'Library13': {
+            'code': '0x6060',
+            'link_references': {'code': {}},
+        },
+        'Multiply13': {
+            # The stored link references are trusted over the bytecode.
+            'code': '0x6060',
+            'link_references': {'code': {'Library13': [6]}},
+        },
+    }
+
+    assert get_shallow_dependency_graph(compiled_contracts) == {
+        'Library13': set(),
+        'Multiply13': {'Library13'},
+    }
+
+
+def test_link_bytecode_at_offsets():
+    code = COMPILED_CONTRACTS['Multiply13']['code']
+
+    linked_code = link_bytecode_at_offsets(
+        code,
+        {'Library13': [6], LONG_NAME: [48]},
+        **{'Library13': ADDRESS, LONG_NAME: ADDRESS}
+    )
+
+    assert linked_code == '0x6060' + ADDRESS[2:] + '73' + ADDRESS[2:]
+
+
+def test_link_bytecode_at_offsets_with_stale_offsets():
+    code = COMPILED_CONTRACTS['Multiply13']['code_runtime']
+
+    linked_code = link_bytecode_at_offsets(code, {LONG_NAME: [0]}, **{LONG_NAME: ADDRESS})
+
+    assert linked_code == '0x6060' + ADDRESS[2:]
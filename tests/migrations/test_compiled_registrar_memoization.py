@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from populus.migrations import registrar
+from populus.utils.filesystem import (
+    get_compile_cache_dir,
+)
+
+
+@pytest.fixture()
+def compile_calls(monkeypatch):
+    compile_calls = []
+
+    def compile_registrar_contract(version, project_dir=None):
+        compile_calls.append(version)
+        return {'abi': [], 'code': '0x', 'code_runtime': '0x'}
+
+    monkeypatch.setattr(registrar, '_registrar_contract_data', {})
+    monkeypatch.setattr(registrar, 'compile_registrar_contract', compile_registrar_contract)
+    monkeypatch.setattr(registrar, 'get_solc_major_minor_version', lambda: ('0', '4'))
+    return compile_calls
+
+
+def test_compiled_registrar_is_memoized(monkeypatch, compile_calls):
+    monkeypatch.setattr(
+        registrar,
+        'get_prebuilt_registrar_artifact_path',
+        lambda version: '/does-not-exist/Registrar.json',
+    )
+
+    first = registrar.get_compiled_registrar_contract()
+    second = registrar.get_compiled_registrar_contract()
+
+    assert first is second
+    assert compile_calls == [('0', '4')]
+
+
+def test_compiled_registrar_is_loaded_from_prebuilt_artifact(tmpdir,
+                                                             monkeypatch,
+                                                             compile_calls):
+    contract_data = {'abi': [], 'code': '0x6060', 'code_runtime': '0x60'}
+    artifact_paths = []
+
+    def get_prebuilt_registrar_artifact_path(version):
+        artifact_path = str(tmpdir.join('Registrar-{0}.{1}.json'.format(*version)))
+        artifact_paths.append(artifact_path)
+        return artifact_path
+
+    with open(str(tmpdir.join('Registrar-0.4.json')), 'w') as artifact_file:
+        json.dump(contract_data, artifact_file)
+
+    monkeypatch.setattr(
+        registrar,
+        'get_prebuilt_registrar_artifact_path',
+        get_prebuilt_registrar_artifact_path,
+    )
+
+    assert registrar.get_compiled_registrar_contract() == contract_data
+    assert artifact_paths == [str(tmpdir.join('Registrar-0.4.json'))]
+    assert compile_calls == []
+
+
+def test_registrar_compilation_is_cached_in_the_project_build_dir(project_dir,
+                                                                 monkeypatch):
+    cache_dirs = []
+
+    def compile_sources(source_paths, compilation_cache=None):
+        cache_dirs.append(compilation_cache.cache_dir)
+        return {'Registrar': {'abi': [], 'code': '0x', 'code_runtime': '0x'}}
+
+    monkeypatch.setattr(registrar, 'compile_sources', compile_sources)
+
+    registrar.compile_registrar_contract(('0', '4'), project_dir)
+
+    assert cache_dirs == [get_compile_cache_dir(project_dir)]
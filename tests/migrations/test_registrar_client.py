@@ -0,0 +1,173 @@
+import pytest
+
+from populus.migrations.registrar import RegistrarClient
+
+
+class FakeCaller(object):
+    def __init__(self, values, calls):
+        self.values = values
+        self.calls = calls
+
+    def exists(self, key):
+        self.calls.append(('exists', key))
+        return key in self.values
+
+    def getAddress(self, key):
+        self.calls.append(('getAddress', key))
+        return self.values[key]
+
+
+class FakeRegistrar(object):
+    def __init__(self):
+        self.values = {}
+        self.calls = []
+
+    def call(self):
+        return FakeCaller(self.values, self.calls)
+
+
+class FakeEth(object):
+    def __init__(self, calls):
+        self.calls = calls
+        self.block_number = 1
+        self.block_number_reads = 0
+
+    @property
+    def blockNumber(self):
+        self.block_number_reads += 1
+        return self.block_number
+
+    @blockNumber.setter
+    def blockNumber(self, value):
+        self.block_number = value
+
+    def getCode(self, address):
+        self.calls.append(('getCode', address))
+        return '0x6060'
+
+
+class FakeWeb3(object):
+    def __init__(self, calls):
+        self.eth = FakeEth(calls)
+
+
+@pytest.fixture()
+def registrar():
+    return FakeRegistrar()
+
+
+@pytest.fixture()
+def registrar_client(registrar):
+    return RegistrarClient(
+        FakeWeb3(registrar.calls),
+        registrar,
+        block_poll_interval=0,
+    )
+
+
+ADDRESS = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+
+
+def test_lookups_are_cached_within_a_block(registrar, registrar_client):
+    registrar.values['contract/Math'] = ADDRESS
+
+    for _ in range(3):
+        assert registrar_client.exists('contract/Math') is True
+        assert registrar_client.get_address('contract/Math') == ADDRESS
+        assert registrar_client.get_code(ADDRESS) == '0x6060'
+
+    assert registrar.calls == [
+        ('exists', 'contract/Math'),
+        ('getAddress', 'contract/Math'),
+        ('getCode', ADDRESS),
+    ]
+    assert registrar_client.misses == 3
+    assert registrar_client.hits == 6
+
+
+def test_new_block_invalidates_cache(registrar, registrar_client):
+    assert registrar_client.exists('contract/Math') is False
+
+    registrar.values['contract/Math'] = ADDRESS
+    assert registrar_client.exists('contract/Math') is False
+
+    registrar_client.web3.eth.blockNumber = 2
+    assert registrar_client.exists('contract/Math') is True
+
+
+def test_block_number_is_checked_on_every_lookup_by_default(registrar):
+    registrar_client = RegistrarClient(
+        FakeWeb3(registrar.calls),
+        registrar,
+    )
+    assert registrar_client.exists('contract/Math') is False
+
+    registrar.values['contract/Math'] = ADDRESS
+    registrar_client.web3.eth.blockNumber = 2
+    assert registrar_client.exists('contract/Math') is True
+
+
+def test_block_number_is_polled_at_most_once_per_interval(registrar,
+                                                          registrar_client):
+    registrar_client.block_poll_interval = 60
+
+    assert registrar_client.exists('contract/Math') is False
+
+    registrar.values['contract/Math'] = ADDRESS
+    registrar_client.web3.eth.blockNumber = 2
+    assert registrar_client.exists('contract/Math') is False
+
+
+def test_block_number_is_read_once_per_block_scope(registrar, registrar_client):
+    registrar.values['contract/Math'] = ADDRESS
+    eth = registrar_client.web3.eth
+
+    with registrar_client.at_block():
+        assert registrar_client.exists('contract/Math') is True
+        with registrar_client.at_block():
+            assert registrar_client.get_address('contract/Math') == ADDRESS
+        assert registrar_client.get_code(ADDRESS) == '0x6060'
+
+        eth.blockNumber = 2
+        assert registrar_client.exists('contract/Math') is True
+
+    assert eth.block_number_reads == 1
+
+    registrar.values.pop('contract/Math')
+    assert registrar_client.exists('contract/Math') is False
+    assert eth.block_number_reads == 2
+
+
+def test_invalidating_everything_unpins_the_block(registrar, registrar_client):
+    eth = registrar_client.web3.eth
+
+    with registrar_client.at_block():
+        assert registrar_client.exists('contract/Math') is False
+
+        registrar.values['contract/Math'] = ADDRESS
+        eth.blockNumber = 2
+        registrar_client.invalidate()
+        assert registrar_client.exists('contract/Math') is True
+        assert registrar_client.exists('contract/Math') is True
+
+    assert eth.block_number_reads == 2
+
+
+def test_invalidating_a_key(registrar, registrar_client):
+    assert registrar_client.exists('contract/Math') is False
+    assert registrar_client.exists('contract/Other') is False
+
+    registrar.values['contract/Math'] = ADDRESS
+    registrar.values['contract/Other'] = ADDRESS
+    registrar_client.invalidate('contract/Math')
+
+    assert registrar_client.exists('contract/Math') is True
+    assert registrar_client.exists('contract/Other') is False
+
+    registrar_client.invalidate()
+    assert registrar_client.exists('contract/Other') is True
+
+
+def test_unknown_getter(registrar_client):
+    with pytest.raises(ValueError):
+        registrar_client.call('setAddress', 'contract/Math')
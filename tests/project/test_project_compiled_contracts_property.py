@@ -1,6 +1,15 @@
+import os
+
 import pytest
 
 from populus.project import Project
+from populus.utils.artifacts import (
+    write_compact_artifacts,
+    CompactContractArtifacts,
+)
+from populus.utils.filesystem import (
+    get_compact_artifacts_file_path,
+)
 
 
 def test_project_compiled_contracts_with_no_default_env(project_dir,
@@ -35,3 +44,153 @@ def test_project_fill_contracts_cache(write_project_file,
     # fill with code from the past -> recompilation
     project.fill_contracts_cache(project.compiled_contracts, source_mtime - 10)
     assert not id(project.compiled_contracts) == compiled_contracts_object_id
+
+
+def test_project_compiled_contracts_stale_when_source_removed(project_dir,
+                                                              write_project_file,
+                                                              MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+    write_project_file('contracts/Other.sol', 'contract Other {}')
+
+    project = Project()
+    assert 'Other' in project.compiled_contracts
+    assert not project.compiled_contracts_stale()
+
+    os.remove(os.path.join(project_dir, 'contracts', 'Other.sol'))
+
+    assert project.compiled_contracts_stale()
+    assert 'Other' not in project.compiled_contracts
+    assert not project.compiled_contracts_stale()
+
+
+def test_project_compiled_contracts_stale_when_source_restored(project_dir,
+                                                               write_project_file,
+                                                               MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+    source_path = os.path.join(project_dir, 'contracts', 'Math.sol')
+    original_stat = os.stat(source_path)
+
+    project = Project()
+    assert 'Math' in project.compiled_contracts
+
+    # Restore a different version of the file with an older timestamp.
+    with open(source_path, 'w') as source_file:
+        source_file.write('contract Math {}')
+    os.utime(
+        source_path,
+        (original_stat.st_atime - 100, original_stat.st_mtime - 100),
+    )
+
+    assert project.compiled_contracts_stale()
+
+
+def test_project_fill_contracts_cache_with_digest(project_dir,
+                                                  write_project_file,
+                                                  MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+
+    project = Project()
+    compiled_contracts = project.compiled_contracts
+    source_digest = project.get_source_file_hash()
+
+    # A matching digest wins over a modification time from the past.
+    project.fill_contracts_cache(compiled_contracts, 0, source_digest)
+    assert not project.compiled_contracts_stale()
+
+    project.fill_contracts_cache(compiled_contracts, 0, 'not-the-digest')
+    assert project.compiled_contracts_stale()
+
+
+def test_project_compiled_contracts_read_twice_compiles_once(project_dir,
+                                                             write_project_file,
+                                                             monkeypatch,
+                                                             MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+
+    project = Project()
+    compiled_contracts = project.compiled_contracts
+
+    def recompile_project_contracts(*args, **kwargs):
+        assert False, "Should not recompile"
+
+    monkeypatch.setattr(
+        'populus.project.recompile_project_contracts',
+        recompile_project_contracts,
+    )
+
+    assert project.compiled_contracts is compiled_contracts
+
+
+def test_project_compiles_in_a_single_process(project_dir,
+                                              write_project_file,
+                                              monkeypatch):
+    write_project_file('populus.ini', '[populus]\ncompile_jobs=4')
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+
+    compile_jobs = []
+
+    def recompile_project_contracts(*args, **kwargs):
+        compile_jobs.append(kwargs['jobs'])
+        return (), {}, None, ()
+
+    monkeypatch.setattr(
+        'populus.project.recompile_project_contracts',
+        recompile_project_contracts,
+    )
+
+    project = Project()
+    assert project.compile_jobs == 4
+    assert project.compiled_contracts == {}
+    assert compile_jobs == [1]
+
+
+def test_project_closes_replaced_compact_artifacts(project_dir,
+                                                   write_project_file,
+                                                   monkeypatch):
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+    artifacts_path = get_compact_artifacts_file_path(project_dir)
+    write_compact_artifacts(artifacts_path, {
+        'Math': {'abi': [], 'code': '0x6060'},
+        'Other': {'abi': [], 'code': '0x6061'},
+    })
+    compact_artifacts = CompactContractArtifacts(artifacts_path)
+
+    def recompile_project_contracts(*args, **kwargs):
+        return (), {'Math': compact_artifacts['Math']}, None, ()
+
+    monkeypatch.setattr(
+        'populus.project.recompile_project_contracts',
+        recompile_project_contracts,
+    )
+
+    project = Project()
+    project.fill_contracts_cache(compact_artifacts, 0, 'stale-digest')
+    assert project.compiled_contracts == {'Math': {'abi': [], 'code': '0x6060'}}
+
+    with pytest.raises(ValueError):
+        compact_artifacts['Other']
+
+
+def test_project_json_format_does_not_start_from_previous_build(project_dir,
+                                                                write_project_file,
+                                                                monkeypatch):
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+
+    compiled_sources = []
+
+    def load_previous_build(*args, **kwargs):
+        assert False, "Should not load the previous build"
+
+    def recompile_project_contracts(*args, **kwargs):
+        compiled_sources.append(kwargs['compiled_sources'])
+        return (), {}, None, ()
+
+    monkeypatch.setattr('populus.project.load_previous_build', load_previous_build)
+    monkeypatch.setattr(
+        'populus.project.recompile_project_contracts',
+        recompile_project_contracts,
+    )
+
+    project = Project()
+    assert project.compiled_contracts == {}
+    assert compiled_sources == [None]
@@ -1,3 +1,5 @@
+import pytest
+
 from populus.migrations import (
     Migration,
     DeployContract,
@@ -5,9 +7,11 @@ from populus.migrations import (
 from populus.migrations.writer import (
     write_migration,
 )
-from populus.migrations.migration import (
-    get_migration_classes_for_execution,
+from populus.plugin import (
+    MigratedChainBase,
+    validate_chain_fixtures,
 )
+from populus import Project
 
 
 def test_migrated_chain_fixture(project_dir, write_project_file, request,
@@ -37,11 +41,170 @@ def test_migrated_chain_fixture(project_dir, write_project_file, request,
     project = request.getfuncargvalue('project')
     assert len(project.migrations) == 1
 
+    chain = request.getfuncargvalue('chain')
+
+    assert chain.registrar.call().exists('contract/Math')
+    assert chain.registrar.call().exists('migration/0001_initial')
+
+
+def test_unmigrated_chain_fixture(project_dir, write_project_file, request,
+                                  MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+    write_project_file('migrations/__init__.py')
+
+    class TestMigration(Migration):
+        migration_id = '0001_initial'
+        dependencies = []
+
+        operations = [
+            DeployContract('Math'),
+        ]
+
+        compiled_contracts = {
+            'Math': {
+                'code': MATH['code'],
+                'code_runtime': MATH['code_runtime'],
+                'abi': MATH['abi'],
+            },
+        }
+
+    with open('migrations/0001_initial.py', 'w') as migration_file:
+        write_migration(migration_file, TestMigration)
+
+    project = request.getfuncargvalue('project')
+    assert len(project.migrations) == 1
+
     unmigrated_chain = request.getfuncargvalue('unmigrated_chain')
 
     registrar = unmigrated_chain.registrar
     assert not registrar.call().exists('contract/Math')
+    assert not registrar.call().exists('migration/0001_initial')
 
-    chain = request.getfuncargvalue('chain')
 
-    assert registrar.call().exists('contract/Math')
+def test_migrated_chain_base_is_rebuilt_for_another_project(project_dir,
+                                                            write_project_file,
+                                                            tmpdir,
+                                                            monkeypatch,
+                                                            MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+    write_project_file('migrations/__init__.py')
+
+    class TestMigration(Migration):
+        migration_id = '0001_initial'
+        dependencies = []
+
+        operations = [
+            DeployContract('Math'),
+        ]
+
+        compiled_contracts = {
+            'Math': {
+                'code': MATH['code'],
+                'code_runtime': MATH['code_runtime'],
+                'abi': MATH['abi'],
+            },
+        }
+
+    with open('migrations/0001_initial.py', 'w') as migration_file:
+        write_migration(migration_file, TestMigration)
+
+    base = MigratedChainBase(Project())
+    try:
+        chain = base.get_chain()
+        assert chain.registrar.call().exists('migration/0001_initial')
+
+        other_project_dir = tmpdir.mkdir('other-project-dir')
+        other_project_dir.mkdir('contracts').join('Math.sol').write(MATH['source'])
+        monkeypatch.chdir(str(other_project_dir))
+
+        other_chain = base.get_chain()
+
+        assert other_chain is not chain
+        assert not other_chain.registrar.call().exists('migration/0001_initial')
+        assert base.get_chain() is other_chain
+    finally:
+        base.close()
+
+
+def test_migrated_chain_base_is_shared_between_snapshots(project_dir,
+                                                         write_project_file,
+                                                         MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+    write_project_file('migrations/__init__.py')
+
+    class TestMigration(Migration):
+        migration_id = '0001_initial'
+        dependencies = []
+
+        operations = [
+            DeployContract('Math'),
+        ]
+
+        compiled_contracts = {
+            'Math': {
+                'code': MATH['code'],
+                'code_runtime': MATH['code_runtime'],
+                'abi': MATH['abi'],
+            },
+        }
+
+    with open('migrations/0001_initial.py', 'w') as migration_file:
+        write_migration(migration_file, TestMigration)
+
+    base = MigratedChainBase(Project())
+    try:
+        chain = base.get_chain()
+        math = chain.get_contract('Math')
+        base_block_number = chain.web3.eth.blockNumber
+
+        snapshot_id = chain.snapshot()
+        chain.wait.for_receipt(math.transact().increment())
+        assert math.call().counter() == 1
+        chain.revert(snapshot_id)
+
+        assert base.get_chain() is chain
+        assert chain.web3.eth.blockNumber == base_block_number
+        assert chain.get_contract('Math').call().counter() == 0
+    finally:
+        base.close()
+
+
+def test_lazy_deployments_are_reverted_with_the_snapshot(project_dir,
+                                                        write_project_file,
+                                                        MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+    write_project_file('migrations/__init__.py')
+
+    base = MigratedChainBase(Project())
+    try:
+        chain = base.get_chain()
+
+        snapshot_id = chain.snapshot()
+        chain.get_contract('Math')
+        assert chain.registrar.call().exists('contract/Math')
+        chain.revert(snapshot_id)
+
+        assert base.is_valid
+        assert not chain.registrar.call().exists('contract/Math')
+        assert not chain.is_contract_available('Math')
+    finally:
+        base.close()
+
+
+class FakeNode(object):
+    name = 'test_fake'
+
+
+class FakeRequest(object):
+    node = FakeNode()
+
+    def __init__(self, fixturenames):
+        self.fixturenames = fixturenames
+
+
+def test_chain_fixtures_cannot_be_used_together():
+    validate_chain_fixtures(FakeRequest(['chain', 'web3']))
+    validate_chain_fixtures(FakeRequest(['unmigrated_chain', 'web3']))
+
+    with pytest.raises(ValueError):
+        validate_chain_fixtures(FakeRequest(['chain', 'unmigrated_chain']))
@@ -0,0 +1,77 @@
+import itertools
+import json
+
+import pytest
+
+from populus.utils.rpc import (
+    decode_batch_response,
+    encode_batch_request,
+    make_batch_request,
+)
+
+
+class FakeProvider(object):
+    def __init__(self):
+        self.request_counter = itertools.count()
+
+
+class FakeRequestManager(object):
+    def __init__(self):
+        self.requests = []
+
+    def request_blocking(self, method, params):
+        self.requests.append((method, params))
+        return method
+
+
+class FakeWeb3(object):
+    def __init__(self):
+        self.currentProvider = FakeProvider()
+        self._requestManager = FakeRequestManager()
+
+
+def test_encode_batch_request():
+    request_ids, request_data = encode_batch_request(FakeProvider(), [
+        ('eth_blockNumber', []),
+        ('eth_getCode', ['0xd3cda913deb6f67967b99d67acdfa1712c293601', 'latest']),
+    ])
+
+    payload = json.loads(request_data.decode('utf8'))
+
+    assert request_ids == [0, 1]
+    assert [request['method'] for request in payload] == ['eth_blockNumber', 'eth_getCode']
+    assert [request['id'] for request in payload] == request_ids
+
+
+def test_decode_batch_response_orders_results_by_request():
+    response = json.dumps([
+        {'jsonrpc': '2.0', 'id': 1, 'result': 'b'},
+        {'jsonrpc': '2.0', 'id': 0, 'result': 'a'},
+    ])
+
+    assert decode_batch_response([0, 1], response) == ['a', 'b']
+
+
+def test_decode_batch_response_raises_on_error():
+    response = json.dumps([
+        {'jsonrpc': '2.0', 'id': 0, 'result': 'a'},
+        {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'boom'}},
+    ])
+
+    with pytest.raises(ValueError):
+        decode_batch_response([0, 1], response)
+
+
+def test_make_batch_request_falls_back_to_single_requests():
+    web3 = FakeWeb3()
+
+    results = make_batch_request(web3, [
+        ('eth_blockNumber', []),
+        ('eth_coinbase', []),
+    ])
+
+    assert results == ['eth_blockNumber', 'eth_coinbase']
+    assert web3._requestManager.requests == [
+        ('eth_blockNumber', []),
+        ('eth_coinbase', []),
+    ]
@@ -0,0 +1,101 @@
+from populus.utils.verification import (
+    BytecodeVerifier,
+    get_code_hash,
+)
+
+
+ADDRESS = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+CODE = '0x6060604052'
+
+
+class FakeEth(object):
+    def __init__(self):
+        self.code = {ADDRESS: CODE}
+        self.blocks = {1: {'number': 1, 'hash': '0x01'}}
+        self.get_code_calls = 0
+        self.get_block_calls = 0
+
+    def getCode(self, address):
+        self.get_code_calls += 1
+        return self.code.get(address, '0x')
+
+    def getBlock(self, block_identifier):
+        self.get_block_calls += 1
+        if block_identifier == 'latest':
+            block_identifier = max(self.blocks)
+        return self.blocks.get(block_identifier)
+
+
+class FakeWeb3(object):
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+def test_code_hash_ignores_prefix_and_case():
+    assert get_code_hash('0x6060ABCD') == get_code_hash('6060abcd')
+    assert get_code_hash('0x6060') != get_code_hash('0x6061')
+
+
+def test_verified_addresses_are_not_fetched_again():
+    web3 = FakeWeb3()
+    verifier = BytecodeVerifier(web3, reorg_check_interval=0)
+
+    assert verifier.verify(ADDRESS, CODE) is True
+    assert verifier.verify(ADDRESS, CODE.upper().replace('0X', '0x')) is True
+    assert verifier.is_verified(ADDRESS, CODE) is True
+
+    assert web3.eth.get_code_calls == 1
+    assert verifier.hits == 1
+    assert verifier.misses == 1
+
+
+def test_mismatches_are_not_cached():
+    web3 = FakeWeb3()
+    verifier = BytecodeVerifier(web3, reorg_check_interval=0)
+
+    assert verifier.verify(ADDRESS, '0x6061') is False
+    assert verifier.verify(ADDRESS, '0x6061') is False
+
+    assert web3.eth.get_code_calls == 2
+
+
+def test_reorg_invalidates_verified_addresses():
+    web3 = FakeWeb3()
+    verifier = BytecodeVerifier(web3, reorg_check_interval=0)
+
+    assert verifier.verify(ADDRESS, CODE) is True
+
+    web3.eth.blocks[1] = {'number': 1, 'hash': '0x02'}
+    web3.eth.code[ADDRESS] = '0x'
+
+    assert verifier.is_verified(ADDRESS, CODE) is False
+    assert verifier.verify(ADDRESS, CODE) is False
+
+
+def test_provided_get_code_is_used():
+    web3 = FakeWeb3()
+    verifier = BytecodeVerifier(web3)
+
+    assert verifier.verify(ADDRESS, '0x6061', get_code=lambda address: '0x6061') is True
+    assert web3.eth.get_code_calls == 0
+
+
+def test_provided_checkpoint_is_used():
+    web3 = FakeWeb3()
+    verifier = BytecodeVerifier(web3)
+
+    verifier.set_checkpoint(1, '0x01')
+    assert verifier.verify(ADDRESS, CODE) is True
+    assert web3.eth.get_block_calls == 0
+
+
+def test_checkpoint_is_refreshed_after_the_interval():
+    web3 = FakeWeb3()
+    verifier = BytecodeVerifier(web3, reorg_check_interval=0)
+
+    verifier.set_checkpoint(1, '0x01')
+    web3.eth.blocks[2] = {'number': 2, 'hash': '0x02'}
+    assert verifier.verify(ADDRESS, CODE) is True
+
+    web3.eth.blocks[2] = {'number': 2, 'hash': '0x03'}
+    assert verifier.is_verified(ADDRESS, CODE) is False
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import gevent
+
+from populus.observers import (
+    DirWatcher,
+    InotifyBackend,
+    StatBackend,
+    event,
+    is_inotify_available,
+)
+
+
+def test_get_batch_coalesces_events(tmpdir):
+    watcher = DirWatcher(str(tmpdir), backend=StatBackend)
+    # discard the initial crawl
+    watcher.get_batch(debounce=0.1)
+
+    for _ in range(3):
+        watcher.q.put(event('update', 'contracts/Math.sol', False))
+    watcher.q.put(event('create', 'contracts/Token.sol', False))
+
+    assert watcher.get_batch(debounce=0.1) == [
+        event('update', 'contracts/Math.sol', False),
+        event('create', 'contracts/Token.sol', False),
+    ]
+    watcher.stop()
+
+
+@pytest.mark.skipif(not is_inotify_available(), reason="inotify is only available on linux")
+def test_inotify_backend_reports_changes(tmpdir):
+    root = str(tmpdir)
+    watcher = DirWatcher(root, backend=InotifyBackend)
+    assert isinstance(watcher.backend, InotifyBackend)
+    assert watcher.get_batch(debounce=0.1) == [event('crawl', root, True)]
+
+    source_path = os.path.join(root, 'Math.sol')
+    with open(source_path, 'w') as source_file:
+        source_file.write('contract Math {}')
+
+    with gevent.Timeout(5):
+        batch = watcher.get_batch(debounce=0.1)
+
+    assert event('create', source_path, False) in batch
+    assert event('update', source_path, False) in batch
+    assert len(batch) == 2
+
+    os.remove(source_path)
+
+    with gevent.Timeout(5):
+        assert watcher.get_batch(debounce=0.1) == [event('delete', source_path, False)]
+    watcher.stop()
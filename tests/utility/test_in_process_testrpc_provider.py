@@ -0,0 +1,66 @@
+import json
+import sys
+import types
+
+import pytest
+
+from populus.utils.rpc import InProcessTestRPCProvider
+
+
+@pytest.fixture()
+def testrpc_calls(monkeypatch):
+    calls = []
+
+    def eth_blockNumber():
+        calls.append('eth_blockNumber')
+        return 5
+
+    def eth_call(transaction, block_number):
+        raise ValueError("invalid transaction")
+
+    def full_reset():
+        calls.append('full_reset')
+
+    testrpc_module = types.ModuleType('testrpc')
+    testrpc_module.testrpc = types.ModuleType('testrpc.testrpc')
+    testrpc_module.testrpc.eth_blockNumber = eth_blockNumber
+    testrpc_module.testrpc.eth_call = eth_call
+    testrpc_module.testrpc.full_reset = full_reset
+    # The server only registers the JSON-RPC methods, not every function
+    # of the backend.
+    testrpc_module.server = types.ModuleType('testrpc.server')
+    testrpc_module.server.dispatcher = {
+        'eth_blockNumber': eth_blockNumber,
+        'eth_call': eth_call,
+    }
+    monkeypatch.setitem(sys.modules, 'testrpc', testrpc_module)
+    monkeypatch.setitem(sys.modules, 'testrpc.testrpc', testrpc_module.testrpc)
+    monkeypatch.setitem(sys.modules, 'testrpc.server', testrpc_module.server)
+    return calls
+
+
+def make_request(method, params):
+    provider = InProcessTestRPCProvider()
+    return json.loads(provider.make_request(method, params).decode('utf8'))
+
+
+def test_registered_methods_are_called(testrpc_calls):
+    response = make_request('eth_blockNumber', [])
+
+    assert response['result'] == 5
+    assert testrpc_calls == ['eth_blockNumber']
+
+
+def test_errors_are_returned(testrpc_calls):
+    response = make_request('eth_call', [{}, 'latest'])
+
+    assert response['error']['code'] == -32603
+    assert 'invalid transaction' in response['error']['message']
+
+
+@pytest.mark.parametrize('method', ('full_reset', 'eth_doesNotExist'))
+def test_only_server_methods_are_exposed(testrpc_calls, method):
+    response = make_request(method, [])
+
+    assert response['error']['code'] == -32601
+    assert testrpc_calls == []
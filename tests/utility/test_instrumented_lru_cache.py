@@ -0,0 +1,44 @@
+import pytest
+
+from populus.utils.caching import (
+    InstrumentedLRUCache,
+)
+
+
+def test_instrumented_lru_cache_counters():
+    cache = InstrumentedLRUCache(2)
+
+    cache['a'] = 1
+    cache['b'] = 2
+
+    assert cache['a'] == 1
+    assert cache.get('c') is None
+    with pytest.raises(KeyError):
+        cache['c']
+
+    # `b` is the least recently used entry.
+    cache['c'] = 3
+
+    assert 'b' not in cache
+    assert 'a' in cache
+    assert cache.stats == {
+        'capacity': 2,
+        'size': 2,
+        'hits': 1,
+        'misses': 2,
+        'evictions': 1,
+    }
+
+
+def test_instrumented_lru_cache_capacity_can_be_changed():
+    cache = InstrumentedLRUCache(3)
+    for key in 'abc':
+        cache[key] = key
+
+    cache.capacity = 1
+
+    assert len(cache) == 1
+    assert cache.evictions == 2
+
+    cache.reset_stats()
+    assert cache.stats['evictions'] == 0
@@ -0,0 +1,91 @@
+import os
+import stat
+
+from populus.utils import compiler
+
+
+def test_solc_version_is_probed_once_per_binary(tmpdir, monkeypatch):
+    solc_binary_path = str(tmpdir.join('solc'))
+    with open(solc_binary_path, 'w') as solc_binary:
+        solc_binary.write('#!/bin/sh\n')
+    os.chmod(solc_binary_path, os.stat(solc_binary_path).st_mode | stat.S_IEXEC)
+
+    probes = []
+
+    def get_solc_version(solc_binary=None):
+        probes.append(solc_binary)
+        return '0.4.2+commit.af6afb04'
+
+    monkeypatch.setenv('SOLC_BINARY', solc_binary_path)
+    monkeypatch.setattr(compiler, 'get_solc_version', get_solc_version)
+    monkeypatch.setattr(compiler, '_solc_toolchain', None)
+
+    toolchain = compiler.get_solc_toolchain()
+
+    assert toolchain.binary_path == os.path.abspath(solc_binary_path)
+    assert compiler.get_solc_toolchain().version == '0.4.2+commit.af6afb04'
+    assert compiler.get_solc_toolchain().major_minor_version == ('0', '4')
+    assert compiler.get_solc_toolchain() is toolchain
+    assert probes == [toolchain.binary_path]
+
+    # Touching the binary invalidates the descriptor once it is checked again.
+    binary_mtime = os.path.getmtime(solc_binary_path)
+    os.utime(solc_binary_path, (binary_mtime + 10, binary_mtime + 10))
+    monkeypatch.setattr(compiler, 'SOLC_TOOLCHAIN_CHECK_INTERVAL', 0)
+
+    assert compiler.get_solc_toolchain() is not toolchain
+    assert compiler.get_solc_toolchain().version == '0.4.2+commit.af6afb04'
+    assert len(probes) == 2
+
+
+def test_solc_binary_is_not_looked_up_on_every_call(tmpdir, monkeypatch):
+    lookups = []
+
+    def find_executable(program):
+        lookups.append(program)
+        return str(tmpdir.join(program))
+
+    monkeypatch.setenv('SOLC_BINARY', 'solc')
+    monkeypatch.setattr(compiler, 'find_executable', find_executable)
+    monkeypatch.setattr(compiler, '_solc_toolchain', None)
+
+    toolchain = compiler.get_solc_toolchain()
+
+    assert compiler.get_solc_toolchain() is toolchain
+    assert compiler.get_solc_toolchain() is toolchain
+    assert lookups == ['solc']
+
+    # Pointing `SOLC_BINARY` somewhere else is picked up straight away.
+    monkeypatch.setenv('SOLC_BINARY', 'solc-0.4.8')
+
+    assert compiler.get_solc_toolchain().binary_path == str(tmpdir.join('solc-0.4.8'))
+    assert lookups == ['solc', 'solc-0.4.8']
+
+
+def test_solc_supported_flags_are_read_from_help_output(tmpdir, monkeypatch):
+    solc_binary_path = str(tmpdir.join('solc'))
+    with open(solc_binary_path, 'w') as solc_binary:
+        solc_binary.write(
+            '#!/bin/sh\n'
+            'echo "Allowed options:"\n'
+            'echo "  --optimize            Enable bytecode optimizer."\n'
+            'echo "  --allow-paths path(s) Allow a given path for imports."\n'
+            'echo "  --combined-json abi,bin"\n'
+        )
+    os.chmod(solc_binary_path, os.stat(solc_binary_path).st_mode | stat.S_IEXEC)
+
+    toolchain = compiler.SolcToolchain(solc_binary_path, None)
+
+    assert toolchain.supported_flags == frozenset((
+        '--optimize',
+        '--allow-paths',
+        '--combined-json',
+    ))
+    assert toolchain.supports_flag('--allow-paths')
+    assert not toolchain.supports_flag('--ast-json')
+
+
+def test_solc_supported_flags_without_binary():
+    toolchain = compiler.SolcToolchain(None, None)
+
+    assert toolchain.supported_flags == frozenset()
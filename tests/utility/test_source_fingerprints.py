@@ -0,0 +1,78 @@
+import os
+import time
+
+from populus.utils.fingerprints import (
+    SourceFingerprints,
+)
+from populus.utils.filesystem import (
+    get_contracts_dir,
+)
+
+
+def backdate(*paths):
+    past = time.time() - 60
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def test_unchanged_files_are_not_rehashed(project_dir, write_project_file):
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+    write_project_file('contracts/Token.sol', 'contract Token {}')
+
+    contracts_dir = get_contracts_dir(project_dir)
+    math_path = os.path.join(contracts_dir, 'Math.sol')
+    token_path = os.path.join(contracts_dir, 'Token.sol')
+    backdate(math_path, token_path, contracts_dir)
+
+    fingerprints = SourceFingerprints(contracts_dir)
+    assert fingerprints.refresh() == {math_path, token_path}
+    digest = fingerprints.get_digest()
+
+    math_fingerprint = fingerprints.fingerprints[math_path]
+    assert fingerprints.refresh() == set()
+    assert fingerprints.fingerprints[math_path] is math_fingerprint
+    assert fingerprints.get_digest() == digest
+
+    write_project_file('contracts/Math.sol', 'contract Math { uint x; }')
+
+    assert fingerprints.refresh() == {math_path}
+    assert fingerprints.fingerprints[math_path] is not math_fingerprint
+    assert fingerprints.get_digest() != digest
+
+
+def test_added_and_removed_files_are_detected(project_dir, write_project_file):
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+
+    contracts_dir = get_contracts_dir(project_dir)
+    math_path = os.path.join(contracts_dir, 'Math.sol')
+    backdate(math_path, contracts_dir)
+
+    fingerprints = SourceFingerprints(contracts_dir)
+    fingerprints.refresh()
+    fingerprints.refresh()
+
+    write_project_file('contracts/lib/Token.sol', 'contract Token {}')
+    token_path = os.path.join(contracts_dir, 'lib', 'Token.sol')
+
+    assert fingerprints.refresh() == {token_path}
+    assert set(fingerprints.fingerprints) == {math_path, token_path}
+
+    os.remove(math_path)
+
+    assert fingerprints.refresh() == {math_path}
+    assert set(fingerprints.fingerprints) == {token_path}
+
+
+def test_project_source_file_hash(project_dir, write_project_file):
+    from populus.project import Project
+
+    write_project_file('contracts/Math.sol', 'contract Math {}')
+
+    project = Project()
+    source_hash = project.get_source_file_hash()
+
+    assert project.get_source_file_hash() == source_hash
+
+    write_project_file('contracts/Math.sol', 'contract Math { uint x; }')
+
+    assert project.get_source_file_hash() != source_hash